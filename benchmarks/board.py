@@ -0,0 +1,237 @@
+"""
+Times SGFBoard moves and undo on board engine scenarios.
+
+Run `python -m benchmarks.board` to print moves per second of playing
+every scenario and of undoing it, peak memory and memory blocks kept
+per move. Every scenario runs with simple ko and with positional super-ko.
+Pass `--filter TEXT` to run only scenarios with TEXT in their name,
+`--profile` to print cProfile statistics of them, and `--tracemalloc`
+to print lines of sgflib, which allocate most memory.
+"""
+import argparse
+import cProfile
+import itertools
+import pstats
+import random
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from sgflib import SGFBoard
+from sgflib.enums import Player
+from sgflib.types import SGFCoordinateType
+
+from .corpus import make_moves
+
+
+class Scenario(NamedTuple):
+    shape: SGFCoordinateType
+    player: Player
+    data: Optional[List[List[int]]]
+    moves: List[SGFCoordinateType]
+
+
+def make_data(
+    size: int, black: List[SGFCoordinateType], white: List[SGFCoordinateType]
+) -> List[List[int]]:
+    data = [[0] * size for _ in range(size)]
+    for x, y in black:
+        data[x][y] = 1
+    for x, y in white:
+        data[x][y] = -1
+    return data
+
+
+def make_ladder(size: int = 19) -> Scenario:
+    """Ladder running diagonally across the board, captured at the edge."""
+    data = make_data(size, [(0, 1), (1, 0), (1, 2), (2, 0)], [(1, 1), (2, 1)])
+    board = SGFBoard((size, size), Player.BLACK, data)
+    moves = []
+    for k in range(1, size):
+        for coord in [(k + 2, k), (k + 1, k + 1), (k + 1, k + 2), (k + 2, k + 1)]:
+            if not board.is_legal(coord):
+                break
+            board.move(coord)
+            moves.append(coord)
+        else:
+            continue
+        break
+
+    # black plays the last liberty of the ladder
+    (coord,) = board.liberties((1, 1))
+    moves.append(coord)
+    return Scenario(board.shape, Player.BLACK, data, moves)
+
+
+def make_large_capture(size: int = 19) -> Scenario:
+    """White captures a black group filling all but the last two rows."""
+    black = [(x, y) for x in range(size - 2) for y in range(size)][1:]
+    white = [(size - 2, y) for y in range(size)]
+    return Scenario((size, size), Player.WHITE, make_data(size, black, white), [(0, 0)])
+
+
+def make_ko_fight(seed: int = 0, size: int = 19, moves: int = 200) -> Scenario:
+    """
+    Ko in the corner, taken back after a ko threat and its answer.
+
+    Threats and answers are random legal moves away from the ko.
+    """
+    rng = random.Random(seed)
+    data = make_data(size, [(0, 1), (1, 0), (2, 1), (1, 2)], [(0, 2), (2, 2), (1, 3)])
+    board = SGFBoard((size, size), Player.WHITE, data)
+    far = [(x, y) for x in range(5, size) for y in range(size)]
+    kos = [(1, 1), (1, 2)]
+
+    played = []
+    while len(played) < moves:
+        for coord in [kos[len(played) // 3 % 2], None, None]:
+            if coord is None:
+                rng.shuffle(far)
+                coord = next(coord for coord in far if board.is_legal(coord))
+            board.move(coord)
+            played.append(coord)
+    return Scenario(board.shape, Player.WHITE, data, played)
+
+
+def make_random_game(seed: int = 0, size: int = 19, moves: int = 500) -> Scenario:
+    """
+    Game of `moves` random legal moves.
+
+    Random games may end early without legal moves, so seeds after `seed`
+    are tried until a game is long enough.
+    """
+    for seed in itertools.count(seed):
+        played = make_moves(random.Random(seed), moves, size)
+        if len(played) == moves:
+            return Scenario((size, size), Player.BLACK, None, played)
+
+
+SCENARIOS: Dict[str, Callable[[], Scenario]] = {
+    "ladder": make_ladder,
+    "large_capture": make_large_capture,
+    "ko_fight": make_ko_fight,
+    "game_500": make_random_game,
+    "board_52": lambda: make_random_game(size=52, moves=1000),
+}
+
+RULES = {
+    "ko": dict(allow_super_ko=True),
+    "super-ko": dict(allow_super_ko=False),
+}
+
+
+def iter_scenarios(
+    pattern: str = "",
+) -> Iterator[Tuple[str, Scenario, Dict[str, bool]]]:
+    """Yields scenarios with `pattern` in their name, generating only used ones."""
+    for name, make in SCENARIOS.items():
+        names = {f"{name}/{rules}": options for rules, options in RULES.items()}
+        names = {name: options for name, options in names.items() if pattern in name}
+        if not names:
+            continue
+
+        scenario = make()
+        for name, options in names.items():
+            yield name, scenario, options
+
+
+def new_board(scenario: Scenario, options: Dict[str, bool]) -> SGFBoard:
+    return SGFBoard(scenario.shape, scenario.player, scenario.data, **options)
+
+
+def play(board: SGFBoard, moves: List[SGFCoordinateType]):
+    for coord in moves:
+        board.move(coord)
+
+
+def undo(board: SGFBoard):
+    while board.history:
+        board.undo()
+
+
+def measure(
+    scenario: Scenario, options: Dict[str, bool], min_time: float = 0.2
+) -> Tuple[float, float]:
+    """Returns the best times of playing all moves and of undoing them."""
+    best_play = best_undo = float("inf")
+    started = time.perf_counter()
+    while time.perf_counter() - started < min_time:
+        board = new_board(scenario, options)
+        start = time.perf_counter()
+        play(board, scenario.moves)
+        middle = time.perf_counter()
+        undo(board)
+        end = time.perf_counter()
+        best_play = min(best_play, middle - start)
+        best_undo = min(best_undo, end - middle)
+    return best_play, best_undo
+
+
+def measure_memory(scenario: Scenario, options: Dict[str, bool]) -> Tuple[int, int]:
+    """Returns peak traced memory and memory blocks kept after playing all moves."""
+    board = new_board(scenario, options)
+    blocks = sys.getallocatedblocks()
+    tracemalloc.start()
+    try:
+        play(board, scenario.moves)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak, sys.getallocatedblocks() - blocks
+
+
+def profile(scenario: Scenario, options: Dict[str, bool], limit: int = 25):
+    profiler = cProfile.Profile()
+    for _ in range(10):
+        board = new_board(scenario, options)
+        profiler.runcall(play, board, scenario.moves)
+        profiler.runcall(undo, board)
+    pstats.Stats(profiler).sort_stats("tottime").print_stats(limit)
+
+
+def trace(scenario: Scenario, options: Dict[str, bool], limit: int = 15):
+    board = new_board(scenario, options)
+    tracemalloc.start()
+    try:
+        play(board, scenario.moves)
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, "*sgflib*")])
+    for stat in snapshot.statistics("lineno")[:limit]:
+        print(stat)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="", help="run only matching scenarios")
+    parser.add_argument("--profile", action="store_true", help="print cProfile stats")
+    parser.add_argument(
+        "--tracemalloc", action="store_true", help="print top allocating lines"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'scenario':<24} {'moves':>6} {'play/s':>10} {'undo/s':>10}"
+        f" {'peak B/move':>12} {'blocks/move':>12}"
+    )
+    for name, scenario, options in iter_scenarios(args.filter):
+        count = len(scenario.moves)
+        play_time, undo_time = measure(scenario, options)
+        peak, blocks = measure_memory(scenario, options)
+        print(
+            f"{name:<24} {count:>6} {count / play_time:>10.0f}"
+            f" {count / undo_time:>10.0f} {peak / count:>12.0f}"
+            f" {blocks / count:>12.1f}"
+        )
+
+        if args.profile:
+            profile(scenario, options)
+        if args.tracemalloc:
+            trace(scenario, options)
+
+
+if __name__ == "__main__":
+    main()
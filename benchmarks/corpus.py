@@ -0,0 +1,168 @@
+"""
+Generates reproducible synthetic SGF corpora for benchmarks.
+
+The same seed always gives the same SGF data. Games are played with random
+legal moves on SGFBoard, so they can be replayed move by move.
+
+Run `python -m benchmarks.corpus DIRECTORY` to write the corpora to files.
+"""
+import random
+import sys
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from sgflib import SGFBoard
+from sgflib.enums import Player
+from sgflib.exceptions import SGFBoardError
+from sgflib.types import SGFCoordinateType
+from sgflib.utils import coord_to_point, escape_text
+
+WORDS = (
+    "black white group ko tesuji joseki sente gote shape moyo territory "
+    "thickness aji miai [3d] \\ invasion reduction ladder net"
+).split()
+
+
+def make_header(rng: random.Random, size: int) -> str:
+    players = [f"Player {rng.randrange(1000)}" for _ in range(2)]
+    return (
+        f"GM[1]FF[4]CA[UTF-8]SZ[{size}]KM[6.5]RU[Japanese]"
+        f"PB[{players[0]}]BR[{rng.randint(1, 9)}p]"
+        f"PW[{players[1]}]WR[{rng.randint(1, 9)}p]"
+        f"DT[20{rng.randint(10, 22)}-0{rng.randint(1, 9)}-1{rng.randint(0, 9)}]"
+        f"RE[{rng.choice('BW')}+R]"
+    )
+
+
+def make_comment(rng: random.Random, length: int) -> str:
+    words = []
+    while length > 0:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length -= len(word) + 1
+        if rng.random() < 0.05:
+            words.append("\n")
+    return escape_text(" ".join(words))
+
+
+def make_moves(rng: random.Random, count: int, size: int) -> List[SGFCoordinateType]:
+    """Plays `count` random legal moves, stopping early if there are none."""
+    board = SGFBoard((size, size), Player.BLACK)
+    moves = []
+    for _ in range(count):
+        empty = [
+            (x, y)
+            for x, row in enumerate(board.data)
+            for y, loc in enumerate(row)
+            if not loc
+        ]
+        rng.shuffle(empty)
+        for coord in empty:
+            try:
+                board.move(coord)
+            except SGFBoardError:
+                continue
+            moves.append(coord)
+            break
+        else:
+            break
+    return moves
+
+
+def make_nodes(
+    rng: random.Random,
+    moves: List[SGFCoordinateType],
+    start: int = 0,
+    comment_rate: float = 0.0,
+    comment_length: int = 0,
+) -> str:
+    """Makes SGFNodes of moves, starting with move number `start`."""
+    player = Player.BLACK if start % 2 == 0 else Player.WHITE
+    nodes = []
+    for coord in moves:
+        node = f";{player.value}[{coord_to_point(coord)}]"
+        if rng.random() < comment_rate:
+            node += f"C[{make_comment(rng, comment_length)}]"
+        nodes.append(node)
+        player = -player
+    return "".join(nodes)
+
+
+def make_pro_game(
+    seed: int = 0,
+    moves: int = 300,
+    size: int = 19,
+    comment_rate: float = 0.05,
+    comment_length: int = 200,
+) -> str:
+    """Long game with a few short comments and no variations."""
+    rng = random.Random(seed)
+    header = make_header(rng, size)
+    nodes = make_nodes(
+        rng,
+        make_moves(rng, moves, size),
+        comment_rate=comment_rate,
+        comment_length=comment_length,
+    )
+    return f"(;{header}{nodes})"
+
+
+def make_variation_tree(
+    seed: int = 0, moves: int = 200, depth: int = 40, size: int = 19
+) -> str:
+    """
+    Game with variations nested `depth` levels deep.
+
+    Main line is split into `depth` + 1 sequences, each one followed by
+    the next level as the first variation and a short alternative.
+    """
+    rng = random.Random(seed)
+    main = make_moves(rng, moves, size)
+    step = max(1, len(main) // (depth + 1))
+
+    parts = [f"(;{make_header(rng, size)}"]
+    closing = []
+    for level in range(depth + 1):
+        start = level * step
+        end = len(main) if level == depth else start + step
+        parts.append(make_nodes(rng, main[start:end], start))
+        if level < depth:
+            alternative = make_nodes(rng, rng.sample(main, 5), end)
+            parts.append("(")
+            closing.append(f")({alternative})")
+    parts.extend(reversed(closing))
+    parts.append(")")
+    return "".join(parts)
+
+
+def make_commented_game(
+    seed: int = 0, moves: int = 100, comment_length: int = 100_000
+) -> str:
+    """Reviewed game where every tenth move has a huge comment."""
+    return make_pro_game(seed, moves, comment_rate=0.1, comment_length=comment_length)
+
+
+def make_collection(seed: int = 0, games: int = 200, moves: int = 150) -> str:
+    """Many games in a single SGFCollection."""
+    return "\n".join(make_pro_game(seed + i, moves) for i in range(games))
+
+
+CORPORA: Dict[str, Callable[[], str]] = {
+    "pro_game": make_pro_game,
+    "variation_tree": make_variation_tree,
+    "commented_game": make_commented_game,
+    "collection": make_collection,
+}
+
+
+def main():
+    directory = Path(sys.argv[1] if len(sys.argv) > 1 else ".")
+    directory.mkdir(parents=True, exist_ok=True)
+    for name, make in CORPORA.items():
+        path = directory / f"{name}.sgf"
+        path.write_text(make(), encoding="utf-8")
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
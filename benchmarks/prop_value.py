@@ -0,0 +1,49 @@
+"""
+Times SGFParser.parse_prop_value on long and on many SGFProperty values.
+
+Run with `python -m benchmarks.prop_value`. Time per character should stay
+flat as the value grows, and time per value should stay flat as the
+document grows.
+"""
+import timeit
+
+from sgflib import SGFParser
+
+COMMENT = "Black [3d\\] plays \\\\ here.\n"
+
+
+def make_value(length: int) -> str:
+    return "[" + COMMENT * (length // len(COMMENT)) + "]"
+
+
+def make_values(count: int) -> str:
+    return "[dd]" * count
+
+
+def parse_values(data: str, count: int):
+    parser = SGFParser(data)
+    for _ in range(count):
+        parser.parse_prop_value()
+
+
+def main():
+    print(f"{'value length':>12} {'seconds':>10} {'ns/char':>10}")
+    for length in [10_000, 40_000, 160_000, 640_000]:
+        data = make_value(length)
+        number = max(1, 1_000_000 // length)
+        seconds = timeit.timeit(
+            lambda: SGFParser(data).parse_prop_value(), number=number
+        )
+        seconds /= number
+        print(f"{len(data):>12} {seconds:>10.5f} {seconds / len(data) * 1e9:>10.1f}")
+
+    print()
+    print(f"{'values':>12} {'seconds':>10} {'ns/value':>10}")
+    for count in [1_000, 4_000, 16_000, 64_000]:
+        data = make_values(count)
+        seconds = timeit.timeit(lambda: parse_values(data, count), number=1)
+        print(f"{count:>12} {seconds:>10.5f} {seconds / count * 1e9:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Times parse, serialize, replay and copy paths on synthetic corpora.
+
+Run `python -m benchmarks.run` to print a table of results and store them
+in benchmarks/results.json under the current git commit. Pass
+`--compare COMMIT` to show the change against results stored for COMMIT,
+and `--filter TEXT` to run only benchmarks with TEXT in their name.
+"""
+import argparse
+import json
+import subprocess
+import timeit
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterator, Tuple
+
+from sgflib import SGFBoard, SGFCollection, SGFParser
+from sgflib.enums import ParserEngine, Player
+from sgflib.utils import point_to_coord
+
+from .corpus import CORPORA
+
+RESULTS_PATH = Path(__file__).parent / "results.json"
+
+
+def replay(collection: SGFCollection):
+    """Plays main line of every SGFGameTree on SGFBoard."""
+    for tree in collection:
+        size = int(next(iter(tree.sequence[0]["SZ"])))
+        board = SGFBoard((size, size), Player.BLACK)
+        while True:
+            for node in tree.sequence:
+                for player in Player:
+                    if player.value in node:
+                        board.move(point_to_coord(next(iter(node[player.value]))))
+            if not tree.variations:
+                break
+            tree = tree.variations[0]
+
+
+BENCHMARKS: Dict[str, Callable[[str, SGFCollection], object]] = {
+    "parse/recursive": lambda data, _: SGFParser(data).parse_collection(),
+    "parse/tokenizer": lambda data, _: SGFParser(
+        data, engine=ParserEngine.TOKENIZER
+    ).parse_collection(),
+    "parse/lazy": lambda data, _: SGFParser(data, lazy=True).parse_collection(),
+    "serialize": lambda _, collection: collection.sgf,
+    "copy": lambda _, collection: collection.copy(),
+    "replay": lambda _, collection: replay(collection),
+}
+
+
+def iter_benchmarks(pattern: str = "") -> Iterator[Tuple[str, Callable[[], object]]]:
+    """Yields benchmarks with `pattern` in their name, generating only used corpora."""
+    for corpus, make in CORPORA.items():
+        names = {f"{kind}/{corpus}": kind for kind in BENCHMARKS}
+        names = {name: kind for name, kind in names.items() if pattern in name}
+        if not names:
+            continue
+
+        data = make()
+        collection = SGFParser(data, engine=ParserEngine.TOKENIZER).parse_collection()
+        for name, kind in names.items():
+            yield name, partial(BENCHMARKS[kind], data, collection)
+
+
+def measure(func: Callable[[], object], repeat: int = 5) -> float:
+    """Returns the best time of a single call in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat, number)) / number
+
+
+def get_commit() -> str:
+    def git(*args: str) -> str:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+
+    try:
+        commit = git("rev-parse", "--short", "HEAD")
+        dirty = git("status", "--porcelain", "--untracked-files=no", "sgflib")
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return f"{commit}-dirty" if dirty else commit
+
+
+def load_results() -> Dict[str, Dict[str, float]]:
+    if RESULTS_PATH.exists():
+        return json.loads(RESULTS_PATH.read_text())
+    return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--filter", default="", help="run only matching benchmarks")
+    parser.add_argument("--compare", help="commit to compare results with")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--no-save", action="store_true", help="do not store results")
+    args = parser.parse_args()
+
+    commit = get_commit()
+    results = load_results()
+    baseline = results.get(args.compare, {}) if args.compare else {}
+    current = {}
+
+    print(f"commit {commit}")
+    print(f"{'benchmark':<40} {'ms':>10} {'change':>8}")
+    for name, func in iter_benchmarks(args.filter):
+        seconds = current[name] = measure(func, args.repeat)
+        change = ""
+        if name in baseline:
+            change = f"{seconds / baseline[name] - 1:+.0%}"
+        print(f"{name:<40} {seconds * 1000:>10.3f} {change:>8}")
+
+    if not args.no_save:
+        results.setdefault(commit, {}).update(current)
+        RESULTS_PATH.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n")
+
+
+if __name__ == "__main__":
+    main()
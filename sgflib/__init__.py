@@ -3,7 +3,10 @@ from .node import SGFNode
 from .sequence import SGFSequence
 from .game_tree import SGFGameTree
 from .collection import SGFCollection
-from .parser import SGFParser
+from .parser import SGFParser, iterparse
+from .incremental import SGFIncrementalParser
+from .writer import dump
 from .cursor import SGFCursor
 from .board import SGFBoard
 from .kifu import SGFKifu
+from .handler import SGFHandler
@@ -0,0 +1,281 @@
+from collections import Counter
+from typing import TYPE_CHECKING, Optional, Sequence, Union
+
+from .board import SGFBoard, get_zobrist
+from .enums import GoRules, Location, MoveError, Player
+from .exceptions import SGFBoardError
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from .types import SGFCoordinateType
+
+PASS = (-1, -1)
+
+
+def _dilate(mask: "np.ndarray", width: int) -> "np.ndarray":
+    """Returns points of mask and points adjacent to them on every board."""
+    result = mask.copy()
+    result[:, 1:] |= mask[:, :-1]
+    result[:, :-1] |= mask[:, 1:]
+    result[:, width:] |= mask[:, :-width]
+    result[:, :-width] |= mask[:, width:]
+    return result
+
+
+def _flood(seed: "np.ndarray", mask: "np.ndarray", width: int) -> "np.ndarray":
+    """Grows seed over connected points of mask, until no board changes."""
+    result = seed.copy()
+    boards = np.arange(len(seed))
+    while boards.size:
+        grown = _dilate(seed, width) & mask[boards]
+        changed = (grown != seed).any(axis=1)
+        boards, seed = boards[changed], grown[changed]
+        result[boards] = seed
+    return result
+
+
+class SGFBoardBatch:
+    """
+    Many Go boards of the same shape, played in lockstep with NumPy.
+
+    Each call to `move` plays one move on every board, finding captures
+    and liberties for all boards at once. Legality rules are the same
+    as of SGFBoard, but illegal moves set error code of the game in
+    `errors` instead of raising. Games with an error keep their last legal
+    position and ignore further moves. PASS keeps the player, as in SGFBoard.
+
+    Boards are kept flat with a border of empty points around them,
+    so adjacent points are found by shifting whole arrays.
+
+    Requires numpy.
+    """
+
+    def __init__(
+        self,
+        count: int,
+        shape: "SGFCoordinateType" = (19, 19),
+        player: Union[str, Player] = Player.BLACK,
+        allow_super_ko: bool = True,
+        allow_suicide: bool = False,
+    ):
+        if np is None:
+            raise ImportError(
+                "SGFBoardBatch requires numpy, install it with `pip install sgflib[numpy]`."
+            )
+
+        rows, cols = shape
+        if not (0 < rows <= 52 and 0 < cols <= 52):
+            raise SGFBoardError("Board dimensions should be between 1 and 52.")
+
+        self.shape = shape
+        self.allow_super_ko = allow_super_ko
+        self.allow_suicide = allow_suicide
+
+        self._width = cols + 2
+        self._data = np.zeros((count, (rows + 2) * self._width), dtype=np.int8)
+        on_board = np.zeros((rows + 2, self._width), dtype=bool)
+        on_board[1:-1, 1:-1] = True
+        self._on_board = on_board.reshape(-1)
+
+        self.players = np.full(count, Player(player).loc(), dtype=np.int8)
+        self.captured = np.zeros((count, 2), dtype=np.int64)  # by black, by white
+        self.errors = np.zeros(count, dtype=np.uint8)
+        self.moves = np.zeros(count, dtype=np.int64)
+
+        # position before the last move, for ko
+        self._previous = self._data.copy()
+        # Zobrist hashes of positions before every move, for super-ko
+        keys = np.zeros((self._on_board.size, 3), dtype=np.uint64)
+        keys[self._on_board] = get_zobrist((rows, cols))
+        self._keys = keys
+        self._hashes = [[] for _ in range(count)]
+        self._seen = [Counter() for _ in range(count)]
+
+    def __len__(self):
+        return len(self._data)
+
+    @property
+    def data(self) -> "np.ndarray":
+        """Boards of shape (count, rows, cols) with Location values, a view."""
+        rows, cols = self.shape
+        return self._data.reshape(len(self), rows + 2, self._width)[:, 1:-1, 1:-1]
+
+    def board(self, index: int) -> SGFBoard:
+        """Returns position of a single game as SGFBoard, without history."""
+        player = Player.BLACK if self.players[index] == Location.BLACK else Player.WHITE
+        board = SGFBoard(
+            self.shape,
+            player,
+            self.data[index].tolist(),
+            allow_super_ko=self.allow_super_ko,
+            allow_suicide=self.allow_suicide,
+        )
+        board.captured = {
+            Player.BLACK: int(self.captured[index, 0]),
+            Player.WHITE: int(self.captured[index, 1]),
+        }
+        return board
+
+    def score(
+        self,
+        rules: Union[str, GoRules] = GoRules.JAPANESE,
+        komi: float = 6.5,
+        dead: Optional["np.ndarray"] = None,
+    ) -> "np.ndarray":
+        """
+        Scores every board, as SGFBoard.score does.
+
+        `dead` is a boolean array of shape (count, rows, cols). Whole groups
+        at marked stones are taken off, as groups at `dead` coordinates of
+        SGFBoard.score. Returns points of shape (count, 2), black and white.
+        """
+        rows, cols = self.shape
+        width = self._width
+        data = self._data.copy()
+        removed = np.zeros(data.shape, dtype=bool)
+        if dead is not None:
+            marked = np.zeros(data.shape, dtype=bool)
+            marked.reshape(len(self), rows + 2, width)[:, 1:-1, 1:-1] = dead
+            for color in (Location.BLACK, Location.WHITE):
+                stones = data == color
+                removed |= _flood(marked & stones, stones, width)
+            data[removed] = Location.EMPTY
+
+        empty = (data == Location.EMPTY) & self._on_board
+        black, white = data == Location.BLACK, data == Location.WHITE
+        reached = [
+            _flood(_dilate(stones, width) & empty, empty, width)
+            for stones in (black, white)
+        ]
+        territory = [
+            (reached[0] & ~reached[1]).sum(axis=1),
+            (reached[1] & ~reached[0]).sum(axis=1),
+        ]
+
+        if GoRules(rules) is GoRules.CHINESE:
+            points = [black.sum(axis=1), white.sum(axis=1)]
+        else:
+            prisoners = [
+                (removed & (self._data == Location.WHITE)).sum(axis=1),
+                (removed & (self._data == Location.BLACK)).sum(axis=1),
+            ]
+            points = [self.captured[:, i] + prisoners[i] for i in range(2)]
+
+        result = np.stack([territory[0] + points[0], territory[1] + points[1]], axis=1)
+        result = result.astype(np.float64)
+        result[:, 1] += komi
+        return result
+
+    def _hash(self, data: "np.ndarray") -> "np.ndarray":
+        points = np.arange(self._keys.shape[0])
+        return np.bitwise_xor.reduce(self._keys[points, data], axis=1)
+
+    def move(
+        self,
+        coords: Sequence["SGFCoordinateType"],
+        active: Optional[Sequence[bool]] = None,
+    ) -> "np.ndarray":
+        """
+        Plays one move on every board, or on boards where `active` is set.
+
+        Coordinates are (x, y) pairs, PASS passes.
+        Returns MoveError codes of this move, MoveError.NONE for legal ones.
+        """
+        rows, cols = self.shape
+        width = self._width
+        coords = np.asarray(coords, dtype=np.int64).reshape(len(self), 2)
+        x, y = coords[:, 0], coords[:, 1]
+
+        step = np.zeros(len(self), dtype=np.uint8)
+        playing = self.errors == MoveError.NONE
+        if active is not None:
+            playing &= np.asarray(active, dtype=bool)
+
+        passing = playing & (x == PASS[0]) & (y == PASS[1])
+        playing &= ~passing
+        wrong = playing & ~((0 <= x) & (x < rows) & (0 <= y) & (y < cols))
+        step[wrong] = MoveError.WRONG_COORDINATE
+        playing &= ~wrong
+
+        games = np.flatnonzero(playing)
+        points = (x[games] + 1) * width + y[games] + 1
+        data = self._data[games]
+
+        not_empty = data[np.arange(len(games)), points] != Location.EMPTY
+        step[games[not_empty]] = MoveError.NOT_EMPTY
+        games, points, data = games[~not_empty], points[~not_empty], data[~not_empty]
+        boards = np.arange(len(games))
+
+        colors = self.players[games]
+        before = data.copy()
+        data[boards, points] = colors
+        stone = np.zeros(data.shape, dtype=bool)
+        stone[boards, points] = True
+
+        # capture opponent groups without liberties adjacent to the stone
+        color = colors[:, None]
+        opponent = data == -color
+        empty = (data == Location.EMPTY) & self._on_board
+        alive = _flood(opponent & _dilate(empty, width), opponent, width)
+        dead = opponent & ~alive
+        captured = _flood(dead & _dilate(stone, width), dead, width)
+        data[captured] = Location.EMPTY
+        captures = captured.sum(axis=1)
+
+        empty |= captured
+        group = _flood(stone, data == color, width)
+        suicide = ~(_dilate(group, width) & empty).any(axis=1)
+        if self.allow_suicide:
+            data[group & suicide[:, None]] = Location.EMPTY
+            suicides = np.where(suicide, group.sum(axis=1), 0)
+            illegal = np.zeros(len(games), dtype=bool)
+        else:
+            suicides = np.zeros(len(games), dtype=np.int64)
+            step[games[suicide]] = MoveError.SUICIDE
+            illegal = suicide
+
+        if self.allow_super_ko:
+            ko = ~illegal & (self.moves[games] > 0)
+            ko &= (data == self._previous[games]).all(axis=1)
+            step[games[ko]] = MoveError.KO
+            illegal |= ko
+        else:
+            hashes = self._hash(data)
+            for i, game in enumerate(games):
+                if illegal[i]:
+                    continue
+                seen = self._seen[game]
+                last = self._hashes[game][-1:]
+                if seen[hashes[i]] - (last == [hashes[i]]) > 0:
+                    step[game] = MoveError.SUPER_KO
+                    illegal[i] = True
+
+        legal = ~illegal
+        games, before, data = games[legal], before[legal], data[legal]
+        colors, captures, suicides = colors[legal], captures[legal], suicides[legal]
+
+        self._data[games] = data
+        self._remember(games, before)
+        self._remember(np.flatnonzero(passing), self._data[passing])
+
+        black = colors == Location.BLACK
+        self.captured[games, np.where(black, 0, 1)] += captures
+        self.captured[games, np.where(black, 1, 0)] += suicides
+        self.players[games] = -colors
+
+        failed = step != MoveError.NONE
+        self.errors[failed] = step[failed]
+        return step
+
+    def _remember(self, games: "np.ndarray", before: "np.ndarray"):
+        """Saves positions before the move of games, which played it."""
+        self._previous[games] = before
+        self.moves[games] += 1
+        if not self.allow_super_ko:
+            for game, position_hash in zip(games, self._hash(before)):
+                self._hashes[game].append(position_hash)
+                self._seen[game][position_hash] += 1
@@ -1,14 +1,287 @@
-from copy import deepcopy
-from typing import TYPE_CHECKING, Set, List, Union
-
-from .enums import Player, Location
+import random
+from array import array
+from collections import Counter
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import islice
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Set,
+    List,
+    Tuple,
+    Union,
+)
+
+from .enums import GoRules, Player, Location
 from .exceptions import SGFBoardError
+from .render import pack_planes, render
 
 if TYPE_CHECKING:
     from .types import SGFCoordinateType
 
+# Zobrist keys of (empty, black, white) for every point, indexed with Location
+_random = random.Random(0)
+ZOBRIST = [
+    [(0, _random.getrandbits(64), _random.getrandbits(64)) for _ in range(52)]
+    for _ in range(52)
+]
+ZOBRIST_PLAYER = {Player.BLACK: 0, Player.WHITE: _random.getrandbits(64)}
+del _random
+
+# Location of every value in SGFBoard data, WHITE is -1
+LOCATIONS = (Location.EMPTY, Location.BLACK, Location.WHITE)
+
+# bytes of SGFBoard data to bytes of SGFPosition rows, where WHITE is 2
+TO_ROW = bytes.maketrans(b"\xff", b"\x02")
+
+
+@lru_cache(maxsize=None)
+def get_neighbours(shape: "SGFCoordinateType") -> Tuple[Tuple[int, ...], ...]:
+    """Returns indices of adjacent points of every point of flat board data."""
+    rows, cols = shape
+    return tuple(
+        tuple(
+            i * cols + j
+            for i, j in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]
+            if 0 <= i < rows and 0 <= j < cols
+        )
+        for x in range(rows)
+        for y in range(cols)
+    )
+
+
+@lru_cache(maxsize=None)
+def get_zobrist(shape: "SGFCoordinateType") -> Tuple[Tuple[int, int, int], ...]:
+    """Returns Zobrist keys of every point of flat board data."""
+    rows, cols = shape
+    return tuple(ZOBRIST[x][y] for x in range(rows) for y in range(cols))
+
+
+class SGFChain:
+    """Connected stones of one color and their liberties, kept up to date by moves."""
+
+    __slots__ = ("color", "stones", "liberties")
+
+    def __init__(
+        self,
+        color: Location,
+        stones: Set[int],
+        liberties: Set[int],
+    ):
+        self.color = color
+        self.stones = stones
+        self.liberties = liberties
+
+
+class SGFBoardRow(Sequence):
+    """Row of SGFBoard points, which reads and writes the board itself."""
+
+    __slots__ = ("_board", "_start")
+
+    def __init__(self, board: "SGFBoard", row: int):
+        self._board = board
+        self._start = row * board.shape[1]
+
+    def __len__(self) -> int:
+        return self._board.shape[1]
+
+    def _indices(self, key: Union[int, slice]) -> range:
+        cols = self._board.shape[1]
+        if isinstance(key, slice):
+            return range(*key.indices(cols))
+        if not -cols <= key < cols:
+            raise IndexError("SGFBoard row index out of range")
+        return range(key % cols, key % cols + 1)
+
+    def __getitem__(self, key: Union[int, slice]):
+        data = self._board._data
+        if isinstance(key, slice):
+            return [LOCATIONS[data[self._start + y]] for y in self._indices(key)]
+        return LOCATIONS[data[self._start + self._indices(key)[0]]]
+
+    def __setitem__(self, key: Union[int, slice], value):
+        indices = self._indices(key)
+        values = list(value) if isinstance(key, slice) else [value]
+        if len(values) != len(indices):
+            raise ValueError("SGFBoard rows cannot change their length")
+        self._board._set_points(
+            {self._start + y: loc for y, loc in zip(indices, values)}
+        )
+
+    def __iter__(self) -> Iterator[Location]:
+        start = self._start
+        data = self._board._data[start : start + len(self)]
+        return map(LOCATIONS.__getitem__, data)
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __deepcopy__(self, memo) -> List[Location]:
+        return list(self)
+
+
+class SGFBoardData(Sequence):
+    """Rows of SGFBoard points, which read and write the board itself."""
+
+    __slots__ = ("_board",)
+
+    def __init__(self, board: "SGFBoard"):
+        self._board = board
+
+    def __len__(self) -> int:
+        return self._board.shape[0]
+
+    def __getitem__(self, key: Union[int, slice]):
+        rows = range(len(self))[key]
+        if isinstance(key, slice):
+            return [SGFBoardRow(self._board, x) for x in rows]
+        return SGFBoardRow(self._board, rows)
+
+    def __setitem__(self, key: int, value):
+        self[key][:] = value
+
+    def __eq__(self, other):
+        if not isinstance(other, Sequence):
+            return NotImplemented
+        return list(self) == list(other)
+
+    def __repr__(self):
+        return repr(list(self))
+
+    def __deepcopy__(self, memo) -> List[List[Location]]:
+        return [list(row) for row in self]
+
+
+class SGFScore(NamedTuple):
+    """Points of both players, komi included in points of white."""
+
+    black: float
+    white: float
+
+    @property
+    def margin(self) -> float:
+        """Points of black minus points of white."""
+        return self.black - self.white
+
+    @property
+    def result(self) -> str:
+        """Result in the format of RE property, like B+3.5 or 0 for a draw."""
+        if not self.margin:
+            return "0"
+        winner = Player.BLACK if self.margin > 0 else Player.WHITE
+        return f"{winner.value}+{abs(self.margin):g}"
+
+
+class SGFPosition:
+    """
+    Immutable snapshot of SGFBoard, made with SGFBoard.snapshot.
+
+    Rows are kept as bytes, and consecutive snapshots share rows which
+    did not change between them, so keeping every position of a game
+    takes little memory. Snapshots can be safely shared between threads.
+    Setting or deleting attributes raises AttributeError.
+    """
+
+    __slots__ = ("shape", "player", "rows", "hash", "_captured")
+
+    def __init__(
+        self,
+        shape: "SGFCoordinateType",
+        player: Player,
+        rows: Tuple[bytes, ...],
+        captured: Tuple[int, int],
+        position_hash: int,
+    ):
+        set_attr = super().__setattr__
+        set_attr("shape", shape)
+        set_attr("player", player)
+        set_attr("rows", rows)
+        set_attr("hash", position_hash)
+        set_attr("_captured", captured)
+
+    def __setattr__(self, name: str, value):
+        raise AttributeError(f"SGFPosition is immutable, cannot set {name}.")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"SGFPosition is immutable, cannot delete {name}.")
+
+    def __reduce__(self):
+        return SGFPosition, (
+            self.shape,
+            self.player,
+            self.rows,
+            self._captured,
+            self.hash,
+        )
+
+    @property
+    def captured(self) -> Dict[Player, int]:
+        black, white = self._captured
+        return {Player.BLACK: black, Player.WHITE: white}
+
+    @property
+    def data(self) -> List[List[Location]]:
+        """Rows of Locations, as SGFBoard.data."""
+        return [[LOCATIONS[point] for point in row] for row in self.rows]
+
+    def __getitem__(self, coord: "SGFCoordinateType") -> Location:
+        x, y = coord
+        return LOCATIONS[self.rows[x][y]]
+
+    def __eq__(self, other):
+        if not isinstance(other, SGFPosition):
+            return NotImplemented
+        return (
+            self.hash == other.hash
+            and self.player is other.player
+            and self._captured == other._captured
+            and self.rows == other.rows
+        )
+
+    def __hash__(self):
+        return self.hash
+
+    def __str__(self, spaces: int = 1):
+        # every line shows a column of the board, as in SGFBoard
+        cols = self.shape[1]
+        data = b"".join(self.rows)
+        return render((data[y::cols] for y in range(cols)), spaces)
+
+    def planes(self) -> bytes:
+        """Returns black, white and empty bit-packed planes, see render module."""
+        return pack_planes(self.rows)
+
+    def __repr__(self):
+        return f"SGFPosition({self.player.value}, {self.hash:016x})"
+
+    def to_board(self, **kwargs) -> "SGFBoard":
+        """Returns SGFBoard with this position and no history."""
+        board = SGFBoard(self.shape, self.player, self.data, **kwargs)
+        board.captured = self.captured
+        return board
+
 
 class SGFBoard:
+    """
+    Go board, which plays moves and checks their legality.
+
+    Points are kept in a flat array of Location values, row by row,
+    with adjacent points of each one precomputed for the shape.
+    `data` is a view of them as rows, and points set through it update
+    Zobrist hash and SGFChains, and are reverted by undo like moves.
+    """
+
     def __init__(
         self,
         shape: "SGFCoordinateType",
@@ -16,6 +289,7 @@ class SGFBoard:
         data: List[List[int]] = None,
         allow_super_ko: bool = True,
         allow_suicide: bool = False,
+        situational_super_ko: bool = False,
     ):
         rows, cols = shape
 
@@ -25,6 +299,7 @@ class SGFBoard:
         self.history = []
         self.allow_super_ko = allow_super_ko
         self.allow_suicide = allow_suicide
+        self.situational_super_ko = situational_super_ko
 
         if not (0 < rows <= 52 and 0 < cols <= 52):
             raise SGFBoardError("Board dimensions should be between 1 and 52.")
@@ -32,122 +307,499 @@ class SGFBoard:
         if data:
             if len(data) != rows or any(len(row) != cols for row in data):
                 raise SGFBoardError(f"Data should be of shape {shape}.")
-            self.data = [[Location(point) for point in row] for row in data]
+            self._data = array("b", [Location(point) for row in data for point in row])
         else:
-            self.data = [[Location.EMPTY for _ in range(cols)] for _ in range(rows)]
+            self._data = array("b", bytes(rows * cols))
+
+        self._neighbours = get_neighbours((rows, cols))
+        self._zobrist = get_zobrist((rows, cols))
+
+        self.hash = 0
+        for keys, loc in zip(self._zobrist, self._data):
+            self.hash ^= keys[loc]
+        self.positions = Counter()  # keys of positions before moves in history
+
+        self._chains = {}  # SGFChain of every stone
+        self._build_chains(index for index, loc in enumerate(self._data) if loc)
+
+        self._rows = [b""] * rows  # rows of the last snapshot
+        self._dirty = set(range(rows))  # rows changed since the last snapshot
+
+    @property
+    def data(self) -> SGFBoardData:
+        """Rows of Locations, which can be read and set like a list of lists."""
+        return SGFBoardData(self)
+
+    @data.setter
+    def data(self, data: List[List[int]]):
+        rows, cols = self.shape
+        if len(data) != rows or any(len(row) != cols for row in data):
+            raise SGFBoardError(f"Data should be of shape {self.shape}.")
+        self._set_points(
+            {index: loc for index, loc in enumerate(p for row in data for p in row)}
+        )
 
     def __str__(self, spaces: int = 1):
-        width, height = self.shape
-        s = ""
-        for x in range(height):
-            for y in range(width):
-                s += self.data[y][x].pretty() + " " * spaces
-            s += "\n"
-        return s
+        # every line shows a column of the board
+        cols = self.shape[1]
+        data = self._data.tobytes().translate(TO_ROW)
+        return render((data[y::cols] for y in range(cols)), spaces)
 
     def __repr__(self):
         return f"SGFBoard({self})"
 
     def push(self):
-        """Save position to history"""
-        state = deepcopy(self.data), self.player, self.captured.copy()
+        """
+        Save position to history.
+
+        Only player, captured stones and Zobrist hash are saved, and then
+        moves log the points they change and how they change SGFChains,
+        so undo takes time proportional to what changed.
+        """
+        state = self.player, self.captured.copy(), self.hash, [], []
         self.history.append(state)
+        self.positions[self._position_key(self.hash, self.player)] += 1
 
     def undo(self):
-        """Load previous position"""
-        self.data, self.player, self.captured = self.history.pop()
+        """Load previous position, reverting logged changes of the last move"""
+        self.player, self.captured, self.hash, changes, reverts = self.history.pop()
+        self.positions[self._position_key(self.hash, self.player)] -= 1
+        cols = self.shape[1]
+        for index, loc in reversed(changes):
+            self._data[index] = loc
+            self._dirty.add(index // cols)
+        for revert, *args in reversed(reverts):
+            revert(*args)
+
+    def snapshot(self) -> SGFPosition:
+        """
+        Returns immutable SGFPosition of the board.
+
+        Only rows changed since the previous snapshot are copied,
+        the rest are shared with it.
+        """
+        cols = self.shape[1]
+        for row in self._dirty:
+            start = row * cols
+            self._rows[row] = (
+                self._data[start : start + cols].tobytes().translate(TO_ROW)
+            )
+        self._dirty.clear()
+
+        captured = self.captured[Player.BLACK], self.captured[Player.WHITE]
+        return SGFPosition(
+            self.shape, self.player, tuple(self._rows), captured, self.hash
+        )
+
+    def group_at(self, coord: "SGFCoordinateType") -> FrozenSet["SGFCoordinateType"]:
+        """Returns stones connected to the stone at coord, empty for empty point."""
+        chain = self._chains.get(self._get_index(coord))
+        return frozenset(map(self._get_coord, chain.stones)) if chain else frozenset()
+
+    def liberties(self, coord: "SGFCoordinateType") -> FrozenSet["SGFCoordinateType"]:
+        """Returns liberties of the group at coord, empty for empty point."""
+        chain = self._chains.get(self._get_index(coord))
+        return (
+            frozenset(map(self._get_coord, chain.liberties)) if chain else frozenset()
+        )
+
+    def territory(
+        self, dead: Iterable["SGFCoordinateType"] = ()
+    ) -> Dict[Player, FrozenSet["SGFCoordinateType"]]:
+        """
+        Returns empty points surrounded by stones of only one player.
+
+        Groups with a stone at any of `dead` coordinates are taken off first,
+        so their points count as territory too.
+        """
+        data, _ = self._remove_dead(dead)
+        territory = self._get_territory(data)
+        return {
+            player: frozenset(map(self._get_coord, territory[player.loc()]))
+            for player in Player
+        }
+
+    def score(
+        self,
+        rules: Union[str, GoRules] = GoRules.JAPANESE,
+        komi: float = 6.5,
+        dead: Iterable["SGFCoordinateType"] = (),
+    ) -> SGFScore:
+        """
+        Scores the position, with groups at `dead` coordinates taken off.
+
+        Japanese rules count territory and prisoners, dead stones included.
+        Chinese rules count territory and stones on the board.
+        """
+        data, removed = self._remove_dead(dead)
+        territory = self._get_territory(data)
+
+        points = {}
+        for player in Player:
+            color = player.loc()
+            if GoRules(rules) is GoRules.CHINESE:
+                points[player] = data.count(color) + len(territory[color])
+            else:
+                prisoners = sum(self._data[index] == -color for index in removed)
+                points[player] = (
+                    len(territory[color]) + self.captured[player] + prisoners
+                )
+
+        return SGFScore(points[Player.BLACK], points[Player.WHITE] + komi)
+
+    def _remove_dead(
+        self, dead: Iterable["SGFCoordinateType"]
+    ) -> Tuple[array, Set[int]]:
+        """Returns copy of data without dead groups, and indices of their stones."""
+        data = array("b", self._data)
+        removed = set()
+        for coord in dead:
+            chain = self._chains.get(self._get_index(coord))
+            if chain:
+                removed |= chain.stones
+        for index in removed:
+            data[index] = Location.EMPTY
+        return data, removed
+
+    def _get_territory(self, data: array) -> Dict[Location, List[int]]:
+        """
+        Finds regions of empty points and colors of stones around them.
+
+        Every point is visited once, so it takes time linear in board size.
+        """
+        neighbours = self._neighbours
+        territory = {Location.BLACK: [], Location.WHITE: []}
+        visited = bytearray(len(data))
+        for start, loc in enumerate(data):
+            if loc or visited[start]:
+                continue
+
+            visited[start] = True
+            region = [start]
+            border = set()
+            for index in region:
+                for adjacent in neighbours[index]:
+                    if data[adjacent]:
+                        border.add(data[adjacent])
+                    elif not visited[adjacent]:
+                        visited[adjacent] = True
+                        region.append(adjacent)
+
+            if len(border) == 1:
+                territory[LOCATIONS[border.pop()]].extend(region)
+        return territory
+
+    def _position_key(self, position_hash: int, player: Player) -> int:
+        if self.situational_super_ko:
+            return position_hash ^ ZOBRIST_PLAYER[player]
+        return position_hash
 
     def _is_valid_coord(self, coord: "SGFCoordinateType") -> bool:
         x, y = coord
         rows, cols = self.shape
         return 0 <= x < rows and 0 <= y < cols
 
-    def _get_loc(self, coord: "SGFCoordinateType") -> Location:
+    def _get_index(self, coord: "SGFCoordinateType") -> int:
         if self._is_valid_coord(coord):
             x, y = coord
-            return self.data[x][y]
+            return x * self.shape[1] + y
         raise SGFBoardError("Wrong coordinate")
 
-    def _set_coord(self, coord: "SGFCoordinateType", color: Location):
-        if self._is_valid_coord(coord):
-            x, y = coord
-            self.data[x][y] = color
-
-    def _get_adjacent(self, coord: "SGFCoordinateType") -> List["SGFCoordinateType"]:
-        x, y = coord
-        for adjacent in [(x - 1, y), (x + 1, y), (x, y - 1), (x, y + 1)]:
-            if self._is_valid_coord(adjacent):
-                yield adjacent
-
-    def _get_group(self, coord: "SGFCoordinateType") -> Set["SGFCoordinateType"]:
-        loc = self._get_loc(coord)
+    def _get_coord(self, index: int) -> "SGFCoordinateType":
+        return divmod(index, self.shape[1])
 
-        unexplored = {coord}
-        group = set()
+    def _get_loc(self, coord: "SGFCoordinateType") -> Location:
+        return LOCATIONS[self._data[self._get_index(coord)]]
+
+    def _set_loc(self, index: int, color: Location):
+        loc = self._data[index]
+        if self.history:
+            self.history[-1][3].append((index, loc))
+        self._data[index] = color
+        self._dirty.add(index // self.shape[1])
+        keys = self._zobrist[index]
+        self.hash ^= keys[loc] ^ keys[color]
+
+    def _get_group(self, index: int) -> Set[int]:
+        data = self._data
+        neighbours = self._neighbours
+        loc = data[index]
+
+        unexplored = [index]
+        group = {index}
         while unexplored:
-            coord = unexplored.pop()
-            group.add(coord)
-
-            for coord in self._get_adjacent(coord):
-                if coord not in group and self._get_loc(coord) is loc:
-                    unexplored.add(coord)
+            for adjacent in neighbours[unexplored.pop()]:
+                if data[adjacent] == loc and adjacent not in group:
+                    group.add(adjacent)
+                    unexplored.append(adjacent)
 
         return group
 
-    def _is_alive(self, group: Set["SGFCoordinateType"]) -> bool:
-        return any(
-            self._get_loc(coord) is Location.EMPTY
-            for stone in group
-            for coord in self._get_adjacent(stone)
-        )
-
-    def _kill_group(self, coord: "SGFCoordinateType", player: Player) -> int:
-        if self._get_loc(coord) != player.loc():
+    def _build_chains(self, indices: Iterable[int]) -> List[SGFChain]:
+        """Builds SGFChains of stones at indices, which have no SGFChain yet."""
+        data = self._data
+        neighbours = self._neighbours
+        built = []
+        for index in indices:
+            if index in self._chains or not data[index]:
+                continue
+
+            stones = self._get_group(index)
+            liberties = {
+                adjacent
+                for stone in stones
+                for adjacent in neighbours[stone]
+                if not data[adjacent]
+            }
+            chain = SGFChain(LOCATIONS[data[index]], stones, liberties)
+            for stone in stones:
+                self._chains[stone] = chain
+            built.append(chain)
+        return built
+
+    def _set_points(self, points: Dict[int, int]):
+        """
+        Sets points regardless of rules, and rebuilds SGFChains around them.
+
+        Changes are logged as moves do, so undo reverts them.
+        """
+        data = self._data
+        points = {
+            index: loc for index, loc in points.items() if data[index] != Location(loc)
+        }
+        affected = set(points)
+        for index in points:
+            affected.update(self._neighbours[index])
+
+        reverts = self._get_reverts()
+        for index in affected:
+            chain = self._chains.get(index)
+            if chain:
+                self._remove_chain(chain)
+                reverts.append((self._restore_chain, chain))
+
+        for index, loc in points.items():
+            self._set_loc(index, Location(loc))
+        for chain in self._build_chains(affected):
+            reverts.append((self._remove_chain, chain))
+
+    def _get_reverts(self) -> List[Tuple[Callable, ...]]:
+        """
+        Returns calls which undo makes to revert changes of SGFChains,
+        as (function, *args) tuples, or a throwaway list without history.
+        """
+        return self.history[-1][4] if self.history else []
+
+    def _restore_chain(self, chain: SGFChain):
+        for stone in chain.stones:
+            self._chains[stone] = chain
+
+    def _remove_chain(self, chain: SGFChain):
+        for stone in chain.stones:
+            del self._chains[stone]
+
+    def _split_chain(self, chain: SGFChain, other: SGFChain, liberties: Set[int]):
+        """Reverts merging `other` SGFChain into `chain`."""
+        chain.stones -= other.stones
+        chain.liberties -= liberties
+        self._restore_chain(other)
+
+    def _place_stone(self, index: int):
+        """Places stone of the player and merges it with adjacent SGFChains."""
+        color = self.player.loc()
+        self._set_loc(index, color)
+
+        chains = self._chains
+        reverts = self._get_reverts()
+        stone_chain = chain = SGFChain(color, {index}, set())
+        reverts.append((dict.pop, chains, index))
+        for adjacent in self._neighbours[index]:
+            other = chains.get(adjacent)
+            if not other:
+                if chain is stone_chain:
+                    chain.liberties.add(adjacent)
+                elif adjacent not in chain.liberties:
+                    chain.liberties.add(adjacent)
+                    reverts.append((set.discard, chain.liberties, adjacent))
+                continue
+
+            if index in other.liberties:
+                other.liberties.remove(index)
+                reverts.append((set.add, other.liberties, index))
+            if other.color is not color or other is chain:
+                continue
+
+            # merge smaller SGFChain into bigger one
+            if len(other.stones) < len(chain.stones):
+                chain, other = other, chain
+            for stone in other.stones:
+                chains[stone] = chain
+            liberties = other.liberties - chain.liberties
+            chain.stones |= other.stones
+            chain.liberties |= liberties
+            reverts.append((self._split_chain, chain, other, liberties))
+
+        chains[index] = chain
+
+    def _kill_group(self, index: int, player: Player) -> int:
+        chain = self._chains.get(index)
+        if not chain or chain.color is not player.loc() or chain.liberties:
             return 0
 
-        group = self._get_group(coord)
-
-        if self._is_alive(group):
-            return 0
-
-        for coord in group:
-            self._set_coord(coord, Location.EMPTY)
-
-        return len(group)
-
-    def _capture_stones(self, coord: "SGFCoordinateType"):
-        for adjacent in self._get_adjacent(coord):
+        chains = self._chains
+        for stone in chain.stones:
+            self._set_loc(stone, Location.EMPTY)
+            del chains[stone]
+        reverts = self._get_reverts()
+        reverts.append((self._restore_chain, chain))
+        for stone in chain.stones:
+            for adjacent in self._neighbours[stone]:
+                other = chains.get(adjacent)
+                if other and stone not in other.liberties:
+                    other.liberties.add(stone)
+                    reverts.append((set.discard, other.liberties, stone))
+
+        return len(chain.stones)
+
+    def _capture_stones(self, index: int):
+        for adjacent in self._neighbours[index]:
             self.captured[self.player] += self._kill_group(adjacent, -self.player)
 
-    def _check_point(self, coord: "SGFCoordinateType"):
-        if self._get_loc(coord) is not Location.EMPTY:
+    def _check_point(self, index: int):
+        if self._data[index]:
             raise SGFBoardError("Not empty")
 
-    def _check_suicide(self, coord: "SGFCoordinateType"):
-        group = self._get_group(coord)
-        if not self._is_alive(group):
+    def _check_suicide(self, index: int):
+        if not self._chains[index].liberties:
             raise SGFBoardError("Suicide")
 
+    def _iter_previous(self, pending: Dict[int, int] = None) -> Iterator[bool]:
+        """
+        Yields whether position before each move in history is the current one
+        with pending changes, starting from the last move.
+
+        Reverts changes on a copy of changed points only.
+        """
+        data = self._data
+        pending = pending or {}
+        previous = {}
+        different = sum(loc != data[index] for index, loc in pending.items())
+        for *_, changes, _ in reversed(self.history):
+            for index, loc in reversed(changes):
+                target = pending.get(index, data[index])
+                was_different = previous.get(index, data[index]) != target
+                previous[index] = loc
+                different += (loc != target) - was_different
+            yield not different
+
+    def _is_ko(self, position_hash: int, pending: Dict[int, int], played: bool) -> bool:
+        """
+        Checks whether position repeats the one before the previous move.
+
+        Position is the current one with pending changes, `played` tells
+        whether the move is already in history.
+        """
+        previous = len(self.history) - 1 - played
+        if previous < 0 or self.history[previous][2] != position_hash:
+            return False
+        # confirm, as different positions may have the same hash
+        return next(islice(self._iter_previous(pending), played, None))
+
+    def _is_super_ko(
+        self, position_hash: int, pending: Dict[int, int], played: bool
+    ) -> bool:
+        """Checks whether position repeats any one before the previous move."""
+        player = -self.player
+        key = self._position_key(position_hash, player)
+        recent = self.history[max(len(self.history) - 1 - played, 0) :]
+        recent = [self._position_key(h, p) for p, _, h, *_ in recent]
+        if self.positions[key] <= recent.count(key):
+            return False
+
+        # confirm, as different positions may have the same hash
+        previous = zip(self._iter_previous(pending), reversed(self.history))
+        for same, (previous_player, *_) in islice(previous, 1 + played, None):
+            if same and (not self.situational_super_ko or previous_player is player):
+                return True
+        return False
+
     def _check_ko(self):
-        if len(self.history) > 1 and self.history[-2][0] == self.data:
+        if self._is_ko(self.hash, {}, played=True):
             raise SGFBoardError("Ko")
 
     def _check_super_ko(self):
-        if any(data == self.data for data, *_ in self.history[-3::-1]):
+        if self._is_super_ko(self.hash, {}, played=True):
             raise SGFBoardError("Super-Ko")
 
+    def is_legal(self, coord: "SGFCoordinateType" = None) -> bool:
+        """
+        Checks whether the player can play at coord without changing the board.
+
+        Uses liberties of adjacent groups and Zobrist hashes, so positions
+        are compared only when the hash matches.
+        """
+        if not coord:
+            return True
+        if not self._is_valid_coord(coord):
+            return False
+
+        index = self._get_index(coord)
+        if self._data[index]:
+            return False
+
+        color = self.player.loc()
+        pending = {index: color}
+        alive = False
+        for adjacent in self._neighbours[index]:
+            chain = self._chains.get(adjacent)
+            if not chain:
+                alive = True
+            elif chain.color is color:
+                alive = alive or len(chain.liberties) > 1
+            elif len(chain.liberties) == 1:
+                alive = True
+                pending.update(dict.fromkeys(chain.stones, Location.EMPTY))
+
+        if not alive:
+            if not self.allow_suicide:
+                return False
+            pending[index] = Location.EMPTY
+            for adjacent in self._neighbours[index]:
+                chain = self._chains[adjacent]
+                if chain.color is color:
+                    pending.update(dict.fromkeys(chain.stones, Location.EMPTY))
+
+        position_hash = self.hash
+        for point, loc in pending.items():
+            keys = self._zobrist[point]
+            position_hash ^= keys[self._data[point]] ^ keys[loc]
+
+        if self.allow_super_ko:
+            return not self._is_ko(position_hash, pending, played=False)
+        return not self._is_super_ko(position_hash, pending, played=False)
+
+    def legal_moves(self) -> List["SGFCoordinateType"]:
+        """Returns coordinates of all points where the player can play."""
+        cols = self.shape[1]
+        return [
+            divmod(index, cols)
+            for index, loc in enumerate(self._data)
+            if not loc and self.is_legal(divmod(index, cols))
+        ]
+
     def _move(self, coord: "SGFCoordinateType"):
         if not coord:
             return
 
-        self._check_point(coord)
-        self._set_coord(coord, self.player.loc())
-        self._capture_stones(coord)
+        index = self._get_index(coord)
+        self._check_point(index)
+        self._place_stone(index)
+        self._capture_stones(index)
 
         if self.allow_suicide:
-            self.captured[-self.player] += self._kill_group(coord, self.player)
+            self.captured[-self.player] += self._kill_group(index, self.player)
         else:
-            self._check_suicide(coord)
+            self._check_suicide(index)
 
         if self.allow_super_ko:
             self._check_ko()
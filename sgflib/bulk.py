@@ -0,0 +1,200 @@
+import os
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .collection import SGFCollection
+from .enums import ParserEngine, Token
+from .exceptions import SGFParserError
+from .game_tree import iter_tree
+from .parser import SGFParser, split_game_trees
+from .tokenizer import SGFSplitter
+
+if TYPE_CHECKING:
+    from .types import SGFGameTreeType
+
+PathType = Union[str, os.PathLike]
+
+
+class SGFParseResult(NamedTuple):
+    path: PathType
+    collection: Optional[SGFCollection]
+    error: Optional[Exception]
+
+
+def iter_sgf_paths(paths: Iterable[PathType]) -> Iterator[PathType]:
+    """Expands directories into sorted *.sgf files found in them."""
+    for path in paths:
+        if os.path.isdir(path):
+            yield from sorted(Path(path).rglob("*.sgf"))
+        else:
+            yield path
+
+
+def _parse_game_tree(data: str) -> "SGFGameTreeType":
+    return SGFParser(data, engine=ParserEngine.TOKENIZER)._parse_tokens(count=1)[0]
+
+
+def _flatten(tree: "SGFGameTreeType") -> List[Tuple[list, int]]:
+    """
+    Lists SGFSequence and number of variations of tree and its variations
+    in document order, so deep trees are pickled without recursion.
+    """
+    return [
+        (subtree[0], len(subtree[1]))
+        for token, subtree, _ in iter_tree(tree)
+        if token is Token.TREE_START
+    ]
+
+
+def _unflatten(items: List[Tuple[list, int]]) -> "SGFGameTreeType":
+    """Builds tree listed by _flatten."""
+    stack = []  # open SGFGameTrees: sequence, number of variations, variations
+    for sequence, count in items:
+        stack.append((sequence, count, []))
+        while len(stack[-1][2]) == stack[-1][1]:
+            sequence, _, variations = stack.pop()
+            if not stack:
+                return sequence, variations
+            stack[-1][2].append((sequence, variations))
+
+
+def _parse_batch(
+    batch: List[List[str]],
+) -> List[Tuple[Optional[List[list]], Optional[Tuple[int, Exception]]]]:
+    """
+    Parses SGF data of SGFGameTrees in worker process.
+
+    Returns flattened plain SGFGameTreeType structures, which are cheaper
+    to send between processes than SGFGameTrees, or the error and index
+    of SGFGameTree which failed.
+    """
+    results = []
+    for trees in batch:
+        parsed = []
+        try:
+            for data in trees:
+                parsed.append(_flatten(_parse_game_tree(data)))
+        except Exception as err:
+            results.append((None, (len(parsed), err)))
+        else:
+            results.append((parsed, None))
+    return results
+
+
+def _make_result(
+    path: PathType, parts: List[list], error: Optional[Exception]
+) -> SGFParseResult:
+    trees = []
+    for future, index, starts in parts:
+        if error:
+            break
+        try:
+            part, failed = future.result()[index]
+        except Exception as err:
+            error = err
+            break
+
+        if failed:
+            number, error = failed
+            if isinstance(error, SGFParserError):
+                error = SGFParserError(
+                    error.msg, error.data, error.index, starts[number]
+                )
+        else:
+            trees.extend(map(_unflatten, part))
+
+    if error:
+        return SGFParseResult(path, None, error)
+    return SGFParseResult(path, SGFCollection(trees), None)
+
+
+def parse_many(
+    paths: Iterable[PathType],
+    workers: Optional[int] = None,
+    batch_size: int = 1 << 20,
+    encoding: str = "utf-8",
+    chunk_size: int = 65536,
+) -> Iterator[SGFParseResult]:
+    """
+    Parses many SGF files in a pool of worker processes.
+
+    Directories are searched for *.sgf files. Files are split at top-level
+    SGFGameTree boundaries and sent to workers in batches of about
+    `batch_size` characters, so large collections are parsed in parallel
+    and small files share batches.
+
+    Yields SGFParseResult for every file in order. Files which could not
+    be read or parsed have the error instead of SGFCollection. Positions
+    in SGFParserErrors are relative to the file.
+    """
+    workers = workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(workers) as executor:
+        # (path, parts, error), part is [future, index in batch, tree positions]
+        files = deque()
+        running = set()
+        batch = []  # (part, trees)
+        batch_length = 0
+
+        def submit():
+            nonlocal batch, batch_length
+            future = executor.submit(_parse_batch, [trees for _, trees in batch])
+            for part, _ in batch:
+                part[0] = future
+            running.add(future)
+            batch = []
+            batch_length = 0
+
+        def collect(block: bool) -> Iterator[SGFParseResult]:
+            while files:
+                path, parts, error = files[0]
+                futures = [future for future, _, _ in parts]
+                if None in futures or not (block or all(f.done() for f in futures)):
+                    return
+                files.popleft()
+                yield _make_result(path, parts, error)
+
+        for path in iter_sgf_paths(paths):
+            parts = []
+            files.append((path, parts, None))
+            try:
+                trees = []
+                starts = []
+                for start, data in split_game_trees(
+                    path, SGFSplitter(), chunk_size, encoding
+                ):
+                    trees.append(data)
+                    starts.append(start)
+                    batch_length += len(data)
+                    if batch_length >= batch_size:
+                        parts.append([None, len(batch), starts])
+                        batch.append((parts[-1], trees))
+                        trees = []
+                        starts = []
+                        submit()
+            except (OSError, ValueError) as err:
+                files[-1] = path, parts, err
+            else:
+                if trees:
+                    parts.append([None, len(batch), starts])
+                    batch.append((parts[-1], trees))
+
+            while len(running) > 2 * workers:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                running.difference_update(done)
+            yield from collect(block=False)
+
+        if batch:
+            submit()
+        yield from collect(block=True)
@@ -0,0 +1,307 @@
+"""
+Binary format of parsed SGF data and a cache of parsed SGF files.
+
+Packed SGFCollection starts with a header: magic, version and size of
+string data in UTF-8, then item size and number of items of every integer
+stream. Integers are stored in the narrowest of 1, 2 or 4 byte fields
+fitting the largest of them, in little-endian order.
+
+Every label and value is kept in the string table once, and every
+SGFProperty (label with its values) in the property table once, so
+repeated moves and setup take a single reference. Streams are:
+
+- character lengths of strings, followed by string data;
+- properties: label, number of values and values, as string indexes;
+- structure: number of SGFGameTrees, then every SGFGameTree in document
+  order as number of SGFNodes, number of SGFProperties of each SGFNode
+  and number of variations;
+- SGFProperties of all SGFNodes, as property indexes.
+"""
+import hashlib
+import os
+import struct
+import sys
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+from .collection import SGFCollection
+from .enums import ParserEngine, Token
+from .exceptions import SGFCacheError
+from .game_tree import SGFGameTree, iter_tree
+from .node import SGFNode
+from .parser import SGFParser
+from .property_value import SGFPropertyValue
+from .sequence import SGFSequence
+
+PathType = Union[str, os.PathLike]
+
+MAGIC = b"SGFB"
+VERSION = 2
+# magic, version, size of string data, item size and length of four streams
+HEADER = struct.Struct("<4sII" + "BI" * 4)
+TYPECODES = {1: "B", 2: "H", 4: "I"}
+# source file of cached data: mtime in nanoseconds, size and SHA-256 digest
+SOURCE = struct.Struct("<QQ32s")
+
+PropertyType = Tuple[str, Tuple[str, ...]]
+
+
+def _pack_ints(integers: List[int]) -> Tuple[int, bytes]:
+    """Returns item size and data of integers in the narrowest fields."""
+    top = max(integers, default=0)
+    packed = array("B" if top < 1 << 8 else "H" if top < 1 << 16 else "I", integers)
+    if sys.byteorder == "big":
+        packed.byteswap()
+    return packed.itemsize, packed.tobytes()
+
+
+def _unpack_ints(data: bytes, itemsize: int) -> array:
+    if itemsize not in TYPECODES:
+        raise SGFCacheError("Invalid data")
+    integers = array(TYPECODES[itemsize])
+    integers.frombytes(data)
+    if sys.byteorder == "big":
+        integers.byteswap()
+    return integers
+
+
+def pack_collection(trees: Iterable[SGFGameTree]) -> bytes:
+    """Packs SGFGameTrees of SGFCollection into the binary format."""
+    strings: Dict[str, int] = {}
+    properties: Dict[PropertyType, int] = {}
+    table = []
+    trees = list(trees)
+    structure = [len(trees)]
+    node_properties = []
+
+    for tree in trees:
+        for token, subtree, _ in iter_tree(tree):
+            if token is Token.TREE_END:
+                continue
+            structure.append(len(subtree.sequence))
+            for node in subtree.sequence:
+                structure.append(len(node))
+                for label, values in node.items():
+                    prop = (label, tuple(sorted(values)))
+                    if prop not in properties:
+                        properties[prop] = len(properties)
+                        table.append(strings.setdefault(label, len(strings)))
+                        table.append(len(values))
+                        for value in prop[1]:
+                            table.append(strings.setdefault(value, len(strings)))
+                    node_properties.append(properties[prop])
+            structure.append(len(subtree.variations))
+
+    data = "".join(strings).encode("utf-8")
+    streams = [
+        _pack_ints([len(string) for string in strings]),
+        _pack_ints(table),
+        _pack_ints(structure),
+        _pack_ints(node_properties),
+    ]
+    header = HEADER.pack(
+        MAGIC,
+        VERSION,
+        len(data),
+        *(
+            field
+            for itemsize, packed in streams
+            for field in (itemsize, len(packed) // itemsize)
+        ),
+    )
+    (_, lengths), *others = streams
+    return b"".join([header, lengths, data, *(packed for _, packed in others)])
+
+
+def unpack_collection(data: bytes) -> SGFCollection:
+    """
+    Unpacks SGFCollection from the binary format.
+
+    Builds SGFNodes, SGFSequences and SGFGameTrees directly, as packed
+    data was taken from valid ones.
+    """
+    try:
+        magic, version, size, *fields = HEADER.unpack_from(data)
+    except struct.error:
+        raise SGFCacheError("Truncated data") from None
+    if magic != MAGIC or version != VERSION:
+        raise SGFCacheError("Unknown format")
+
+    streams = list(zip(fields[0::2], fields[1::2]))  # item size, length
+    if len(data) != HEADER.size + size + sum(i * n for i, n in streams):
+        raise SGFCacheError("Truncated data")
+
+    integers = []
+    position = HEADER.size
+    for itemsize, length in streams:
+        end = position + itemsize * length
+        integers.append(_unpack_ints(data[position:end], itemsize))
+        position = end
+        if len(integers) == 1:
+            # string data follows character lengths of strings
+            try:
+                text = data[position : position + size].decode("utf-8")
+            except UnicodeDecodeError:
+                raise SGFCacheError("Invalid data") from None
+            position += size
+    lengths, table, structure, node_properties = integers
+
+    strings = []
+    offset = 0
+    for string_length in lengths:
+        strings.append(text[offset : offset + string_length])
+        offset += string_length
+
+    try:
+        properties = _unpack_properties(strings, table)
+        return _unpack_trees(properties, structure, node_properties)
+    except IndexError:
+        raise SGFCacheError("Invalid data") from None
+
+
+def _unpack_properties(strings: List[str], table: array) -> List[PropertyType]:
+    properties = []
+    position = 0
+    while position < len(table):
+        value_count = table[position + 1]
+        values = table[position + 2 : position + 2 + value_count]
+        if len(values) != value_count:
+            raise SGFCacheError("Invalid data")
+        properties.append(
+            (strings[table[position]], tuple([strings[index] for index in values]))
+        )
+        position += 2 + value_count
+    return properties
+
+
+def _unpack_trees(
+    properties: List[PropertyType], structure: array, node_properties: array
+) -> SGFCollection:
+    position = 1
+    prop_position = 0
+
+    def read_sequence() -> Tuple[SGFSequence, int]:
+        """Reads SGFNodes and number of variations of an SGFGameTree."""
+        nonlocal position, prop_position
+        sequence = SGFSequence.__new__(SGFSequence)
+        node_count = structure[position]
+        position += 1
+        for prop_count in structure[position : position + node_count]:
+            node = SGFNode.__new__(SGFNode)
+            end = prop_position + prop_count
+            for index in node_properties[prop_position:end]:
+                label, values = properties[index]
+                value = SGFPropertyValue.__new__(SGFPropertyValue)
+                set.update(value, values)
+                dict.__setitem__(node, label, value)
+            prop_position = end
+            list.append(sequence, node)
+        position += node_count + 1
+        return sequence, structure[position - 1]
+
+    def new_tree(sequence: SGFSequence, variations: List[SGFGameTree]) -> SGFGameTree:
+        tree = tuple.__new__(SGFGameTree, (sequence, variations))
+        tree.__init__()
+        return tree
+
+    collection = SGFCollection.__new__(SGFCollection)
+    for _ in range(structure[0]):
+        # open SGFGameTrees: sequence, number of variations and built variations
+        stack = [(*read_sequence(), [])]
+        while True:
+            sequence, variation_count, variations = stack[-1]
+            if len(variations) < variation_count:
+                stack.append((*read_sequence(), []))
+                continue
+
+            stack.pop()
+            tree = new_tree(sequence, variations)
+            if not stack:
+                break
+            stack[-1][2].append(tree)
+        list.append(collection, tree)
+
+    if position != len(structure) or prop_position != len(node_properties):
+        raise SGFCacheError("Invalid data")
+    return collection
+
+
+class SGFCache:
+    """
+    Cache of parsed SGF files in directory, one binary file per SGF file.
+
+    Cache files are named after SGF file path and encoding, and record
+    modification time, size and SHA-256 digest of the SGF file. When
+    modification time or size changed, SGF data is read again, and only
+    parsed if its digest changed as well. Unreadable cache files count
+    as missing ones, and cache files which cannot be written are skipped.
+    """
+
+    def __init__(self, directory: PathType):
+        self.directory = Path(directory)
+
+    def get_path(self, path: PathType, encoding: str = "utf-8") -> Path:
+        """Returns path of cache file of SGF file path."""
+        key = f"{Path(path).resolve()}\0{encoding}".encode("utf-8", "surrogateescape")
+        return self.directory / f"{hashlib.sha1(key).hexdigest()}.sgfb"
+
+    def load(self, path: PathType, encoding: str = "utf-8") -> SGFCollection:
+        """Loads SGFCollection of SGF file, from cache file if it is up to date."""
+        cache_path = self.get_path(path, encoding)
+        stat = os.stat(path)
+        try:
+            cached = cache_path.read_bytes()
+            mtime, size, digest = SOURCE.unpack_from(cached)
+        except (OSError, struct.error):
+            cached, digest = None, None
+
+        if cached and (mtime, size) == (stat.st_mtime_ns, stat.st_size):
+            collection = self._unpack(cached)
+            if collection is not None:
+                return collection
+
+        with open(path, "rb") as fp:
+            data = fp.read()
+        source_digest = hashlib.sha256(data).digest()
+        source = SOURCE.pack(stat.st_mtime_ns, len(data), source_digest)
+
+        collection = None
+        if cached and source_digest == digest:
+            collection = self._unpack(cached)
+        if collection is None:
+            text = data.decode(encoding)
+            parser = SGFParser(text, engine=ParserEngine.TOKENIZER)
+            collection = parser.parse_collection()
+            cached = source + pack_collection(collection)
+        else:
+            cached = source + cached[SOURCE.size :]
+
+        try:
+            self._write(cache_path, cached)
+        except OSError:
+            # read-only or full cache directory, SGF file is parsed next time
+            pass
+        return collection
+
+    @staticmethod
+    def _unpack(cached: bytes) -> Optional[SGFCollection]:
+        try:
+            return unpack_collection(cached[SOURCE.size :])
+        except SGFCacheError:
+            return None
+
+    def _write(self, cache_path: Path, data: bytes):
+        """Writes cache file atomically, so it is never read half written."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fp = tempfile.NamedTemporaryFile(
+            dir=self.directory, prefix=cache_path.name, suffix=".tmp", delete=False
+        )
+        try:
+            with fp:
+                fp.write(data)
+            os.replace(fp.name, cache_path)
+        except OSError:
+            os.unlink(fp.name)
+            raise
@@ -1,6 +1,8 @@
-from typing import TYPE_CHECKING, List, Iterable
+import os
+from typing import TYPE_CHECKING, IO, Iterator, List, Iterable, Union
 
 from .game_tree import SGFGameTree
+from .writer import dump
 
 if TYPE_CHECKING:
     from .types import SGFGameTreeType
@@ -12,7 +14,18 @@ class SGFCollection(List[SGFGameTree]):
 
     @property
     def sgf(self):
-        return "\n\n".join(tree.sgf for tree in self)
+        return "".join(self.iter_sgf())
+
+    def iter_sgf(self) -> Iterator[str]:
+        """Yields SGF data node by node."""
+        for index, tree in enumerate(self):
+            if index:
+                yield "\n\n"
+            yield from tree.iter_sgf()
+
+    def write(self, fp: Union[str, os.PathLike, IO], encoding: str = "utf-8"):
+        """Writes SGF data to file path or file object, see `dump`."""
+        dump(self, fp, encoding=encoding)
 
     def __repr__(self):
         return f"SGFCollection({self.sgf})"
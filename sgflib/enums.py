@@ -28,3 +28,30 @@ class Player(str, Enum):
 class GoRules(str, Enum):
     JAPANESE = "Japanese"
     CHINESE = "Chinese"
+
+
+class ParserEngine(str, Enum):
+    RECURSIVE = "recursive"
+    TOKENIZER = "tokenizer"
+
+
+class Token(IntEnum):
+    TREE_START = 1
+    TREE_END = 2
+    NODE = 3
+    LABEL = 4
+    VALUE = 5
+
+
+class HandlerAction(str, Enum):
+    SKIP = "skip"
+    STOP = "stop"
+
+
+class MoveError(IntEnum):
+    NONE = 0
+    WRONG_COORDINATE = 1
+    NOT_EMPTY = 2
+    SUICIDE = 3
+    KO = 4
+    SUPER_KO = 5
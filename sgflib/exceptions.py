@@ -1,15 +1,47 @@
-class SGFParserError(ValueError):
-    def __init__(self, msg: str, data: str, index: int):
-        lineno = data.count("\n", 0, index) + 1
-        colno = index - data.rfind("\n", 0, index)
-        errmsg = f"{msg}: line {lineno} column {colno} (char {index})"
+from typing import TYPE_CHECKING, Tuple
+
+if TYPE_CHECKING:
+    from .types import SGFDataType
+
 
-        super().__init__(errmsg)
+class SGFParserError(ValueError):
+    def __init__(
+        self,
+        msg: str,
+        data: "SGFDataType",
+        index: int,
+        start: Tuple[int, int, int] = (0, 1, 1),
+    ):
         self.msg = msg
         self.data = data
         self.index = index
-        self.lineno = lineno
-        self.colno = colno
+        # char, line and column where data starts in the whole SGF data
+        self.start = start
+        # data is kept out of args, so repr does not print it
+        super().__init__(
+            f"{msg}: line {self.lineno} column {self.colno} (char {self.position})"
+        )
+
+    @property
+    def position(self) -> int:
+        return self.start[0] + self.index
+
+    @property
+    def lineno(self) -> int:
+        if isinstance(self.data, str):
+            return self.data.count("\n", 0, self.index) + self.start[1]
+        return bytes(self.data[: self.index]).count(b"\n") + self.start[1]
+
+    @property
+    def colno(self) -> int:
+        newline = "\n" if isinstance(self.data, str) else b"\n"
+        line_start = self.data.rfind(newline, 0, self.index)
+        if line_start < 0:
+            return self.index + self.start[2]
+        return self.index - line_start
+
+    def __reduce__(self):
+        return self.__class__, (self.msg, self.data, self.index, self.start)
 
 
 class SGFPropertyValueError(Exception):
@@ -38,3 +70,7 @@ class SGFCoordinateError(Exception):
 
 class SGFPointError(Exception):
     pass
+
+
+class SGFCacheError(Exception):
+    pass
@@ -1,21 +1,63 @@
-from typing import TYPE_CHECKING, List, Tuple, Iterable
+import os
+from itertools import zip_longest
+from typing import TYPE_CHECKING, IO, Iterator, List, Tuple, Iterable, Union
 
+from .enums import Token
 from .sequence import SGFSequence
 from .exceptions import SGFGameTreeError
+from .writer import dump
 
 if TYPE_CHECKING:
     from .types import SGFSequenceType, SGFGameTreeType
 
 
+def iter_tree(
+    tree: "SGFGameTreeType",
+) -> Iterator[Tuple[Token, "SGFGameTreeType", int]]:
+    """
+    Yields TREE_START and TREE_END of tree and all its variations
+    in document order, with their depth.
+
+    Keeps open SGFGameTrees on explicit stack instead of recursion,
+    so trees of any depth are walked in linear time.
+    """
+    yield Token.TREE_START, tree, 0
+    stack = [(tree, iter(tree[1] if len(tree) > 1 else ()))]
+    while stack:
+        for variation in stack[-1][1]:
+            yield Token.TREE_START, variation, len(stack)
+            variations = variation[1] if len(variation) > 1 else ()
+            stack.append((variation, iter(variations)))
+            break
+        else:
+            variation, _ = stack.pop()
+            yield Token.TREE_END, variation, len(stack)
+
+
 class SGFGameTree(Tuple[SGFSequence, List["SGFGameTree"]]):
     def __new__(
         cls,
         sequence: "SGFSequenceType",
         variations: Iterable["SGFGameTreeType"] = (),
     ):
-        sequence = SGFSequence(sequence)
-        variations = [SGFGameTree(*tree) for tree in variations]
-        return super().__new__(cls, (sequence, variations))
+        if not variations:
+            return super().__new__(cls, (SGFSequence(sequence), []))
+
+        # build variations bottom up, each one when its TREE_END is reached
+        stack = []  # variations of open SGFGameTrees
+        for token, tree, _ in iter_tree((sequence, variations)):
+            if token is Token.TREE_START:
+                stack.append([])
+                continue
+
+            built_variations = stack.pop()
+            if not stack:
+                break
+            built = super().__new__(cls, (SGFSequence(tree[0]), built_variations))
+            built.__init__()
+            stack[-1].append(built)
+
+        return super().__new__(cls, (SGFSequence(sequence), built_variations))
 
     def __init__(self, *_, **__):
         self.sequence, self.variations = self
@@ -25,27 +67,54 @@ class SGFGameTree(Tuple[SGFSequence, List["SGFGameTree"]]):
 
     @property
     def sgf(self):
-        return (
-            "("
-            + self.sequence.sgf
-            + "".join(tree.sgf for tree in self.variations)
-            + ")"
-        )
+        return "".join(self.iter_sgf())
+
+    def iter_sgf(self) -> Iterator[str]:
+        """Yields SGF data node by node."""
+        for token, tree, _ in iter_tree(self):
+            if token is Token.TREE_START:
+                yield "("
+                yield from tree.sequence.iter_sgf()
+            else:
+                yield ")"
+
+    def write(self, fp: Union[str, os.PathLike, IO], encoding: str = "utf-8"):
+        """Writes SGF data to file path or file object, see `dump`."""
+        dump(self, fp, encoding=encoding)
 
     def __eq__(self, other: "SGFGameTreeType"):
-        return super().__eq__(SGFGameTree(*other))
+        end = (None, None, None)
+        for (token, tree, depth), (other_token, other_tree, other_depth) in zip_longest(
+            iter_tree(self), iter_tree(other), fillvalue=end
+        ):
+            if token is not other_token or depth != other_depth:
+                return False
+            if token is Token.TREE_START:
+                sequence = other_tree[0]
+                if not isinstance(sequence, SGFSequence):
+                    sequence = SGFSequence(sequence)
+                if tree.sequence != sequence:
+                    return False
+        return True
+
+    def __ne__(self, other: "SGFGameTreeType"):
+        return not self == other
 
     def copy(self) -> "SGFGameTree":
-        return SGFGameTree(
-            sequence=self.sequence.copy(),
-            variations=[tree.copy() for tree in self.variations],
-        )
+        return SGFGameTree(*self)
 
     def pretty(self, offset: int = 0, indent: int = 2):
-        s = " " * offset + "(\n" + " " * (offset + indent) + self.sequence.sgf
-        for tree in self.variations:
-            s += "\n" + " " * offset + tree.pretty(offset + indent, indent)
-        return s + "\n" + " " * offset + ")"
+        parts = []
+        for token, tree, depth in iter_tree(self):
+            tree_offset = offset + depth * indent
+            if token is Token.TREE_END:
+                parts.append("\n" + " " * tree_offset + ")")
+                continue
+            if depth:
+                parts.append("\n" + " " * (tree_offset - indent))
+            parts.append(" " * tree_offset + "(\n")
+            parts.append(" " * (tree_offset + indent) + tree.sequence.sgf)
+        return "".join(parts)
 
     def insert(self, tree: "SGFGameTreeType", index: int) -> int:
         tree = SGFGameTree(*tree)
@@ -0,0 +1,26 @@
+from typing import List, Optional
+
+from .enums import HandlerAction
+
+
+class SGFHandler:
+    """
+    Receives events from SGFParser.parse_events.
+
+    Override the events of interest. Any event may return HandlerAction.SKIP
+    to skip the rest of current SGFGameTree, including its variations
+    (end_tree is still reported), or HandlerAction.STOP to stop parsing.
+    Labels and values are always str, bytes-like data is decoded first.
+    """
+
+    def start_tree(self) -> Optional[HandlerAction]:
+        pass
+
+    def end_tree(self) -> Optional[HandlerAction]:
+        pass
+
+    def start_node(self) -> Optional[HandlerAction]:
+        pass
+
+    def property(self, label: str, values: List[str]) -> Optional[HandlerAction]:
+        pass
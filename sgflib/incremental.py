@@ -0,0 +1,184 @@
+from typing import List, Tuple, Union
+
+from .enums import Token
+from .exceptions import SGFParserError
+from .game_tree import SGFGameTree
+from .node import SGFNode
+from .tokenizer import (
+    TOKENS,
+    advance_position,
+    reLineBreaks,
+    rePropValueSpecial,
+    reToken,
+)
+from .utils import convert_control_chars
+
+SGFEventType = Tuple[Token, Union[SGFNode, SGFGameTree]]
+
+
+class SGFIncrementalParser:
+    """
+    Parses SGF data arriving in chunks, e.g. from a socket or pipe.
+
+    `feed` keeps parser state between calls and never scans consumed data
+    again. It returns SGFNodes and top-level SGFGameTrees completed by the
+    chunk as (Token.NODE, SGFNode) and (Token.TREE_END, SGFGameTree) events.
+    SGFNode is completed when the next ";", "(" or ")" is read.
+    Positions in errors are relative to all data fed.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = (0, 1, 1)  # char, line and column of buffer
+        self.found = False
+        self.stack = []  # open SGFGameTrees: (nodes, variations)
+        self.node = None
+        self.label = None
+        self.values = []
+        self.value = None  # pieces of unterminated SGFProperty value
+        self.strip_breaks = False
+        self.events = []
+
+    def feed(self, chunk: str) -> List[SGFEventType]:
+        """Parses chunk of data and returns completed SGFNodes and SGFGameTrees."""
+        data = self.buffer + chunk
+        index = 0
+        self.events = []
+
+        while index < len(data):
+            if self.value is not None:
+                index = self._scan_value(data, index)
+                if self.value is not None:
+                    break
+                continue
+
+            match = reToken.match(data, index)
+            if not match:
+                if not data[index:].isspace():
+                    self._push(None, None, index, data)
+                index = len(data)
+                break
+
+            kind = match.lastindex
+            if kind == 4 and match.end() == len(data):
+                # label may continue in the next chunk
+                index = match.start(kind)
+                break
+
+            index = match.end()
+            if kind == 5:
+                self.value = []
+                self.strip_breaks = True
+            else:
+                self._push(TOKENS[kind], match.group(4), match.start(kind), data)
+
+        self.buffer = data[index:]
+        self.position = advance_position(self.position, data[:index])
+        return self.events
+
+    def close(self):
+        """Checks that data ended outside of SGFGameTree."""
+        if self.value is not None:
+            raise SGFParserError(
+                "Unterminated SGFProperty value",
+                self.buffer,
+                len(self.buffer),
+                self.position,
+            )
+        if self.stack:
+            raise SGFParserError(
+                "Unterminated SGFGameTree", self.buffer, len(self.buffer), self.position
+            )
+        if self.buffer.strip():
+            self._push(Token.LABEL, self.buffer, 0, self.buffer)
+        if not self.found:
+            raise SGFParserError(
+                "Expecting SGFCollection", self.buffer, 0, self.position
+            )
+
+    def _scan_value(self, data: str, index: int) -> int:
+        """
+        Continues scanning SGFProperty value.
+
+        Keeps scanned pieces of the value, so only a trailing "\\" is left
+        to be scanned again with the next chunk.
+        """
+        while True:
+            if self.strip_breaks:
+                index = reLineBreaks.match(data, index).end()
+                if index == len(data):
+                    return index
+                self.strip_breaks = False
+
+            match = rePropValueSpecial.search(data, index)
+            if not match:
+                end = len(data) - data.endswith("\\")
+                self.value.append(data[index:end])
+                return end
+
+            self.value.append(data[index : match.start()])
+            if match.lastindex:
+                self.value.append(match.group(1)[1:])
+                self.strip_breaks = True
+                index = match.end()
+                continue
+
+            value = convert_control_chars("".join(self.value))
+            self.value = None
+            self._push(Token.VALUE, value, match.start(), data)
+            return match.end()
+
+    def _push(self, token: Token, value: str, index: int, data: str):
+        if token is Token.VALUE and self.label is not None:
+            self.values.append(value)
+            return
+
+        if self.label is not None:
+            if self.values:
+                self.node[self.label] = self.values
+            else:
+                # label without values ends SGFNode, as in SGFParser
+                self._end_node()
+            self.label = None
+            self.values = []
+
+        stack = self.stack
+        if not stack and token is not Token.TREE_START:
+            raise SGFParserError(
+                "Extra data" if self.found else "Expecting SGFCollection",
+                data,
+                index,
+                self.position,
+            )
+
+        if token is Token.LABEL and self.node is not None:
+            self.label = value
+        elif token is Token.NODE and not stack[-1][1]:
+            self._end_node()
+            self.node = {}
+            stack[-1][0].append(self.node)
+        elif token is Token.TREE_START and (not stack or stack[-1][0]):
+            self._end_node()
+            stack.append(([], []))
+        elif token is Token.TREE_END and (stack[-1][0] or len(stack) > 1):
+            self._end_node()
+            if not stack[-1][0]:
+                # "()" is dropped and closes its parent, as in SGFParser
+                stack.pop()
+            tree = stack.pop()
+            if stack:
+                stack[-1][1].append(tree)
+            else:
+                self.found = True
+                self.events.append((Token.TREE_END, SGFGameTree(*tree)))
+        elif not stack[-1][0]:
+            raise SGFParserError("Expecting SGFSequence", data, index, self.position)
+        else:
+            raise SGFParserError(
+                "Unterminated SGFGameTree", data, index, self.position
+            )
+
+    def _end_node(self):
+        if self.node is not None:
+            self.events.append((Token.NODE, SGFNode(self.node)))
+            self.node = None
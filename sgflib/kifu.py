@@ -7,6 +7,7 @@ from . import (
     SGFNode,
     SGFPropertyValue,
 )
+from .board import SGFPosition
 from .types import SGFCoordinateType
 from .enums import Player, GoRules
 from .exceptions import SGFCursorError
@@ -60,6 +61,11 @@ class SGFKifu:
     def player(self) -> Player:
         return self.board.player
 
+    @property
+    def position(self) -> SGFPosition:
+        """Immutable snapshot of the current position."""
+        return self.board.snapshot()
+
     @property
     def sgf(self):
         return self.cursor.root_tree.sgf
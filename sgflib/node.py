@@ -1,28 +1,45 @@
-from typing import TYPE_CHECKING, Mapping, Dict
+import os
+import sys
+from collections.abc import MutableMapping
+from functools import wraps
+from typing import TYPE_CHECKING, IO, Iterator, Mapping, Dict, Optional, Tuple, Union
 
 from .property_value import SGFPropertyValue
+from .tokenizer import scan_properties
+from .utils import convert_control_chars, escape_text
+from .writer import dump
 
 if TYPE_CHECKING:
-    from .types import SGFNodeType, SGFPropertyValueType
+    from .types import SGFDataType, SGFNodeType, SGFPropertyValueType
 
 
 class SGFNode(Dict[str, SGFPropertyValue]):
+    # no __dict__, so subclasses may use __slots__
+    __slots__ = ()
+
     def __init__(self, data: "SGFNodeType" = None, **kwargs: "SGFPropertyValueType"):
         super().__init__()
         self.update(data, **kwargs)
 
     @property
     def sgf(self) -> str:
-        sgf_string = ";"
-        for prop_label, prop_value in sorted(self.items()):
-            sgf_string += prop_label + prop_value.sgf
-        return sgf_string
+        return ";" + "".join(
+            prop_label + prop_value.sgf
+            for prop_label, prop_value in sorted(self.items())
+        )
+
+    def iter_sgf(self) -> Iterator[str]:
+        yield self.sgf
+
+    def write(self, fp: Union[str, os.PathLike, IO], encoding: str = "utf-8"):
+        """Writes SGF data to file path or file object, see `dump`."""
+        dump(self, fp, encoding=encoding)
 
     def __repr__(self):
         return f"SGFNode({self.sgf})"
 
     def copy(self) -> "SGFNode":
-        return SGFNode({key: value.copy() for key, value in self.items()})
+        return SGFNode(self)
 
     def update(
         self,
@@ -46,3 +63,262 @@ class SGFNode(Dict[str, SGFPropertyValue]):
 
     def __setitem__(self, key: str, values: "SGFPropertyValueType"):
         return super().__setitem__(key, SGFPropertyValue(values))
+
+
+class SGFLazyNode(SGFNode):
+    """
+    SGFNode which parses its SGFProperties from source data on first access.
+
+    Bytes data is decoded with `encoding`, so SGFProperty values which
+    are never accessed are never decoded.
+    """
+
+    __slots__ = ("_data", "_index", "_encoding")
+
+    def __init__(self, data: "SGFDataType", index: int, encoding: Optional[str] = None):
+        dict.__init__(self)
+        self._data = data
+        self._index = index
+        self._encoding = encoding
+
+    @property
+    def loaded(self) -> bool:
+        return self._data is None
+
+    def _load(self):
+        if self._data is None:
+            return
+
+        encoding = self._encoding
+        # malformed data raises again on every access
+        props = scan_properties(self._data, self._index)
+        self._data = self._encoding = None
+        if encoding:
+            props = [
+                (
+                    label.decode("ascii"),
+                    [
+                        convert_control_chars(value.decode(encoding, "replace"))
+                        for value in values
+                    ],
+                )
+                for label, values in props
+            ]
+        dict.update(
+            self,
+            {label.upper(): SGFPropertyValue(values) for label, values in props},
+        )
+
+    def __eq__(self, other):
+        self._load()
+        if isinstance(other, SGFLazyNode):
+            other._load()
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __reduce__(self):
+        return SGFNode, (dict(self.items()),)
+
+    def copy(self) -> "SGFNode":
+        if self._data is not None:
+            return SGFLazyNode(self._data, self._index, self._encoding)
+        return SGFNode(self)
+
+
+# tuples of labels shared between SGFCompactNodes
+_labels_cache: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+
+def _compact_values(values: "SGFPropertyValueType") -> Union[str, Tuple[str, ...]]:
+    """Returns single value as str and more values as sorted tuple."""
+    values = sorted(SGFPropertyValue(values))
+    # points and other short values repeat a lot
+    values = [sys.intern(value) if len(value) <= 2 else value for value in values]
+    return values[0] if len(values) == 1 else tuple(values)
+
+
+def _expand_values(values: Union[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    return (values,) if isinstance(values, str) else values
+
+
+def _write_through(method):
+    @wraps(method)
+    def wrapper(self, *args):
+        result = method(self, *args)
+        self._store()
+        return result
+
+    return wrapper
+
+
+class _SGFCompactValue(SGFPropertyValue):
+    """
+    SGFPropertyValue of SGFCompactNode, which sets itself again on change.
+
+    Changes are stored while the SGFProperty keeps the values it was
+    read with, so values replaced or deleted since then are left alone.
+    """
+
+    def __init__(self, node: "SGFCompactNode", label: str, values):
+        super().__init__(_expand_values(values))
+        self._node = node
+        self._label = label
+        self._values = values
+
+    def _store(self):
+        node = self._node
+        try:
+            index = node._labels.index(self._label)
+        except ValueError:
+            return
+        if node._values[index] is self._values:
+            node[self._label] = self
+            self._values = node._values[index]
+
+    def __reduce__(self):
+        return SGFPropertyValue, (set(self),)
+
+    add = _write_through(SGFPropertyValue.add)
+    pop = _write_through(SGFPropertyValue.pop)
+    remove = _write_through(SGFPropertyValue.remove)
+    discard = _write_through(SGFPropertyValue.discard)
+    update = _write_through(SGFPropertyValue.update)
+    difference_update = _write_through(SGFPropertyValue.difference_update)
+    intersection_update = _write_through(SGFPropertyValue.intersection_update)
+    symmetric_difference_update = _write_through(
+        SGFPropertyValue.symmetric_difference_update
+    )
+    __ior__ = _write_through(SGFPropertyValue.__ior__)
+    __iand__ = _write_through(SGFPropertyValue.__iand__)
+    __isub__ = _write_through(SGFPropertyValue.__isub__)
+    __ixor__ = _write_through(SGFPropertyValue.__ixor__)
+
+
+class SGFCompactNode(MutableMapping):
+    """
+    SGFNode, which keeps SGFProperties in tuples instead of dict of sets.
+
+    Labels are interned and the same tuple of labels is shared between
+    SGFCompactNodes, single values are kept as str, and short values,
+    like points, are interned. Keeps mapping API of SGFNode: SGFPropertyValues
+    are built on access, and changing them in place sets them again, so
+    `node["AB"].add("cc")` is kept as with SGFNode. As SGFPropertyValues are
+    not shared, values replaced or deleted since access are not changed.
+    """
+
+    __slots__ = ("_labels", "_values")
+
+    def __init__(self, data: "SGFNodeType" = None, **kwargs: "SGFPropertyValueType"):
+        self._labels = ()
+        self._values = ()
+        self.update(data, **kwargs)
+
+    @property
+    def sgf(self) -> str:
+        parts = [";"]
+        for label, values in zip(self._labels, self._values):
+            values = sorted(map(escape_text, _expand_values(values)))
+            parts.append(label + "[" + "][".join(values) + "]")
+        return "".join(parts)
+
+    def iter_sgf(self) -> Iterator[str]:
+        yield self.sgf
+
+    def write(self, fp: Union[str, os.PathLike, IO], encoding: str = "utf-8"):
+        """Writes SGF data to file path or file object, see `dump`."""
+        dump(self, fp, encoding=encoding)
+
+    def __repr__(self):
+        return f"SGFCompactNode({self.sgf})"
+
+    def copy(self) -> "SGFCompactNode":
+        node = SGFCompactNode.__new__(SGFCompactNode)
+        node._labels, node._values = self._labels, self._values
+        return node
+
+    def __getitem__(self, key: str) -> SGFPropertyValue:
+        try:
+            values = self._values[self._labels.index(key)]
+        except ValueError:
+            raise KeyError(key) from None
+        return _SGFCompactValue(self, key, values)
+
+    def __setitem__(self, key: str, values: "SGFPropertyValueType"):
+        props = dict(zip(self._labels, self._values))
+        props[sys.intern(key)] = _compact_values(values)
+        self._set_props(props)
+
+    def __delitem__(self, key: str):
+        props = dict(zip(self._labels, self._values))
+        del props[key]
+        self._set_props(props)
+
+    def _set_props(self, props: Dict[str, Union[str, Tuple[str, ...]]]):
+        labels = tuple(sorted(props))
+        self._labels = _labels_cache.setdefault(labels, labels)
+        self._values = tuple(props[label] for label in labels)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._labels)
+
+    def __len__(self) -> int:
+        return len(self._labels)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._labels
+
+    def update(
+        self,
+        data: "SGFNodeType" = None,
+        **kwargs: "SGFPropertyValueType",
+    ):
+        data = data or []
+        if isinstance(data, Mapping):
+            data = data.items()
+
+        props = dict(zip(self._labels, self._values))
+        for label, values in [*data, *kwargs.items()]:
+            props[sys.intern(label.upper())] = _compact_values(values)
+        self._set_props(props)
+
+    def setdefault(
+        self, key: str, default: "SGFPropertyValueType" = ...
+    ) -> SGFPropertyValue:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+
+def _loading(method):
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self._load()
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+for _name in (
+    "__getitem__",
+    "__setitem__",
+    "__delitem__",
+    "__contains__",
+    "__iter__",
+    "__len__",
+    "__reversed__",
+    "__or__",
+    "__ior__",
+    "keys",
+    "values",
+    "items",
+    "get",
+    "pop",
+    "popitem",
+    "setdefault",
+    "update",
+    "clear",
+):
+    if hasattr(SGFNode, _name):
+        setattr(SGFLazyNode, _name, _loading(getattr(SGFNode, _name)))
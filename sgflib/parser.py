@@ -1,28 +1,87 @@
+import codecs
+import os
 import re
-from typing import Pattern, Match, List, Tuple
-
+from typing import (
+    TYPE_CHECKING,
+    IO,
+    Iterator,
+    Match,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    Union,
+)
+
+from .enums import HandlerAction, ParserEngine, Token
 from .exceptions import SGFParserError
-from .utils import convert_control_chars
+from .tokenizer import (
+    SGFSplitter,
+    SGFTokenizer,
+    get_patterns,
+    scan_properties,
+    scan_prop_value,
+)
 from .collection import SGFCollection
 from .property_value import SGFPropertyValue
-from .node import SGFNode
+from .node import SGFCompactNode, SGFNode, SGFLazyNode
 from .sequence import SGFSequence
-from .game_tree import SGFGameTree
+from .game_tree import SGFGameTree, iter_tree
+from .utils import convert_control_chars
+
+if TYPE_CHECKING:
+    from .handler import SGFHandler
+    from .types import SGFDataType, SGFGameTreeType
 
 reGameTreeStart = re.compile(r"\s*\(")
 reGameTreeEnd = re.compile(r"\s*\)")
 reNodeStart = re.compile(r"\s*;")
 rePropLabel = re.compile(r"\s*([a-zA-Z]+)")
 rePropValueStart = re.compile(r"\s*\[")
-rePropValueEnd = re.compile(r"]")
-reEscape = re.compile(r"\\[]\\]")
-reLineBreak = re.compile(r"(\r\n?|\n\r?)*")
 
 
 class SGFParser:
-    def __init__(self, data: str, index: int = 0):
+    """
+    Parses SGF data into SGFCollection, SGFGameTrees, SGFSequences and SGFNodes.
+
+    In `lazy` mode tokenizer engine only records where each SGFNode starts
+    and builds SGFLazyNodes, which parse their SGFProperties on first access.
+    Parsing still checks the structure: nesting of SGFGameTrees, that every
+    SGFProperty value is closed by "]", and that only labels and whitespace
+    come between them. Values without labels and SGFProperties after a label
+    without values are only reported when SGFProperties of their SGFNode
+    are accessed.
+
+    Both engines skip a label without values, which ends its SGFNode,
+    and drop an empty variation "()" along with ")" closing its parent.
+
+    Bytes-like data (bytes, bytearray, mmap) is always parsed lazily,
+    and SGFLazyNodes decode it on first access. The charset is taken
+    from CA property of each root SGFNode, falling back to `encoding`.
+    The data should stay available until all SGFNodes are accessed.
+
+    In `compact` mode tokenizer engine builds SGFCompactNodes, which take
+    several times less memory. It is ignored in `lazy` mode.
+    """
+
+    def __init__(
+        self,
+        data: "SGFDataType",
+        index: int = 0,
+        engine: Union[str, ParserEngine] = ParserEngine.RECURSIVE,
+        encoding: str = "utf-8",
+        lazy: bool = False,
+        compact: bool = False,
+    ):
         self.data = data
         self.index = index
+        self.engine = ParserEngine(engine)
+        self.encoding = encoding
+        self.lazy = lazy or not isinstance(data, str)
+        self.compact = compact and not self.lazy
+
+        if self.lazy or self.compact:
+            self.engine = ParserEngine.TOKENIZER
 
     def _match(self, pattern: Pattern) -> Match:
         return pattern.match(self.data, self.index)
@@ -37,7 +96,10 @@ class SGFParser:
         Called when "(" encountered.
         Finishes when last ")" encountered.
         """
-        game_trees = self.parse_game_trees()
+        if self.engine is ParserEngine.TOKENIZER:
+            game_trees = self._parse_tokens()
+        else:
+            game_trees = self.parse_game_trees()
 
         if not game_trees:
             raise SGFParserError("Expecting SGFCollection", self.data, self.index)
@@ -47,6 +109,65 @@ class SGFParser:
 
         return SGFCollection(game_trees)
 
+    def recover_collection(self) -> Tuple[SGFCollection, List[SGFParserError]]:
+        """
+        Parses SGFCollection, skipping malformed SGFGameTrees.
+
+        After an error parsing resumes after the ")" closing the malformed
+        top-level SGFGameTree. If it has no closing ")", or the error is
+        outside of SGFGameTrees, parsing resumes at the next "(;".
+        Returns SGFCollection of good SGFGameTrees and the errors,
+        which keep their offsets in `index`.
+
+        In `lazy` mode every SGFLazyNode of SGFGameTree is loaded before
+        it is accepted, so malformed SGFProperties are reported here
+        rather than on first access.
+        """
+        data = self.data
+        patterns = get_patterns(data)
+        trees = []
+        errors = []
+
+        while True:
+            match = patterns.token.match(data, self.index)
+            if not match and (self.index == len(data) or data[self.index :].isspace()):
+                break
+
+            start = self.index
+            try:
+                if not match or match.lastindex != 1:
+                    index = match.start(match.lastindex) if match else start
+                    raise SGFParserError("Expecting SGFGameTree", data, index)
+                tree = self.parse_game_tree()
+                if self.lazy:
+                    for token, variation, _ in iter_tree(tree):
+                        if token is Token.TREE_START:
+                            for node in variation.sequence:
+                                node._load()
+                trees.append(tree)
+                continue
+            except SGFParserError as err:
+                errors.append(err)
+
+            resync = None
+            if match and match.lastindex == 1:
+                tokenizer = SGFTokenizer(data)
+                try:
+                    tokenizer.skip_tree(match.end())
+                    resync = tokenizer.index + 1
+                except SGFParserError:
+                    pass
+            if resync is None:
+                match = patterns.resync.search(
+                    data, match.end() if match else start + 1
+                )
+                resync = match.start() if match else len(data)
+            self.index = resync
+
+        if not trees and not errors:
+            errors.append(SGFParserError("Expecting SGFCollection", data, self.index))
+        return SGFCollection(trees), errors
+
     def parse_game_trees(self) -> List[SGFGameTree]:
         """
         Parses multiple SGFGameTrees.
@@ -54,6 +175,9 @@ class SGFParser:
         Called when "(" encountered.
         Finishes when last ")" encountered.
         """
+        if self.engine is ParserEngine.TOKENIZER:
+            return [SGFGameTree(*tree) for tree in self._parse_tokens()]
+
         trees = []
         try:
             while True:
@@ -71,6 +195,12 @@ class SGFParser:
         Called when "(" encountered.
         Finishes when ")" encountered.
         """
+        if self.engine is ParserEngine.TOKENIZER:
+            trees = self._parse_tokens(count=1)
+            if not trees:
+                raise SGFParserError("Expecting SGFGameTree", self.data, self.index)
+            return SGFGameTree(*trees[0])
+
         match = self._match(reGameTreeStart)
         if not match:
             raise SGFParserError("Expecting SGFGameTree", self.data, self.index)
@@ -78,18 +208,39 @@ class SGFParser:
         # consume "("
         self.index = match.end()
 
-        sequence = self.parse_sequence()
-        variations = self.parse_game_trees()
-
-        match = self._match(reGameTreeEnd)
-
-        if not match:
-            raise SGFParserError("Unterminated SGFGameTree", self.data, self.index)
-
-        # consume ")"
-        self.index = match.end()
-
-        return SGFGameTree(sequence, variations)
+        # open SGFGameTrees are kept on explicit stack instead of recursion;
+        # a malformed variation ends variations of its parent, which
+        # should be closed by ")" right away
+        stack = [(self.parse_sequence(), [])]
+        closing = False
+        while True:
+            match = None if closing else self._match(reGameTreeStart)
+            if match:
+                # consume "("
+                self.index = match.end()
+                try:
+                    stack.append((self.parse_sequence(), []))
+                except SGFParserError:
+                    closing = True
+                continue
+
+            match = self._match(reGameTreeEnd)
+            if not match:
+                if len(stack) == 1:
+                    raise SGFParserError(
+                        "Unterminated SGFGameTree", self.data, self.index
+                    )
+                stack.pop()
+                closing = True
+                continue
+
+            # consume ")"
+            self.index = match.end()
+            closing = False
+            tree = stack.pop()
+            if not stack:
+                return SGFGameTree(*tree)
+            stack[-1][1].append(tree)
 
     def parse_sequence(self) -> SGFSequence:
         nodes = []
@@ -145,7 +296,7 @@ class SGFParser:
         # consume SGFProperty label
         self.index = match.end()
 
-        prop_label = match.group(0)
+        prop_label = match.group(1)
         values = []
         try:
             while True:
@@ -163,46 +314,264 @@ class SGFParser:
         Called when "[" encountered.
         Finishes when matching "]" encountered.
 
-        Skips all line breaks and unescapes "\\]".
+        Skips line breaks at the start of the value and after escaped
+        characters, unescapes "\\]" and "\\\\" in a single pass.
         """
         match = self._match(rePropValueStart)
 
         if not match:
             raise SGFParserError("Expecting SGFProperty value", self.data, self.index)
 
-        # consume "["
-        self.index = match.end()
+        # scan SGFProperty value and consume "]"
+        value, self.index = scan_prop_value(self.data, match.end())
 
-        data = ""
-        while True:
-            # remove line breaks
-            match_break = self._match(reLineBreak)
-            if match_break:
-                self.index = match_break.end()
+        return value
 
-            match_end = self._search(rePropValueEnd)
-            if not match_end:
-                raise SGFParserError(
-                    "Unterminated SGFProperty value", self.data, self.index
-                )
+    def _parse_tokens(self, count: Optional[int] = None) -> List["SGFGameTreeType"]:
+        """
+        Parses SGFGameTrees with SGFTokenizer in a single pass.
+
+        Keeps open SGFGameTrees on explicit stack instead of recursion.
+        Finishes after `count` SGFGameTrees or when anything but "("
+        encountered outside of SGFGameTree.
+        """
+        lazy = self.lazy
+        decode = not isinstance(self.data, str)
+        tokenizer = SGFTokenizer(self.data, self.index, skip_properties=lazy)
+
+        trees = []
+        stack = []  # open SGFGameTrees: (nodes, variations)
+        node = label = encoding = None
+        values = []
+
+        for token, value, index in tokenizer:
+            if token is Token.VALUE:
+                if label is not None:
+                    values.append(value)
+                    continue
+            elif label is not None:
+                if values:
+                    node[label] = values
+                else:
+                    # label without values ends SGFNode, as in recursive engine
+                    node = None
+                label = None
+                values = []
+
+            if not stack and token is not Token.TREE_START:
+                return trees
+
+            if token is Token.LABEL and node is not None:
+                label = value
+            elif token is Token.NODE and stack and not stack[-1][1]:
+                if not lazy:
+                    node = {}
+                else:
+                    if decode and len(stack) == 1 and not stack[0][0]:
+                        encoding = self._read_charset(tokenizer.index)
+                    node = SGFLazyNode(self.data, tokenizer.index, encoding)
+                stack[-1][0].append(node)
+            elif token is Token.TREE_START and (not stack or stack[-1][0]):
+                node = None
+                stack.append(([], []))
+            elif token is Token.TREE_END and (stack[-1][0] or len(stack) > 1):
+                node = None
+                if not stack[-1][0]:
+                    # "()" is dropped and closes its parent, as in recursive engine
+                    stack.pop()
+                tree = stack.pop()
+                if self.compact:
+                    tree[0][:] = map(SGFCompactNode, tree[0])
+                if stack:
+                    stack[-1][1].append(tree)
+                    continue
+
+                trees.append(tree)
+                self.index = index + 1
+                if len(trees) == count:
+                    return trees
+            elif not stack[-1][0]:
+                raise SGFParserError("Expecting SGFSequence", self.data, index)
+            else:
+                raise SGFParserError("Unterminated SGFGameTree", self.data, index)
+
+        if stack and not stack[-1][0]:
+            raise SGFParserError("Expecting SGFSequence", self.data, tokenizer.index)
+        if stack:
+            raise SGFParserError("Unterminated SGFGameTree", self.data, tokenizer.index)
+
+        return trees
+
+    def _read_charset(self, index: int) -> str:
+        """Reads CA property of root SGFNode starting at index."""
+        for label, values in scan_properties(self.data, index):
+            if label.upper() == b"CA":
+                charset = values[0].decode("ascii", "replace").strip()
+                try:
+                    return codecs.lookup(charset).name
+                except LookupError:
+                    break
+        return self.encoding
+
+    def parse_events(self, handler: "SGFHandler"):
+        """
+        Parses SGFCollection into handler events without building SGFNodes.
+
+        Reports start_tree, start_node, property and end_tree to handler
+        in document order. Skipped SGFGameTrees are scanned for the closing
+        ")" only; HandlerAction.STOP finishes parsing right away.
 
-            match_escape = self._search(reEscape)
+        Labels and values of bytes-like data are decoded before they are
+        reported, with the charset of each root SGFNode as SGFLazyNodes do.
+        """
+        decode = not isinstance(self.data, str)
+        encoding = self.encoding
+        tokenizer = SGFTokenizer(self.data, self.index)
+
+        found = False
+        stack = []  # open SGFGameTrees: [has nodes, has variations]
+        node = False
+        label = None
+        values = []
 
-            if not match_escape or match_escape.end() > match_end.end():
-                # no more escaped characters in the SGFProperty value
+        for token, value, index in tokenizer:
+            action = None
+            if token is Token.VALUE:
+                if label is not None:
+                    values.append(value)
+                    continue
+            elif label is not None and not values:
+                # label without values ends SGFNode, as in recursive engine
+                node = False
+                label = None
+            elif label is not None:
+                if decode:
+                    label = label.decode("ascii")
+                    values = [
+                        convert_control_chars(value.decode(encoding, "replace"))
+                        for value in values
+                    ]
+                action = handler.property(label.upper(), values)
+                label = None
+                values = []
+
+                if action is HandlerAction.STOP:
+                    return
+                if action is HandlerAction.SKIP and token is not Token.TREE_END:
+                    tokenizer.skip_tree(index)
+                    continue
+
+            if not stack and token is not Token.TREE_START:
                 break
 
-            # add contents of SGFProperty without `\\`
-            data += (
-                self.data[self.index : match_escape.start()]
-                + self.data[match_escape.end() - 1]
-            )
-            self.index = match_escape.end()
+            if token is Token.LABEL and node:
+                label = value
+            elif token is Token.NODE and stack and not stack[-1][1]:
+                if decode and len(stack) == 1 and not stack[0][0]:
+                    encoding = self._read_charset(tokenizer.index)
+                node = stack[-1][0] = True
+                action = handler.start_node()
+            elif token is Token.TREE_START and (not stack or stack[-1][0]):
+                node = False
+                if stack:
+                    stack[-1][1] = True
+                stack.append([False, False])
+                action = handler.start_tree()
+            elif token is Token.TREE_END and stack[-1][0]:
+                node = False
+                stack.pop()
+                if not stack:
+                    found = True
+                    self.index = index + 1
+                action = handler.end_tree()
+                if action is HandlerAction.SKIP:
+                    action = None
+            elif not stack[-1][0]:
+                raise SGFParserError("Expecting SGFSequence", self.data, index)
+            else:
+                raise SGFParserError("Unterminated SGFGameTree", self.data, index)
+
+            if action is HandlerAction.STOP:
+                return
+            if action is HandlerAction.SKIP:
+                node = stack[-1][0] = True
+                tokenizer.skip_tree(tokenizer.index)
+        else:
+            if stack:
+                raise SGFParserError(
+                    "Unterminated SGFGameTree", self.data, tokenizer.index
+                )
+
+        if not found:
+            raise SGFParserError("Expecting SGFCollection", self.data, self.index)
 
-        # add contents of SGFProperty value
-        data += self.data[self.index : match_end.start()]
+        if self.index != len(self.data) and not self.data[self.index :].isspace():
+            raise SGFParserError("Extra data", self.data, self.index)
 
-        # consume "]"
-        self.index = match_end.end()
 
-        return convert_control_chars(data)
+def read_game_trees(
+    source: Union[str, os.PathLike, IO],
+    chunk_size: int = 65536,
+    encoding: str = "utf-8",
+) -> Iterator[str]:
+    """
+    Reads SGF data of top-level SGFGameTrees from file path or file object.
+
+    Reads in chunks and yields SGF data of each SGFGameTree as soon as
+    its closing ")" is read. Binary file objects are decoded with `encoding`.
+    """
+    for _, data in split_game_trees(source, SGFSplitter(), chunk_size, encoding):
+        yield data
+
+
+def split_game_trees(
+    source: Union[str, os.PathLike, IO],
+    splitter: SGFSplitter,
+    chunk_size: int = 65536,
+    encoding: str = "utf-8",
+) -> Iterator[Tuple[Tuple[int, int, int], str]]:
+    """
+    Same as read_game_trees, but yields char, line and column where each
+    SGFGameTree starts in the data read along with it.
+
+    Errors are raised by `splitter`.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding, newline="") as fp:
+            yield from split_game_trees(fp, splitter, chunk_size, encoding)
+        return
+
+    decoder = None
+    while True:
+        chunk = source.read(chunk_size)
+        finished = not chunk
+        if isinstance(chunk, bytes):
+            decoder = decoder or codecs.getincrementaldecoder(encoding)()
+            chunk = decoder.decode(chunk, final=finished)
+        trees = splitter.feed(chunk)
+        yield from zip(splitter.starts, trees)
+        if finished:
+            break
+
+    splitter.close()
+
+
+def iterparse(
+    source: Union[str, os.PathLike, IO],
+    chunk_size: int = 65536,
+    encoding: str = "utf-8",
+) -> Iterator[SGFGameTree]:
+    """
+    Parses SGFCollection from file path or file object in chunks.
+
+    Yields each top-level SGFGameTree as soon as its closing ")" is read,
+    so only the data of one SGFGameTree is kept in memory at a time.
+    Binary file objects are decoded with `encoding`.
+    Positions in errors are relative to all data read.
+    """
+    for start, data in split_game_trees(source, SGFSplitter(), chunk_size, encoding):
+        try:
+            tree = SGFParser(data, engine=ParserEngine.TOKENIZER).parse_game_tree()
+        except SGFParserError as err:
+            raise SGFParserError(err.msg, err.data, err.index, start) from None
+        yield tree
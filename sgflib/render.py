@@ -0,0 +1,99 @@
+"""
+Text rendering and binary export of board positions.
+
+Positions are given as rows of bytes, as in SGFPosition.rows, where
+0 is empty point, 1 is black stone and 2 is white stone.
+
+Binary planes of a position are three bit-packed planes, black, white
+and empty, each of ceil(rows * cols / 8) bytes. Points go row by row,
+starting from the highest bit, as numpy.packbits does, so planes of many
+positions load with:
+
+    np.unpackbits(
+        np.frombuffer(data, np.uint8).reshape(-1, 3, size), axis=2
+    )[..., : rows * cols]
+"""
+from functools import lru_cache
+from typing import BinaryIO, Dict, Iterable, Iterator, Sequence, Tuple
+
+from .enums import Location
+from .exceptions import SGFBoardError
+
+# Location of every byte of position rows
+LOCATIONS = (Location.EMPTY, Location.BLACK, Location.WHITE)
+
+# bytes of position rows to bits of every plane, and back
+TO_BITS = (
+    bytes.maketrans(b"\x00\x01\x02", b"010"),
+    bytes.maketrans(b"\x00\x01\x02", b"001"),
+    bytes.maketrans(b"\x00\x01\x02", b"100"),
+)
+FROM_BITS = (
+    bytes.maketrans(b"01", b"\x00\x01"),
+    bytes.maketrans(b"01", b"\x00\x02"),
+)
+
+
+@lru_cache(maxsize=None)
+def get_glyphs(spaces: int = 1) -> Dict[int, str]:
+    """Returns table of str.translate from bytes of rows to pretty points."""
+    return {value: loc.pretty() + " " * spaces for value, loc in enumerate(LOCATIONS)}
+
+
+def render(lines: Iterable[bytes], spaces: int = 1) -> str:
+    """Renders every line of points, each one followed by a line break."""
+    data = b"\n".join(lines) + b"\n"
+    return data.decode("latin-1").translate(get_glyphs(spaces))
+
+
+def get_plane_size(shape: Tuple[int, int]) -> int:
+    """Returns number of bytes of a single bit-packed plane."""
+    rows, cols = shape
+    return (rows * cols + 7) // 8
+
+
+def pack_planes(rows: Sequence[bytes]) -> bytes:
+    """Packs position into black, white and empty planes."""
+    data = b"".join(rows)
+    size = (len(data) + 7) // 8
+    padding = b"0" * (size * 8 - len(data))
+    return b"".join(
+        int(data.translate(table) + padding, 2).to_bytes(size, "big")
+        for table in TO_BITS
+    )
+
+
+def unpack_planes(data: bytes, shape: Tuple[int, int]) -> Tuple[bytes, ...]:
+    """Unpacks planes made with pack_planes into position rows."""
+    rows, cols = shape
+    size = get_plane_size(shape)
+    if len(data) != 3 * size:
+        raise SGFBoardError(f"Planes of shape {shape} should be {3 * size} bytes.")
+
+    total = 0
+    for plane, table in enumerate(FROM_BITS):
+        value = int.from_bytes(data[plane * size : (plane + 1) * size], "big")
+        bits = format(value, f"0{size * 8}b")[: rows * cols].encode()
+        # black and white points never overlap, so their bytes can be added
+        total += int.from_bytes(bits.translate(table), "big")
+    flat = total.to_bytes(rows * cols, "big")
+    return tuple(flat[start : start + cols] for start in range(0, len(flat), cols))
+
+
+def dump_planes(positions: Iterable[Sequence[bytes]], fp: BinaryIO) -> int:
+    """Writes planes of every position to binary file, returns their number."""
+    count = 0
+    for rows in positions:
+        fp.write(pack_planes(rows))
+        count += 1
+    return count
+
+
+def load_planes(fp: BinaryIO, shape: Tuple[int, int]) -> Iterator[Tuple[bytes, ...]]:
+    """Reads positions written with dump_planes, as rows."""
+    size = 3 * get_plane_size(shape)
+    while True:
+        data = fp.read(size)
+        if not data:
+            break
+        yield unpack_planes(data, shape)
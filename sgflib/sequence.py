@@ -1,7 +1,9 @@
-from typing import TYPE_CHECKING, List
+import os
+from typing import TYPE_CHECKING, IO, Iterator, List, Union
 
 from .exceptions import SGFSequenceError
-from .node import SGFNode
+from .node import SGFCompactNode, SGFNode
+from .writer import dump
 
 if TYPE_CHECKING:
     from .types import SGFNodeType
@@ -11,17 +13,30 @@ class SGFSequence(List[SGFNode]):
     def __init__(self, sequence: List["SGFNodeType"]):
         if not sequence:
             raise SGFSequenceError("Expected at least one SGFNode in SGFSequence.")
-        super().__init__(map(SGFNode, sequence))
+        super().__init__(
+            node.copy()
+            if isinstance(node, (SGFNode, SGFCompactNode))
+            else SGFNode(node)
+            for node in sequence
+        )
 
     @property
     def sgf(self) -> str:
-        return "".join(node.sgf for node in self)
+        return "".join(self.iter_sgf())
+
+    def iter_sgf(self) -> Iterator[str]:
+        for node in self:
+            yield node.sgf
+
+    def write(self, fp: Union[str, os.PathLike, IO], encoding: str = "utf-8"):
+        """Writes SGF data to file path or file object, see `dump`."""
+        dump(self, fp, encoding=encoding)
 
     def __repr__(self):
         return f"SGFSequence({self.sgf})"
 
     def copy(self) -> "SGFSequence":
-        return SGFSequence([node.copy() for node in self])
+        return SGFSequence(self)
 
     def cut(self, index: int) -> "SGFSequence":
         removed = []
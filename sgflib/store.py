@@ -0,0 +1,321 @@
+import json
+import os
+from array import array
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from .enums import Location, Player
+from .exceptions import SGFPointError, SGFPropertyValueError
+from .utils import point_to_coord
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+if TYPE_CHECKING:
+    from .game_tree import SGFGameTree
+    from .node import SGFNode
+    from .types import SGFCoordinateType
+
+PathType = Union[str, os.PathLike]
+
+# move columns and their types
+COLUMNS = {
+    "game": "int32",
+    "move": "int32",
+    "color": "int8",
+    "x": "int8",
+    "y": "int8",
+}
+ARRAY_TYPES = {"int32": "i", "int8": "b"}
+NUMPY_REQUIRED = (
+    "SGFGameStore requires numpy, install it with `pip install sgflib[numpy]`."
+)
+# largest board size in SGF, coordinates are encoded as x * MAX_SIZE + y
+MAX_SIZE = 52
+
+
+def iter_main_line(tree: "SGFGameTree") -> Iterator["SGFNode"]:
+    """Yields SGFNodes of the main line, following first variations."""
+    while True:
+        yield from tree.sequence
+        if not tree.variations:
+            return
+        tree = tree.variations[0]
+
+
+def get_size(value: Optional[str]) -> Tuple[int, int]:
+    """Returns columns and rows of SZ property value, (19, 19) if there is none."""
+    if not value:
+        return 19, 19
+    parts = value.split(":")
+    if len(parts) <= 2 and all(part.strip().isdigit() for part in parts):
+        cols, rows = int(parts[0]), int(parts[-1])
+        if 1 <= cols <= MAX_SIZE and 1 <= rows <= MAX_SIZE:
+            return cols, rows
+    raise SGFPropertyValueError(f"Invalid board size: {value}.")
+
+
+def read_move(point: str, size: Tuple[int, int]) -> "SGFCoordinateType":
+    """
+    Returns coordinate of a move, (-1, -1) for pass.
+
+    `size` is (columns, rows) of the board, as get_size returns, and "tt"
+    is a pass on boards up to 19x19. Raises SGFPointError for points
+    outside of the board.
+    """
+    cols, rows = size
+    if not point or (point == "tt" and cols <= 19 and rows <= 19):
+        return -1, -1
+    x, y = point_to_coord(point)
+    if x >= cols or y >= rows:
+        raise SGFPointError(f"SGFPoint {point} is outside of {cols}x{rows} board.")
+    return x, y
+
+
+def iter_moves(tree: "SGFGameTree") -> Iterator[Tuple[Player, "SGFCoordinateType"]]:
+    """
+    Yields player and coordinate of main line moves, (-1, -1) for pass.
+
+    Raises SGFPropertyValueError for invalid SZ property, and SGFPointError
+    naming the move number for invalid moves.
+    """
+    size = get_size(sorted(tree.sequence[0].get("SZ", [""]))[0])
+    number = 0
+    for node in iter_main_line(tree):
+        for player in Player:
+            if player.value in node:
+                number += 1
+                point = sorted(node[player.value])[0]
+                try:
+                    yield player, read_move(point, size)
+                except SGFPointError as err:
+                    raise SGFPointError(f"Move {number}: {err}") from err
+
+
+class SGFGameStore:
+    """
+    Columnar store of main line moves and root properties of many games.
+
+    Moves of all games are kept in flat arrays, one row per move, sorted
+    by game: `game` id, `move` number starting from 1, `color` as Location
+    value and `x`, `y` coordinates, which are -1 for pass. `offsets` has
+    the first row of every game and the number of rows at the end.
+    Setup stones are not stored.
+
+    Root SGFProperties are dictionary encoded: `headers` has distinct
+    values of every label and `header_codes` has a row of indexes into
+    them for every label, with a column for every game, -1 for missing
+    ones. Only the first value of every SGFProperty is kept.
+
+    Games with malformed moves or board size keep their headers,
+    but have no moves, and `errors` has their messages by game id.
+    Moves are checked against both dimensions of SZ property.
+
+    Queries scan whole columns at once. Stores are saved as a directory
+    of .npy files, which are memory-mapped on load.
+
+    Requires numpy.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, "np.ndarray"],
+        offsets: "np.ndarray",
+        headers: Dict[str, List[str]],
+        header_codes: "np.ndarray",
+        errors: Optional[Dict[int, str]] = None,
+    ):
+        if np is None:
+            raise ImportError(NUMPY_REQUIRED)
+
+        self.columns = columns
+        self.offsets = offsets
+        self.headers = headers
+        self.header_codes = header_codes
+        self.errors = errors or {}
+
+        self.game = columns["game"]
+        self.move = columns["move"]
+        self.color = columns["color"]
+        self.x = columns["x"]
+        self.y = columns["y"]
+
+        # label: (row of header_codes, codes of values)
+        self._header_index = {
+            label: (row, {value: code for code, value in enumerate(values)})
+            for row, (label, values) in enumerate(headers.items())
+        }
+
+    @classmethod
+    def from_trees(cls, trees: Iterable["SGFGameTree"]) -> "SGFGameStore":
+        """Builds store of SGFGameTrees, like the ones of SGFCollection."""
+        if np is None:
+            raise ImportError(NUMPY_REQUIRED)
+
+        columns = {name: array(ARRAY_TYPES[dtype]) for name, dtype in COLUMNS.items()}
+        game, move, color, xs, ys = columns.values()
+        offsets = array("q", [0])
+        headers: Dict[str, Dict[str, int]] = {}  # label: codes of values
+        codes: Dict[str, array] = {}
+        errors = {}
+
+        index = -1
+        for index, tree in enumerate(trees):
+            root = tree.sequence[0]
+            for label, values in root.items():
+                value_codes = headers.setdefault(label, {})
+                column = codes.setdefault(label, array("i", [-1] * index))
+                column.append(
+                    value_codes.setdefault(sorted(values)[0], len(value_codes))
+                )
+            for column in codes.values():
+                if len(column) == index:
+                    column.append(-1)
+
+            try:
+                moves = list(iter_moves(tree))
+            except (SGFPropertyValueError, SGFPointError) as err:
+                errors[index] = f"Game {index}: {err}"
+                moves = []
+            for number, (player, (x, y)) in enumerate(moves, 1):
+                game.append(index)
+                move.append(number)
+                color.append(player.loc())
+                xs.append(x)
+                ys.append(y)
+            offsets.append(len(game))
+
+        return cls(
+            {
+                name: np.frombuffer(column, dtype=COLUMNS[name]).copy()
+                for name, column in columns.items()
+            },
+            np.frombuffer(offsets, dtype=np.int64).copy(),
+            {label: list(values) for label, values in headers.items()},
+            np.array(
+                [np.frombuffer(column, dtype=np.int32) for column in codes.values()],
+                dtype=np.int32,
+            ).reshape(len(codes), index + 1),
+            errors,
+        )
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def moves(self, game: int) -> List[Tuple[Player, Optional["SGFCoordinateType"]]]:
+        """Returns player and coordinate of every move of game, None for pass."""
+        start, end = self.offsets[game], self.offsets[game + 1]
+        return [
+            (
+                Player.BLACK if color == Location.BLACK else Player.WHITE,
+                None if x < 0 else (int(x), int(y)),
+            )
+            for color, x, y in zip(
+                self.color[start:end].tolist(),
+                self.x[start:end].tolist(),
+                self.y[start:end].tolist(),
+            )
+        ]
+
+    def _select(
+        self,
+        coord: Optional["SGFCoordinateType"] = ...,
+        move: Optional[int] = None,
+        player: Optional[Player] = None,
+    ) -> "np.ndarray":
+        """Returns mask of moves at coord, None for pass, with move number and color."""
+        mask = np.ones(len(self.game), dtype=bool)
+        if coord is not ...:
+            x, y = coord or (-1, -1)
+            mask &= (self.x == x) & (self.y == y)
+        if move is not None:
+            mask &= self.move == move
+        if player is not None:
+            mask &= self.color == Player(player).loc()
+        return mask
+
+    def find_games(
+        self,
+        coord: Optional["SGFCoordinateType"] = ...,
+        move: Optional[int] = None,
+        player: Optional[Union[str, Player]] = None,
+    ) -> "np.ndarray":
+        """
+        Returns sorted ids of games with a move at coord, None for pass.
+
+        Moves can be limited to move number and player.
+        """
+        return np.unique(self.game[self._select(coord, move, player)])
+
+    def find_headers(self, label: str, value: str) -> "np.ndarray":
+        """Returns ids of games with root SGFProperty label equal to value."""
+        row, codes = self._header_index.get(label, (None, {}))
+        if value not in codes:
+            return np.empty(0, dtype=self.game.dtype)
+        ids = np.flatnonzero(self.header_codes[row] == codes[value])
+        return ids.astype(self.game.dtype)
+
+    def get_headers(self, label: str) -> List[Optional[str]]:
+        """Returns value of root SGFProperty label of every game, or None."""
+        if label not in self.headers:
+            return [None] * len(self)
+        values = self.headers[label] + [None]
+        row, _ = self._header_index[label]
+        return [values[code] for code in self.header_codes[row].tolist()]
+
+    def count_moves(
+        self, move: Optional[int] = None, player: Optional[Union[str, Player]] = None
+    ) -> Dict[Optional["SGFCoordinateType"], int]:
+        """
+        Counts moves at every coordinate, None for pass.
+
+        For example, count_moves(1) gives distribution of first moves.
+        """
+        mask = self._select(move=move, player=player)
+        keys = self.x[mask].astype(np.int32) * MAX_SIZE + self.y[mask]
+        values, counts = np.unique(keys, return_counts=True)
+        return {
+            (None if key < 0 else divmod(key, MAX_SIZE)): count
+            for key, count in zip(values.tolist(), counts.tolist())
+        }
+
+    def save(self, directory: PathType):
+        """Saves columns as .npy files and header values and errors as JSON."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, column in self.columns.items():
+            np.save(directory / f"{name}.npy", column)
+        np.save(directory / "offsets.npy", self.offsets)
+        np.save(directory / "header_codes.npy", self.header_codes)
+        (directory / "headers.json").write_text(
+            json.dumps({"headers": self.headers, "errors": self.errors}),
+            encoding="utf-8",
+        )
+
+    @classmethod
+    def load(cls, directory: PathType, mmap: bool = True) -> "SGFGameStore":
+        """Loads store saved to directory, memory-mapping its columns."""
+        if np is None:
+            raise ImportError(NUMPY_REQUIRED)
+
+        directory = Path(directory)
+        mode = "r" if mmap else None
+        columns = {
+            name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in COLUMNS
+        }
+        offsets = np.load(directory / "offsets.npy", mmap_mode=mode)
+        header_codes = np.load(directory / "header_codes.npy", mmap_mode=mode)
+        meta = json.loads((directory / "headers.json").read_text(encoding="utf-8"))
+        errors = {int(game): error for game, error in meta["errors"].items()}
+        return cls(columns, offsets, meta["headers"], header_codes, errors)
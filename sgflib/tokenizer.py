@@ -0,0 +1,367 @@
+import re
+from typing import (
+    TYPE_CHECKING,
+    AnyStr,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Tuple,
+)
+
+from .enums import Token
+from .exceptions import SGFParserError
+from .utils import convert_control_chars
+
+if TYPE_CHECKING:
+    from .types import SGFDataType
+
+reToken = re.compile(r"\s*(?:(\()|(\))|(;)|([a-zA-Z]+)|(\[))")
+rePropValueSpecial = re.compile(r"(\\[]\\])|]")
+reLineBreaks = re.compile(r"(?:\r\n?|\n\r?)*")
+reGameTreeSpecial = re.compile(r"(\[)|(\()|\)")
+# "[" is the 5th group, as in reToken, only labels may be skipped before tokens
+reStructure = re.compile(r"[\sa-zA-Z]*(?:(\()|(\))|(;)|()(\[))")
+reWhitespace = re.compile(r"\s*")
+reResync = re.compile(r"\(\s*;")
+
+TOKENS = (None, Token.TREE_START, Token.TREE_END, Token.NODE, Token.LABEL)
+
+
+def advance_position(
+    position: Tuple[int, int, int], text: str
+) -> Tuple[int, int, int]:
+    """Returns char, line and column following text found at position."""
+    char, line, column = position
+    newlines = text.count("\n")
+    if newlines:
+        line += newlines
+        column = len(text) - text.rfind("\n")
+    else:
+        column += len(text)
+    return char + len(text), line, column
+
+
+class Patterns(NamedTuple):
+    token: Pattern
+    prop_value_special: Pattern
+    line_breaks: Pattern
+    game_tree_special: Pattern
+    structure: Pattern
+    resync: Pattern
+
+
+TEXT_PATTERNS = Patterns(
+    reToken, rePropValueSpecial, reLineBreaks, reGameTreeSpecial, reStructure, reResync
+)
+BYTES_PATTERNS = Patterns(*(re.compile(p.pattern.encode()) for p in TEXT_PATTERNS))
+
+
+def get_patterns(data: "SGFDataType") -> Patterns:
+    return TEXT_PATTERNS if isinstance(data, str) else BYTES_PATTERNS
+
+
+def scan_prop_value(data: "SGFDataType", index: int) -> Tuple[AnyStr, int]:
+    """
+    Scans single SGFProperty value in one pass.
+
+    Called with index right after "[".
+    Returns unescaped value and index right after matching "]".
+
+    Skips line breaks at the start of the value and after escaped characters.
+    Values of bytes data are returned undecoded, with control characters kept.
+    """
+    patterns = get_patterns(data)
+    value_special, line_breaks = patterns.prop_value_special, patterns.line_breaks
+
+    index = line_breaks.match(data, index).end()
+    chunks = []
+    while True:
+        match = value_special.search(data, index)
+        if not match:
+            raise SGFParserError("Unterminated SGFProperty value", data, index)
+
+        if not match.lastindex:
+            chunks.append(data[index : match.start()])
+            break
+
+        # add contents of SGFProperty without `\\`
+        chunks.append(data[index : match.start()])
+        chunks.append(match.group(1)[1:])
+        index = line_breaks.match(data, match.end()).end()
+
+    value = data[:0].join(chunks)
+    if isinstance(value, str):
+        value = convert_control_chars(value)
+    return value, match.end()
+
+
+def skip_prop_value(data: "SGFDataType", index: int) -> int:
+    """
+    Finds the end of single SGFProperty value without unescaping it.
+
+    Called with index right after "[".
+    Returns index right after matching "]".
+    """
+    value_special = get_patterns(data).prop_value_special
+
+    match = value_special.search(data, index)
+    while match and match.lastindex:
+        match = value_special.search(data, match.end())
+    if not match:
+        raise SGFParserError("Unterminated SGFProperty value", data, index)
+    return match.end()
+
+
+def scan_properties(
+    data: "SGFDataType", index: int
+) -> List[Tuple[AnyStr, List[AnyStr]]]:
+    """
+    Scans SGFProperties of single SGFNode.
+
+    Called with index right after ";".
+    Finishes at the next ";", "(" or ")", and raises SGFParserError
+    on anything else. Label without values is skipped and ends SGFNode,
+    as in SGFParser.
+    """
+    tokenizer = SGFTokenizer(data, index)
+    props = []
+    ended = False
+    for token, value, index in tokenizer:
+        if token is Token.VALUE and props and not ended:
+            props[-1][1].append(value)
+            continue
+        if props and not props[-1][1]:
+            props.pop()
+            ended = True
+        if token is Token.VALUE or (token is Token.LABEL and ended):
+            # like SGFTokenizer engine reports data after SGFNode
+            raise SGFParserError("Unterminated SGFGameTree", data, index)
+        if token is not Token.LABEL:
+            return props
+        props.append((value, []))
+
+    raise SGFParserError("Unterminated SGFGameTree", data, tokenizer.index)
+
+
+class SGFTokenizer:
+    """
+    Splits SGF data into tokens in a single pass.
+
+    Yields (token, value, index) tuples, where value is the label of
+    Token.LABEL, the unescaped value of Token.VALUE and None otherwise.
+    Keeps position after the last token in `index`, so it can be moved
+    between tokens. Stops at the first character which cannot start a token.
+
+    Works on bytes-like data too, yielding undecoded labels and values.
+    With `skip_properties` only "(", ")" and ";" are yielded inside of
+    SGFGameTrees, and SGFProperties are skipped: values are only matched
+    to their "]", and only letters and whitespace are allowed elsewhere.
+    """
+
+    def __init__(
+        self, data: "SGFDataType", index: int = 0, skip_properties: bool = False
+    ):
+        self.data = data
+        self.index = index
+        self.skip_properties = skip_properties
+
+    def __iter__(self) -> Iterator[Tuple[Token, Optional[AnyStr], int]]:
+        if self.skip_properties:
+            return self._iter_structure()
+        return self._iter_tokens()
+
+    def _iter_tokens(self) -> Iterator[Tuple[Token, Optional[AnyStr], int]]:
+        data = self.data
+        match_token = get_patterns(data).token.match
+
+        while True:
+            match = match_token(data, self.index)
+            if not match:
+                return
+
+            kind = match.lastindex
+            start = match.start(kind)
+            if kind == 5:
+                value, self.index = scan_prop_value(data, match.end())
+                yield Token.VALUE, value, start
+            elif kind == 4:
+                self.index = match.end()
+                yield Token.LABEL, match.group(4), start
+            else:
+                self.index = match.end()
+                yield TOKENS[kind], None, start
+
+    def _iter_structure(self) -> Iterator[Tuple[Token, None, int]]:
+        data = self.data
+        patterns = get_patterns(data)
+        match_token = patterns.token.match
+        match_structure = patterns.structure.match
+        depth = 0
+
+        while True:
+            if depth:
+                match = match_structure(data, self.index)
+            else:
+                # outside of SGFGameTrees anything but "(" ends parsing
+                match = match_token(data, self.index)
+            if not match:
+                return
+
+            kind = match.lastindex
+            self.index = match.end()
+            if kind == 5:
+                if depth:
+                    self.index = skip_prop_value(data, self.index)
+                    continue
+                yield Token.VALUE, None, match.start(kind)
+            else:
+                depth += kind == 1
+                depth -= kind == 2
+                yield TOKENS[kind], None, match.start(kind)
+
+    def skip_tree(self, index: int):
+        """
+        Skips the rest of SGFGameTree containing index without parsing it.
+
+        The next token is ")" closing that SGFGameTree.
+        """
+        data = self.data
+        search_special = get_patterns(data).game_tree_special.search
+        depth = 1
+        while True:
+            match = search_special(data, index)
+            if not match:
+                raise SGFParserError("Unterminated SGFGameTree", data, len(data))
+
+            index = match.end()
+            if match.lastindex == 1:
+                index = skip_prop_value(data, index)
+            elif match.lastindex == 2:
+                depth += 1
+            else:
+                depth -= 1
+                if not depth:
+                    self.index = match.start()
+                    return
+
+
+class SGFSplitter:
+    """
+    Splits SGF data arriving in chunks into top-level SGFGameTrees.
+
+    Tracks nesting of "(" and ")" outside of SGFProperty values
+    without parsing SGFNodes, so every character is scanned once.
+    Empty variation "()" closes its parent, as in SGFParser.
+    Keeps only the data of unfinished SGFGameTree in buffer.
+    `position` is the char, line and column of buffer in all data fed
+    so far, and `starts` has those of SGFGameTrees returned by the last
+    feed. Positions in errors are relative to all data fed.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.position = (0, 1, 1)
+        self.starts = []
+        self.index = 0
+        self.start = None
+        self.depth = 0
+        self.in_value = False
+        self.opened = False  # variation started, nothing read in it yet
+        self.found = False
+
+    def feed(self, chunk: str) -> List[str]:
+        """Adds chunk of data and returns completed top-level SGFGameTrees."""
+        data = self.buffer + chunk
+        index = self.index
+        trees = []
+        self.starts = []
+        # data before mark is already counted in position
+        mark, position = 0, self.position
+
+        while True:
+            if self.in_value:
+                match = rePropValueSpecial.search(data, index)
+                if not match:
+                    # lone "\" at the end may start an escape in the next chunk,
+                    # unless it ends an escape already consumed before index
+                    end = len(data)
+                    index = end - (end > index and data.endswith("\\"))
+                    break
+                self.in_value = bool(match.lastindex)
+                index = match.end()
+            elif not self.depth:
+                index = reWhitespace.match(data, index).end()
+                if index == len(data):
+                    break
+                if data[index] != "(":
+                    if trees:
+                        # report completed SGFGameTrees first
+                        break
+                    raise SGFParserError(
+                        "Extra data" if self.found else "Expecting SGFCollection",
+                        data,
+                        index,
+                        self.position,
+                    )
+                self.start = index
+                self.depth = 1
+                index += 1
+            elif self.opened:
+                index = reWhitespace.match(data, index).end()
+                if index == len(data):
+                    break
+                self.opened = False
+                if data[index] == ")":
+                    # "()" is dropped and closes its parent, as in SGFParser
+                    self.depth -= 1
+            else:
+                match = reGameTreeSpecial.search(data, index)
+                if not match:
+                    index = len(data)
+                    break
+                index = match.end()
+                if match.lastindex == 1:
+                    self.in_value = True
+                elif match.lastindex == 2:
+                    self.depth += 1
+                    self.opened = True
+                else:
+                    self.depth -= 1
+                    if not self.depth:
+                        trees.append(data[self.start : index])
+                        position = advance_position(position, data[mark : self.start])
+                        mark = self.start
+                        self.starts.append(position)
+                        self.start = None
+                        self.found = True
+
+        # discard consumed data
+        cut = index if self.start is None else self.start
+        self.buffer = data[cut:]
+        self.position = advance_position(position, data[mark:cut])
+        self.index = index - cut
+        if self.start is not None:
+            self.start = 0
+
+        return trees
+
+    def close(self):
+        """Checks that data ended outside of SGFGameTree."""
+        self.feed("")
+        if self.in_value:
+            raise SGFParserError(
+                "Unterminated SGFProperty value",
+                self.buffer,
+                len(self.buffer),
+                self.position,
+            )
+        if self.depth:
+            raise SGFParserError(
+                "Unterminated SGFGameTree", self.buffer, len(self.buffer), self.position
+            )
+        if not self.found:
+            raise SGFParserError(
+                "Expecting SGFCollection", self.buffer, self.index, self.position
+            )
@@ -1,4 +1,5 @@
-from typing import Tuple, List, Iterable, Mapping
+from mmap import mmap
+from typing import Tuple, List, Iterable, Mapping, Union
 
 
 SGFPropertyValueType = Iterable[str]
@@ -7,3 +8,5 @@ SGFSequenceType = List[SGFNodeType]
 SGFGameTreeType = Tuple[SGFSequenceType, List["SGFGameTreeType"]]
 
 SGFCoordinateType = Tuple[int, int]
+
+SGFDataType = Union[str, bytes, bytearray, mmap]
@@ -34,7 +34,7 @@ def coord_to_point(coord: "SGFCoordinateType") -> str:
 
 
 def point_to_coord(point: str) -> "SGFCoordinateType":
-    x, y = point
-    if x not in ascii_letters or y not in ascii_letters:
+    if len(point) != 2 or not set(point) <= set(ascii_letters):
         raise SGFPointError(f"Invalid SGFPoint: {point}.")
+    x, y = point
     return ascii_letters.index(x), ascii_letters.index(y)
@@ -0,0 +1,67 @@
+import codecs
+import io
+import os
+from typing import TYPE_CHECKING, IO, Iterable, Iterator, Union
+
+if TYPE_CHECKING:
+    from .collection import SGFCollection
+    from .game_tree import SGFGameTree
+    from .node import SGFNode
+    from .sequence import SGFSequence
+
+    SGFObjectType = Union[SGFCollection, SGFGameTree, SGFSequence, SGFNode]
+
+
+def _is_binary(fp: IO) -> bool:
+    if isinstance(fp, io.TextIOBase):
+        return False
+    if isinstance(fp, (io.RawIOBase, io.BufferedIOBase)):
+        return True
+    return "b" in getattr(fp, "mode", "")
+
+
+def iter_chunks(parts: Iterable[str], chunk_size: int = 65536) -> Iterator[str]:
+    """Joins small parts of SGF data into chunks of at least `chunk_size`."""
+    buffer = []
+    size = 0
+    for part in parts:
+        buffer.append(part)
+        size += len(part)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer.clear()
+            size = 0
+    if buffer:
+        yield "".join(buffer)
+
+
+def dump(
+    sgf_object: "SGFObjectType",
+    target: Union[str, os.PathLike, IO],
+    chunk_size: int = 65536,
+    encoding: str = "utf-8",
+):
+    """
+    Writes SGF data of SGFCollection, SGFGameTree, SGFSequence or SGFNode
+    to file path or file object.
+
+    SGF data is written in chunks as it is serialized, so it is never
+    built as a whole. Output is the same as `.sgf` of the object.
+    Binary file objects get it encoded with `encoding`.
+    """
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "w", encoding=encoding, newline="") as fp:
+            dump(sgf_object, fp, chunk_size, encoding)
+        return
+
+    chunks = iter_chunks(sgf_object.iter_sgf(), chunk_size)
+    if _is_binary(target):
+        encoder = codecs.getincrementalencoder(encoding)()
+        for chunk in chunks:
+            target.write(encoder.encode(chunk))
+        tail = encoder.encode("", final=True)
+        if tail:
+            target.write(tail)
+    else:
+        for chunk in chunks:
+            target.write(chunk)
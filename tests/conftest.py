@@ -0,0 +1,15 @@
+from pathlib import Path
+
+import pytest
+
+DATA_DIR = Path(__file__).parent / "data"
+
+
+@pytest.fixture
+def sabaki_path():
+    return DATA_DIR / "sabaki.sgf"
+
+
+@pytest.fixture
+def sabaki(sabaki_path):
+    return sabaki_path.read_text(encoding="utf-8")
@@ -0,0 +1,108 @@
+import random
+
+import pytest
+
+from sgflib import SGFBoard
+from sgflib.enums import GoRules, Location, MoveError, Player
+from sgflib.exceptions import SGFBoardError
+
+np = pytest.importorskip("numpy")
+
+from sgflib.batch import PASS, SGFBoardBatch  # noqa: E402
+
+
+@pytest.mark.parametrize("allow_super_ko", [True, False])
+@pytest.mark.parametrize("allow_suicide", [True, False])
+def test_batch_matches_board(allow_super_ko, allow_suicide):
+    rng = random.Random(0)
+    shape = (4, 5)
+    options = dict(allow_super_ko=allow_super_ko, allow_suicide=allow_suicide)
+    batch = SGFBoardBatch(20, shape, **options)
+    boards = [SGFBoard(shape, Player.BLACK, **options) for _ in range(20)]
+    errors = [MoveError.NONE] * 20
+
+    for _ in range(60):
+        coords = [(rng.randrange(4), rng.randrange(5)) for _ in boards]
+        step = batch.move(coords)
+        for i, (board, coord) in enumerate(zip(boards, coords)):
+            if errors[i]:
+                continue
+            try:
+                board.move(coord)
+            except SGFBoardError:
+                errors[i] = step[i]
+                assert errors[i] != MoveError.NONE
+            else:
+                assert step[i] == MoveError.NONE
+
+            assert batch.board(i).data == board.data
+            assert batch.board(i).captured == board.captured
+            assert batch.board(i).player is board.player
+
+    assert batch.errors.tolist() == errors
+
+
+def test_batch_errors():
+    batch = SGFBoardBatch(6, (3, 4), player=Player.WHITE)
+    batch.data[:] = [
+        [0, 1, -1, 0],
+        [1, 0, 1, -1],
+        [0, 1, -1, 0],
+    ]
+
+    step = batch.move(
+        [(1, 1), (0, 1), (3, 0), (0, 0), PASS, (1, 1)], active=[1] * 5 + [0]
+    )
+    assert step.tolist() == [
+        MoveError.NONE,
+        MoveError.NOT_EMPTY,
+        MoveError.WRONG_COORDINATE,
+        MoveError.SUICIDE,
+        MoveError.NONE,
+        MoveError.NONE,
+    ]
+    assert batch.captured[0].tolist() == [0, 1]
+    assert batch.data[0, 1].tolist() == [1, -1, 0, -1]
+    assert batch.players.tolist() == [1, -1, -1, -1, -1, -1]
+
+    step = batch.move([(1, 2)] * 4 + [(1, 1)] * 2)
+    assert step.tolist() == [MoveError.KO, 0, 0, 0, MoveError.NONE, MoveError.NONE]
+    assert batch.errors.tolist() == [
+        MoveError.KO,
+        MoveError.NOT_EMPTY,
+        MoveError.WRONG_COORDINATE,
+        MoveError.SUICIDE,
+        MoveError.NONE,
+        MoveError.NONE,
+    ]
+    assert batch.data[4, 1].tolist() == [1, -1, Location.EMPTY, -1]
+    assert batch.captured[4:].tolist() == [[0, 1], [0, 1]]
+
+
+@pytest.mark.parametrize("rules", list(GoRules))
+def test_batch_score(rules):
+    rng = random.Random(0)
+    batch = SGFBoardBatch(20, (5, 5))
+    for _ in range(30):
+        batch.move([(rng.randrange(5), rng.randrange(5)) for _ in range(20)])
+        batch.errors[:] = MoveError.NONE
+
+    dead = np.zeros((20, 5, 5), dtype=bool)
+    dead_coords = []
+    for i in range(20):
+        board = batch.board(i)
+        stones = [(x, y) for x in range(5) for y in range(5) if board.data[x][y]]
+        coords = rng.sample(stones, min(len(stones), 2))
+        # single stones are marked, whole groups are taken off
+        for x, y in coords:
+            dead[i, x, y] = True
+        dead_coords.append(coords)
+
+    points = batch.score(rules, komi=0.5, dead=dead)
+    for i in range(20):
+        score = batch.board(i).score(rules, komi=0.5, dead=dead_coords[i])
+        assert tuple(points[i]) == (score.black, score.white)
+
+    assert batch.score(rules)[:, 1].tolist() == [
+        batch.board(i).score(rules).white for i in range(20)
+    ]
@@ -1,8 +1,13 @@
+import copy
+import pickle
+import random
+
 import pytest
 from typing import Tuple
 
 from sgflib import SGFBoard
-from sgflib.enums import Player
+from sgflib.board import get_neighbours
+from sgflib.enums import GoRules, Location, Player
 from sgflib.exceptions import SGFBoardError
 
 
@@ -15,6 +20,51 @@ def test_board_shape():
     ]
 
 
+def test_board_data():
+    board = SGFBoard((3, 3), Player.BLACK)
+    board.move((0, 1))
+    board.data[1][0] = Location.WHITE
+    board.data[1][2] = -1
+    assert board.data == [[0, 1, 0], [-1, 0, -1], [0, 0, 0]]
+    assert board.data[1][-1] is Location.WHITE
+    assert board.data[1][1:] == [Location.EMPTY, Location.WHITE]
+    assert board.group_at((1, 0)) == {(1, 0)}
+    assert board.liberties((0, 1)) == {(0, 0), (0, 2), (1, 1)}
+    assert board.hash == SGFBoard((3, 3), Player.BLACK, board.data).hash
+
+    board.move((1, 1))
+    assert board.group_at((1, 1)) == {(1, 0), (1, 1), (1, 2)}
+    assert board.liberties((1, 1)) == {(0, 0), (0, 2), (2, 0), (2, 1), (2, 2)}
+
+    board.undo()
+    board.data[1] = [1, 1, 0]
+    assert board.group_at((0, 1)) == {(0, 1), (1, 0), (1, 1)}
+    assert board.liberties((1, 2)) == set()
+
+    # points set after a move are reverted along with it
+    board.undo()
+    assert board.data == [[0, 0, 0]] * 3
+    assert board.group_at((0, 1)) == set()
+
+    data = [[0, 1, 0], [1, -1, 1], [0, 1, 0]]
+    board.data = data
+    assert board.data == data
+    assert board.liberties((1, 1)) == set()
+    assert copy.deepcopy(board.data) == data
+    assert type(copy.deepcopy(board.data)[0]) is list
+
+    with pytest.raises(ValueError):
+        board.data[0][:] = [0, 0]
+    with pytest.raises(IndexError):
+        board.data[0][3] = 1
+    with pytest.raises(ValueError):
+        board.data[0][0] = 2
+    with pytest.raises(SGFBoardError) as err:
+        board.data = [[0, 0, 0]]
+    assert str(err.value) == "Data should be of shape (3, 3)."
+    assert board.data == data
+
+
 @pytest.mark.parametrize(
     "shape",
     [
@@ -226,3 +276,266 @@ def test_board_super_ko():
         board.move((5, 1))
 
     assert str(err.value) == "Illegal move: Super-Ko."
+
+
+def test_board_undo():
+    data = [
+        [0, 1, -1, 0],
+        [1, -1, 0, -1],
+        [0, 1, -1, 0],
+    ]
+    board = SGFBoard(shape=(3, 4), player=Player.BLACK, data=data)
+    board.move((1, 2))
+    board.move((0, 3))
+    assert board.data == [
+        [0, 1, -1, -1],
+        [1, 0, 1, -1],
+        [0, 1, -1, 0],
+    ]
+    assert board.captured == {Player.BLACK: 1, Player.WHITE: 0}
+    assert [len(changes) for _, _, _, changes, _ in board.history] == [2, 1]
+
+    board.undo()
+    assert board.player is Player.WHITE
+    board.undo()
+    assert board.data == data
+    assert board.player is Player.BLACK
+    assert board.captured == {Player.BLACK: 0, Player.WHITE: 0}
+    assert board.history == []
+
+
+@pytest.mark.parametrize("situational, expected", [(False, "Super-Ko"), (True, None)])
+def test_board_situational_super_ko(situational, expected):
+    board = SGFBoard(
+        (3, 3), Player.BLACK, allow_super_ko=False, situational_super_ko=situational
+    )
+    for move in [(2, 2), (0, 1), (1, 1), (1, 0), (2, 1), (2, 0), (0, 0)]:
+        board.move(move)
+
+    # the same stones as after the 5th move, but black to play instead of white
+    if expected:
+        with pytest.raises(SGFBoardError) as err:
+            board.move((1, 0))
+        assert str(err.value) == f"Illegal move: {expected}."
+    else:
+        board.move((1, 0))
+        assert board.player is Player.BLACK
+
+
+def test_board_group_at():
+    board = SGFBoard(
+        shape=(3, 4),
+        player=Player.WHITE,
+        data=[
+            [0, 1, -1, 0],
+            [1, 0, 1, -1],
+            [0, 1, -1, 0],
+        ],
+    )
+    assert board.group_at((0, 0)) == set()
+    assert board.liberties((0, 0)) == set()
+    assert board.group_at((1, 3)) == {(1, 3)}
+    assert board.liberties((1, 3)) == {(0, 3), (2, 3)}
+
+    board.move((0, 3))
+    assert board.group_at((1, 3)) == {(0, 2), (0, 3), (1, 3)}
+    assert board.liberties((0, 2)) == {(2, 3)}
+
+    board.move((2, 3))
+    assert board.captured[Player.BLACK] == 4
+    assert board.group_at((1, 3)) == set()
+    assert board.liberties((1, 2)) == {(0, 2), (1, 1), (1, 3), (2, 2)}
+    assert board.liberties((2, 3)) == {(1, 3), (2, 2)}
+
+    board.undo()
+    assert board.group_at((1, 3)) == {(0, 2), (0, 3), (1, 3)}
+    assert board.liberties((1, 2)) == {(1, 1)}
+
+    with pytest.raises(SGFBoardError) as err:
+        board.group_at((3, 0))
+    assert str(err.value) == "Wrong coordinate"
+
+
+def get_chains(board):
+    rows, cols = board.shape
+    coords = [(x, y) for x in range(rows) for y in range(cols)]
+    return {coord: (board.group_at(coord), board.liberties(coord)) for coord in coords}
+
+
+@pytest.mark.parametrize("allow_suicide", [False, True])
+def test_board_undo_chains(allow_suicide, monkeypatch):
+    rng = random.Random(0)
+    board = SGFBoard((5, 5), Player.BLACK, allow_suicide=allow_suicide)
+    positions = []
+    for _ in range(200):
+        chains = get_chains(board)
+        coord = rng.randrange(5), rng.randrange(5)
+        if not board.is_legal(coord):
+            with pytest.raises(SGFBoardError):
+                board.move(coord)
+            assert get_chains(board) == chains
+            coord = rng.choice(board.legal_moves() or [None])
+
+        board.move(coord)
+        positions.append(chains)
+        rebuilt = SGFBoard((5, 5), board.player, board.data)
+        assert get_chains(board) == get_chains(rebuilt)
+
+    # undo reverts changes of SGFChains instead of finding groups again
+    monkeypatch.setattr(board, "_get_group", None)
+    while positions:
+        board.undo()
+        assert get_chains(board) == positions.pop()
+
+
+def test_board_neighbours():
+    neighbours = get_neighbours((2, 3))
+    assert neighbours == ((3, 1), (4, 0, 2), (5, 1), (0, 4), (1, 3, 5), (2, 4))
+    assert get_neighbours((2, 3)) is neighbours
+
+    board = SGFBoard((2, 3), Player.BLACK, data=[[0, 1, -1], [0, 0, 1]])
+    assert board.data == [
+        [Location.EMPTY, Location.BLACK, Location.WHITE],
+        [Location.EMPTY, Location.EMPTY, Location.BLACK],
+    ]
+
+
+def test_board_is_legal():
+    board = SGFBoard(
+        shape=(3, 4),
+        player=Player.WHITE,
+        data=[
+            [0, 1, -1, 0],
+            [1, 0, 1, -1],
+            [0, 1, -1, 0],
+        ],
+    )
+    assert board.is_legal()
+    assert board.is_legal((1, 1))
+    assert not board.is_legal((0, 0))
+    assert not board.is_legal((0, 1))
+    assert not board.is_legal((3, 0))
+    assert board.legal_moves() == [(0, 3), (1, 1), (2, 3)]
+
+    board.move((1, 1))
+    assert not board.is_legal((1, 2))
+    assert board.legal_moves() == [(0, 0), (2, 0)]
+    assert len(board.history) == 1
+
+    board.allow_suicide = True
+    assert not board.is_legal((1, 2))
+    assert board.legal_moves() == [(0, 0), (0, 3), (2, 0), (2, 3)]
+
+
+@pytest.mark.parametrize("situational", [False, True])
+def test_board_is_legal_super_ko(situational):
+    board = SGFBoard(
+        shape=(7, 5),
+        player=Player.BLACK,
+        data=[
+            [0, 1, -1, 0, 0],
+            [1, -1, 0, -1, 0],
+            [0, 1, -1, 0, 0],
+            [1, 0, 1, -1, 0],
+            [0, 1, -1, 0, 0],
+            [1, -1, 0, -1, 0],
+            [0, 1, -1, 0, 0],
+        ],
+        allow_super_ko=False,
+        situational_super_ko=situational,
+    )
+    for move in [(1, 2), (3, 1), (5, 2), (1, 1), (3, 2)]:
+        board.move(move)
+
+    assert not board.is_legal((5, 1))
+    assert (5, 1) not in board.legal_moves()
+
+
+@pytest.mark.parametrize(
+    "rules, dead, expected",
+    [
+        (GoRules.JAPANESE, [], (4, 10.5, "W+6.5")),
+        (GoRules.JAPANESE, [(1, 4)], (4, 17.5, "W+13.5")),
+        (GoRules.CHINESE, [], (11, 15.5, "W+4.5")),
+        (GoRules.CHINESE, [(1, 4)], (10, 21.5, "W+11.5")),
+        ("Chinese", [(1, 4), (1, 4)], (10, 21.5, "W+11.5")),
+    ],
+)
+def test_board_score(rules, dead, expected):
+    board = SGFBoard(
+        shape=(5, 5),
+        player=Player.BLACK,
+        data=[
+            [0, 1, -1, 0, 0],
+            [0, 1, -1, 0, 1],
+            [1, 1, -1, 0, 0],
+            [0, 1, -1, -1, -1],
+            [0, 1, -1, 0, 0],
+        ],
+    )
+    board.captured[Player.WHITE] = 2
+    score = board.score(rules, komi=6.5, dead=dead)
+    assert (score.black, score.white, score.result) == expected
+
+
+def test_board_territory():
+    board = SGFBoard((3, 3), Player.BLACK, data=[[0, 1, 0], [1, 1, -1], [0, -1, 0]])
+    assert board.territory() == {
+        Player.BLACK: {(0, 0)},
+        Player.WHITE: {(2, 2)},
+    }
+    assert board.territory(dead=[(2, 1), (1, 2)]) == {
+        Player.BLACK: {(0, 0), (0, 2), (1, 2), (2, 0), (2, 1), (2, 2)},
+        Player.WHITE: set(),
+    }
+
+    board = SGFBoard((2, 2), Player.BLACK)
+    assert board.territory() == {Player.BLACK: set(), Player.WHITE: set()}
+    assert board.score(komi=0).result == "0"
+
+
+def test_board_snapshot():
+    board = SGFBoard((3, 4), Player.BLACK)
+    empty = board.snapshot()
+    board.move((1, 2))
+    first = board.snapshot()
+    board.move((2, 0))
+    second = board.snapshot()
+
+    assert empty.data == [[0, 0, 0, 0]] * 3
+    assert first.data == [[0, 0, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]]
+    assert second[(2, 0)] is Location.WHITE
+    assert second.player is Player.BLACK
+    assert [row is other for row, other in zip(first.rows, second.rows)] == [
+        True,
+        True,
+        False,
+    ]
+
+    board.undo()
+    assert board.snapshot() == first
+    assert hash(board.snapshot()) == hash(first)
+    assert board.snapshot() != second
+    assert board.snapshot().rows[:2] == first.rows[:2]
+
+    copy = second.to_board()
+    assert copy.data == second.data
+    assert copy.snapshot() == second
+    copy.move((0, 0))
+    assert second[(0, 0)] is Location.EMPTY
+
+
+@pytest.mark.parametrize("name", ["shape", "player", "rows", "hash", "_captured", "x"])
+def test_board_snapshot_immutable(name):
+    board = SGFBoard((3, 3), Player.BLACK)
+    board.move((1, 1))
+    position = board.snapshot()
+    with pytest.raises(AttributeError):
+        setattr(position, name, None)
+    with pytest.raises(AttributeError):
+        delattr(position, name)
+    assert position == board.snapshot()
+
+    copy = pickle.loads(pickle.dumps(position))
+    assert copy == position
+    assert copy.captured == position.captured
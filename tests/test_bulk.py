@@ -0,0 +1,101 @@
+import pytest
+
+from sgflib import SGFParser
+from sgflib.bulk import parse_many
+from sgflib.exceptions import SGFParserError
+
+
+@pytest.fixture
+def sgf_dir(tmp_path, sabaki):
+    (tmp_path / "a.sgf").write_text(sabaki)
+    (tmp_path / "b.sgf").write_text("(;B[dd])(;B[dd];[aa])")
+    (tmp_path / "c.sgf").write_text(sabaki * 20 + "(;C[ł])")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "d.sgf").write_text("(;W[pp])\n")
+    (tmp_path / "sub" / "e.txt").write_text("not sgf")
+    return tmp_path
+
+
+@pytest.mark.parametrize("batch_size", [1, 1000, 1 << 20])
+def test_parse_many(sgf_dir, batch_size):
+    paths = [sgf_dir, sgf_dir / "missing.sgf", sgf_dir / "sub" / "d.sgf"]
+    results = list(parse_many(paths, workers=2, batch_size=batch_size))
+
+    assert [result.path for result in results] == [
+        sgf_dir / "a.sgf",
+        sgf_dir / "b.sgf",
+        sgf_dir / "c.sgf",
+        sgf_dir / "sub" / "d.sgf",
+        sgf_dir / "missing.sgf",
+        sgf_dir / "sub" / "d.sgf",
+    ]
+
+    for index in [0, 2, 3, 5]:
+        path, collection, error = results[index]
+        assert error is None
+        assert collection == SGFParser(path.read_text()).parse_collection()
+
+    path, collection, error = results[1]
+    assert collection is None
+    assert isinstance(error, SGFParserError)
+    assert str(error) == "Unterminated SGFGameTree: line 1 column 17 (char 16)"
+
+    path, collection, error = results[4]
+    assert collection is None
+    assert isinstance(error, FileNotFoundError)
+
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 7])
+def test_parse_many_chunk_size(tmp_path, chunk_size):
+    data = "(;C[a\\\\]GC[\\]\\\\])\n(;B[dd](;W[\\\\])(;W[pp]))"
+    (tmp_path / "a.sgf").write_text(data)
+    ((path, collection, error),) = parse_many([tmp_path], 1, 10, chunk_size=chunk_size)
+    assert error is None
+    assert collection == SGFParser(data).parse_collection()
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        (
+            "(;B[dd])\n\n  (;W[pp])(;B[dd];[aa])",
+            "Unterminated SGFGameTree: line 3 column 19 (char 28)",
+        ),
+        (
+            "(;B[dd])\n(;C[a\nb])\n(;B",
+            "Unterminated SGFGameTree: line 4 column 4 (char 22)",
+        ),
+        ("(;B[dd])\n  x", "Extra data: line 2 column 3 (char 11)"),
+    ],
+)
+def test_parse_many_error_position(tmp_path, data, expected):
+    (tmp_path / "a.sgf").write_text(data)
+    ((path, collection, error),) = parse_many([tmp_path], 1, 1, chunk_size=4)
+    assert collection is None
+    assert str(error) == expected
+
+
+def test_parse_many_crlf(tmp_path):
+    data = "(;C[line1\r\nline2])\r\n(;B[dd])"
+    (tmp_path / "a.sgf").write_bytes(data.encode())
+    data_error = "(;B[dd])\r\n\r\n(;B[dd];[aa])"
+    (tmp_path / "b.sgf").write_bytes(data_error.encode())
+
+    (_, collection, error), (_, _, error_b) = parse_many([tmp_path], 1)
+    assert error is None
+    assert collection == SGFParser(data).parse_collection()
+    assert collection[0].sequence[0]["C"] == {"line1\r\nline2"}
+
+    with pytest.raises(SGFParserError) as err:
+        SGFParser(data_error, engine="tokenizer").parse_collection()
+    assert str(error_b) == str(err.value)
+    assert str(error_b) == "Unterminated SGFGameTree: line 3 column 9 (char 20)"
+
+
+def test_parse_many_deep_tree(tmp_path):
+    data = "(;B[aa]" * 5000 + ")" * 5000
+    (tmp_path / "a.sgf").write_text(data)
+    (tmp_path / "b.sgf").write_text("(;B[dd])")
+    results = list(parse_many([tmp_path], workers=1))
+    assert [result.error for result in results] == [None, None]
+    assert results[0].collection.sgf == data
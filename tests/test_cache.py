@@ -0,0 +1,162 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+import tempfile
+
+import pytest
+
+from sgflib import SGFCollection, SGFGameTree, SGFNode, SGFParser
+from sgflib.cache import (
+    HEADER,
+    MAGIC,
+    SOURCE,
+    VERSION,
+    SGFCache,
+    pack_collection,
+    unpack_collection,
+)
+from sgflib.exceptions import SGFCacheError
+from sgflib.node import SGFCompactNode
+
+
+@pytest.fixture
+def collection(sabaki):
+    data = sabaki + "\n(;C[naïve \\] ünïcode]AB[aa][bb])"
+    return SGFParser(data).parse_collection()
+
+
+def test_pack_collection(collection):
+    unpacked = unpack_collection(pack_collection(collection))
+    assert unpacked == collection
+    assert unpacked.sgf == collection.sgf
+    assert type(unpacked) is SGFCollection
+    assert type(unpacked[0]) is SGFGameTree
+    assert type(unpacked[0].sequence[0]) is SGFNode
+    assert unpacked[0].sequence is unpacked[0][0]
+
+
+def test_pack_compact_nodes():
+    data = "(;GM[1]AB[aa][bb](;B[cc])(;W[dd]))"
+    collection = SGFParser(data, compact=True).parse_collection()
+    assert isinstance(collection[0].sequence[0], SGFCompactNode)
+    assert unpack_collection(pack_collection(collection)).sgf == collection.sgf
+
+
+def test_pack_empty():
+    assert unpack_collection(pack_collection([])) == []
+
+
+def test_pack_shares_properties():
+    data = "(;B[aa];W[bb])" * 100
+    collection = SGFParser(data).parse_collection()
+    packed = pack_collection(collection)
+    assert len(packed) < len(data)
+    unpacked = unpack_collection(packed)
+    assert unpacked == collection
+    # SGFPropertyValues are not shared between SGFNodes
+    unpacked[0].sequence[0]["B"].add("cc")
+    assert unpacked[1].sequence[0]["B"] == {"aa"}
+
+
+def test_pack_deep_tree():
+    data = "(;B[aa]" * 5000 + ")" * 5000
+    collection = SGFParser(data, engine="tokenizer").parse_collection()
+    assert unpack_collection(pack_collection(collection)).sgf == data
+
+
+def pack_header(size=0, *streams, magic=MAGIC, version=VERSION):
+    fields = [field for stream in streams for field in stream]
+    return HEADER.pack(magic, version, size, *fields)
+
+
+NO_STREAMS = [(1, 0)] * 4
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        b"",
+        b"SGFB",
+        pack_header(0, *NO_STREAMS, magic=b"XXXX"),
+        pack_header(0, *NO_STREAMS, version=1),
+        pack_header(0, (1, 0), (1, 0), (1, 1), (1, 0)),
+        pack_header(0, (3, 1), (1, 0), (1, 0), (1, 0)) + bytes(3),
+        pack_header(1, *NO_STREAMS) + b"\xff",
+        pack_header(0, (1, 0), (1, 0), (1, 1), (1, 0)) + b"\x05",
+        pack_header(0, (1, 0), (1, 0), (1, 4), (1, 1)) + bytes([1, 1, 1, 0, 0]),
+        pack_header(0, (1, 0), (1, 0), (1, 2), (1, 0)) + bytes([0, 7]),
+    ],
+)
+def test_unpack_invalid(data):
+    with pytest.raises(SGFCacheError):
+        unpack_collection(data)
+
+
+@pytest.fixture
+def sgf_path(tmp_path):
+    path = tmp_path / "game.sgf"
+    path.write_text("(;GM[1];B[aa];W[bb])", encoding="utf-8")
+    return path
+
+
+def test_cache_load(sgf_path, tmp_path, monkeypatch):
+    cache = SGFCache(tmp_path / "cache")
+    collection = cache.load(sgf_path)
+    assert collection.sgf == "(;GM[1];B[aa];W[bb])"
+    assert cache.get_path(sgf_path).exists()
+
+    def parse_collection(self):
+        raise AssertionError("Cached file should not be parsed")
+
+    monkeypatch.setattr(SGFParser, "parse_collection", parse_collection)
+    assert cache.load(sgf_path) == collection
+
+    # touched file is hashed, but not parsed
+    stat = os.stat(sgf_path)
+    os.utime(sgf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.load(sgf_path) == collection
+
+
+def test_cache_load_changed(sgf_path, tmp_path):
+    cache = SGFCache(tmp_path / "cache")
+    cache.load(sgf_path)
+
+    stat = os.stat(sgf_path)
+    sgf_path.write_text("(;GM[1];B[cc])", encoding="utf-8")
+    os.utime(sgf_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert cache.load(sgf_path).sgf == "(;GM[1];B[cc])"
+    assert cache.load(sgf_path).sgf == "(;GM[1];B[cc])"
+
+
+def test_cache_load_corrupt(sgf_path, tmp_path):
+    cache = SGFCache(tmp_path / "cache")
+    cache.load(sgf_path)
+
+    cache_path = cache.get_path(sgf_path)
+    cache_path.write_bytes(cache_path.read_bytes()[:-4])
+    assert cache.load(sgf_path).sgf == "(;GM[1];B[aa];W[bb])"
+    # corrupt cache file is replaced
+    cached = unpack_collection(cache_path.read_bytes()[SOURCE.size :])
+    assert cached.sgf == "(;GM[1];B[aa];W[bb])"
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == [cache_path.name]
+
+
+def test_cache_load_unwritable(sgf_path, tmp_path, monkeypatch):
+    def temporary_file(*args, **kwargs):
+        raise PermissionError("Read-only cache directory")
+
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", temporary_file)
+    cache = SGFCache(tmp_path / "cache")
+    assert cache.load(sgf_path).sgf == "(;GM[1];B[aa];W[bb])"
+    assert not cache.get_path(sgf_path).exists()
+
+
+def test_cache_load_threads(tmp_path):
+    path = tmp_path / "game.sgf"
+    path.write_text("(;GM[1];B[aa])" * 100, encoding="utf-8")
+    caches = [SGFCache(tmp_path / "cache") for _ in range(8)]
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda cache: cache.load(path), caches))
+    assert all(result == results[0] for result in results)
+    assert [path.name for path in (tmp_path / "cache").iterdir()] == [
+        caches[0].get_path(path).name
+    ]
@@ -1,6 +1,7 @@
 import pytest
 
-from sgflib import SGFGameTree
+from sgflib import SGFGameTree, SGFParser
+from sgflib.enums import ParserEngine
 from sgflib.exceptions import SGFGameTreeError, SGFSequenceError
 
 
@@ -124,3 +125,24 @@ def test_tree_ops():
     tree.cut_tree(1)
 
     assert tree == ([{"C": ["Root tree."]}],)
+
+
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_deep_tree(engine):
+    depth = 5000
+    data = "(;B[aa]" * depth + ")" * depth
+    tree = SGFParser(data, engine=engine).parse_game_tree()
+    assert tree.sgf == data
+
+    copy = tree.copy()
+    assert copy == tree
+    assert SGFGameTree(*tree) == tree
+    leaf = copy
+    for _ in range(depth - 1):
+        leaf = leaf.variations[0]
+    leaf.sequence[0]["B"] = ["bb"]
+    assert copy != tree
+    assert tree.sgf == data
+
+    pretty = tree.pretty(indent=0)
+    assert pretty == "(\n;B[aa]\n" * depth + "\n".join(")" * depth)
@@ -0,0 +1,169 @@
+import pytest
+
+from sgflib import SGFHandler, SGFParser
+from sgflib.enums import HandlerAction
+from sgflib.exceptions import SGFParserError
+
+TEST_SGF = """
+(;FF[4]PB[Black]PW[White];B[pd]C[Go \\] Go];W[dd]
+  (;B[pp])
+  (;B[dp]
+    (;W[pp])
+  )
+)
+(;PB[Black 2];B[aa](;W[bb]))
+"""
+
+
+class EventHandler(SGFHandler):
+    def __init__(self, actions=None):
+        self.events = []
+        self.actions = actions or {}
+
+    def _event(self, *event):
+        self.events.append(event)
+        return self.actions.get(event)
+
+    def start_tree(self):
+        return self._event("start_tree")
+
+    def end_tree(self):
+        return self._event("end_tree")
+
+    def start_node(self):
+        return self._event("start_node")
+
+    def property(self, label, values):
+        return self._event(label, *values)
+
+
+def test_parse_events():
+    handler = EventHandler()
+    SGFParser(TEST_SGF).parse_events(handler)
+    assert handler.events == [
+        ("start_tree",),
+        ("start_node",),
+        ("FF", "4"),
+        ("PB", "Black"),
+        ("PW", "White"),
+        ("start_node",),
+        ("B", "pd"),
+        ("C", "Go ] Go"),
+        ("start_node",),
+        ("W", "dd"),
+        ("start_tree",),
+        ("start_node",),
+        ("B", "pp"),
+        ("end_tree",),
+        ("start_tree",),
+        ("start_node",),
+        ("B", "dp"),
+        ("start_tree",),
+        ("start_node",),
+        ("W", "pp"),
+        ("end_tree",),
+        ("end_tree",),
+        ("end_tree",),
+        ("start_tree",),
+        ("start_node",),
+        ("PB", "Black 2"),
+        ("start_node",),
+        ("B", "aa"),
+        ("start_tree",),
+        ("start_node",),
+        ("W", "bb"),
+        ("end_tree",),
+        ("end_tree",),
+    ]
+
+
+def test_parse_events_skip():
+    handler = EventHandler({("PW", "White"): HandlerAction.SKIP})
+    SGFParser(TEST_SGF).parse_events(handler)
+    assert handler.events == [
+        ("start_tree",),
+        ("start_node",),
+        ("FF", "4"),
+        ("PB", "Black"),
+        ("PW", "White"),
+        ("end_tree",),
+        ("start_tree",),
+        ("start_node",),
+        ("PB", "Black 2"),
+        ("start_node",),
+        ("B", "aa"),
+        ("start_tree",),
+        ("start_node",),
+        ("W", "bb"),
+        ("end_tree",),
+        ("end_tree",),
+    ]
+
+    handler = EventHandler({("start_tree",): HandlerAction.SKIP})
+    SGFParser(TEST_SGF).parse_events(handler)
+    assert handler.events == [
+        ("start_tree",),
+        ("end_tree",),
+        ("start_tree",),
+        ("end_tree",),
+    ]
+
+
+def test_parse_events_stop():
+    handler = EventHandler({("B", "pd"): HandlerAction.STOP})
+    SGFParser(TEST_SGF + "garbage").parse_events(handler)
+    assert handler.events[-3:] == [("PW", "White"), ("start_node",), ("B", "pd")]
+
+
+def test_parse_events_bytes():
+    handler = EventHandler()
+    data = "(;CA[latin-1]C[café];b[aa])".encode("latin-1")
+    data += "(;C[ł]PB[x\\]])".encode("utf-8")
+    SGFParser(data).parse_events(handler)
+    assert handler.events == [
+        ("start_tree",),
+        ("start_node",),
+        ("CA", "latin-1"),
+        ("C", "café"),
+        ("start_node",),
+        ("B", "aa"),
+        ("end_tree",),
+        ("start_tree",),
+        ("start_node",),
+        ("C", "ł"),
+        ("PB", "x]"),
+        ("end_tree",),
+    ]
+    assert all(isinstance(item, str) for event in handler.events for item in event)
+
+
+def test_parse_events_label_without_values():
+    handler = EventHandler()
+    SGFParser("(;B[dd]C;W[aa]X)").parse_events(handler)
+    assert handler.events == [
+        ("start_tree",),
+        ("start_node",),
+        ("B", "dd"),
+        ("start_node",),
+        ("W", "aa"),
+        ("end_tree",),
+    ]
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("", "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        ("(;B[dd]))", "Extra data: line 1 column 9 (char 8)"),
+        ("(;B C[x])", "Unterminated SGFGameTree: line 1 column 5 (char 4)"),
+        ("(;B[dd]", "Unterminated SGFGameTree: line 1 column 8 (char 7)"),
+        (
+            "(;B[dd](;W[pp]);W[pq])",
+            "Unterminated SGFGameTree: line 1 column 16 (char 15)",
+        ),
+    ],
+)
+def test_parse_events_error(data, expected):
+    with pytest.raises(SGFParserError) as err:
+        SGFParser(data).parse_events(SGFHandler())
+    assert str(err.value) == expected
@@ -0,0 +1,90 @@
+import pytest
+
+from sgflib import SGFIncrementalParser, SGFNode, SGFParser
+from sgflib.enums import Token
+from sgflib.exceptions import SGFParserError
+
+
+def feed_all(data, chunk_size):
+    parser = SGFIncrementalParser()
+    events = []
+    for i in range(0, len(data), chunk_size):
+        events.extend(parser.feed(data[i : i + chunk_size]))
+    parser.close()
+    return events
+
+
+def count_nodes(tree):
+    return len(tree.sequence) + sum(map(count_nodes, tree.variations))
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 65536])
+def test_feed(sabaki, chunk_size):
+    data = sabaki + "\n(;C[\r\n(Go\\]\r\n\\\\)\nł] GN [x]\n)\n(;B[dd]C;W[aa]X)"
+    data += sabaki
+
+    expected = SGFParser(data).parse_collection()
+    events = feed_all(data, chunk_size)
+
+    trees = [obj for token, obj in events if token is Token.TREE_END]
+    assert trees == expected
+    assert trees[1].sequence[0].sgf == ";C[(Go\\]\\\\)\nł]GN[x]"
+
+    nodes = [obj for token, obj in events if token is Token.NODE]
+    assert len(nodes) == sum(map(count_nodes, expected))
+
+
+def test_feed_events():
+    parser = SGFIncrementalParser()
+    assert parser.feed("(;GM[1];B[d") == [(Token.NODE, SGFNode({"GM": ["1"]}))]
+    assert parser.feed("d]") == []
+    assert parser.feed("(;W[pp])") == [
+        (Token.NODE, SGFNode({"B": ["dd"]})),
+        (Token.NODE, SGFNode({"W": ["pp"]})),
+    ]
+
+    events = parser.feed(")")
+    assert events == [
+        (Token.TREE_END, SGFParser("(;GM[1];B[dd](;W[pp]))").parse_game_tree())
+    ]
+    parser.close()
+
+
+@pytest.mark.parametrize(
+    "data", ["(;()", "(;B[dd](;W[aa])( \n )(;C[x])", "(;B[dd]C;W[aa]X)"]
+)
+@pytest.mark.parametrize("chunk_size", [1, 65536])
+def test_feed_lenient(data, chunk_size):
+    """Labels without values and empty variations are skipped, as in SGFParser."""
+    events = feed_all(data, chunk_size)
+    trees = [obj for token, obj in events if token is Token.TREE_END]
+    assert trees == SGFParser(data).parse_collection()
+
+
+@pytest.mark.parametrize(
+    "chunks, expected",
+    [
+        ([""], "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        (["(;B[dd])", ";"], "Extra data: line 1 column 9 (char 8)"),
+        (["(;B[dd])", " B"], "Extra data: line 1 column 10 (char 9)"),
+        (["(;B[dd]", "C D[x])"], "Unterminated SGFGameTree: line 1 column 10 (char 9)"),
+        (["(;B[dd]", "!"], "Unterminated SGFGameTree: line 1 column 8 (char 7)"),
+        (["(;B[dd]", ";B"], "Unterminated SGFGameTree: line 1 column 10 (char 9)"),
+        (
+            ["(;B[dd]", "(;C[x"],
+            "Unterminated SGFProperty value: line 1 column 13 (char 12)",
+        ),
+        (["(", ")"], "Expecting SGFSequence: line 1 column 2 (char 1)"),
+        (
+            ["(;B[dd])\n(;C[a\n", "b]\n;", "[x])"],
+            "Unterminated SGFGameTree: line 4 column 4 (char 21)",
+        ),
+    ],
+)
+def test_feed_error(chunks, expected):
+    parser = SGFIncrementalParser()
+    with pytest.raises(SGFParserError) as err:
+        for chunk in chunks:
+            parser.feed(chunk)
+        parser.close()
+    assert str(err.value) == expected
@@ -25,3 +25,13 @@ def test_kifu_move():
     kifu.play((2, 2))
     print(kifu.sgf)
     print(kifu.board)
+
+
+def test_kifu_position():
+    kifu = SGFKifu(shape=(3, 3))
+    positions = [kifu.position]
+    kifu.play((1, 2))
+    positions.append(kifu.position)
+    kifu.previous()
+    assert kifu.position == positions[0]
+    assert positions[1].data == [[0, 0, 0], [0, 0, 1], [0, 0, 0]]
@@ -1,6 +1,10 @@
+import pickle
+
 import pytest
 
 from sgflib import SGFNode
+from sgflib.node import SGFCompactNode, SGFLazyNode
+from sgflib.exceptions import SGFPropertyValueError
 
 
 @pytest.mark.parametrize(
@@ -52,3 +56,105 @@ def test_node_ops():
 
     node.setdefault("B", ["qq"])
     assert node == {"AB": {"dd"}, "AW": {"pp"}, "B": {"qq"}}
+
+
+def test_lazy_node():
+    node = SGFLazyNode(b";B[dd]C[Go \\] \xc5\x82\tGo]W[pp];", 1, "utf-8")
+    assert dict.__len__(node) == 0
+    assert not hasattr(node, "__dict__")
+
+    copy_node = node.copy()
+    assert isinstance(copy_node, SGFLazyNode)
+
+    assert node == {"B": {"dd"}, "C": {"Go ] ł Go"}, "W": {"pp"}}
+    assert node.sgf == ";B[dd]C[Go \\] ł Go]W[pp]"
+    assert copy_node == node
+    assert SGFNode({"B": ["dd"]}) != SGFLazyNode(";W[dd])", 1)
+
+    node["B"] = ["de"]
+    assert node["B"] == {"de"}
+    assert copy_node["B"] == {"dd"}
+    assert type(node.copy()) is SGFNode
+
+
+@pytest.mark.parametrize(
+    "props, expected",
+    [
+        ({}, ";"),
+        ({"b": ["dd"]}, ";B[dd]"),
+        (
+            {
+                "C": ["John Doe [3d] \\UA\\"],
+                "AB": ["pp", "dd", "pp"],
+            },
+            ";AB[dd][pp]C[John Doe [3d\\] \\\\UA\\\\]",
+        ),
+    ],
+)
+def test_print_compact_node(props, expected):
+    node = SGFCompactNode(props)
+    assert node.sgf == expected
+    assert node.sgf == SGFNode(props).sgf
+    assert repr(node) == f"SGFCompactNode({expected})"
+
+
+def test_compact_node_ops():
+    node = SGFCompactNode(AW=["pp"])
+    node["AB"] = {"dd"}
+    assert node == {"AB": {"dd"}, "AW": {"pp"}}
+    assert node == SGFNode({"AB": ["dd"], "AW": ["pp"]})
+    assert SGFNode({"AB": ["dd"], "AW": ["pp"]}) == node
+    assert list(node) == ["AB", "AW"]
+    assert "AB" in node and "C" not in node
+
+    with pytest.raises(KeyError):
+        _ = node["C"]
+    with pytest.raises(SGFPropertyValueError):
+        node["C"] = []
+
+    node["AB"].add("ee")
+    assert node["AB"] == {"dd", "ee"}
+
+    copy_node = node.copy()
+    del node["AW"]
+    assert node == {"AB": {"dd", "ee"}}
+    assert copy_node == {"AB": {"dd", "ee"}, "AW": {"pp"}}
+
+    with pytest.raises(KeyError):
+        del node["AW"]
+
+    assert node.setdefault("B", ["qq"]) == {"qq"}
+    assert node.setdefault("B", ["rr"]) == {"qq"}
+    assert node.get("W") is None
+    assert len(node) == 2
+
+
+@pytest.mark.parametrize("node_type", [SGFNode, SGFCompactNode])
+def test_node_value_changes(node_type):
+    node = node_type(AB=["dd"], AW=["pp"])
+    values = node["AB"]
+    values.add("cc")
+    values |= {"ee"}
+    values.discard("dd")
+    node["AW"].update(["qq", "rr"])
+    node["AW"] -= {"pp"}
+    assert node == {"AB": {"cc", "ee"}, "AW": {"qq", "rr"}}
+    assert node.sgf == ";AB[cc][ee]AW[qq][rr]"
+    assert pickle.loads(pickle.dumps(node["AB"])) == {"cc", "ee"}
+
+    # replaced and deleted values are not changed by values read before
+    node["AB"] = ["aa"]
+    values.add("bb")
+    assert node["AB"] == {"aa"}
+    del node["AW"]
+    node_values = node["AB"]
+    del node["AB"]
+    node_values.add("bb")
+    assert node == {}
+
+
+def test_compact_node_sharing():
+    first = SGFCompactNode({"B": ["pd"], "C": ["Good move."]})
+    second = SGFCompactNode({"C": ["Bad move."], "B": ["pd"]})
+    assert first._labels is second._labels
+    assert first._values[0] is second._values[0]
@@ -1,3 +1,7 @@
+import io
+import mmap
+import pickle
+
 import pytest
 
 from sgflib import (
@@ -6,7 +10,11 @@ from sgflib import (
     SGFGameTree,
     SGFCollection,
     SGFParser,
+    SGFCursor,
+    iterparse,
 )
+from sgflib.node import SGFCompactNode, SGFLazyNode
+from sgflib.enums import ParserEngine
 from sgflib.exceptions import SGFParserError
 
 
@@ -57,6 +65,7 @@ def test_parse_prop_value_error(data, expected):
         ("AB[dd][pp];", "AB", {"dd", "pp"}),
         ("AB[dd][pp](", "AB", {"dd", "pp"}),
         ("AB[dd][pp])", "AB", {"dd", "pp"}),
+        (" AB [dd] [pp]", "AB", {"dd", "pp"}),
     ],
 )
 def test_parse_property(data, label, values):
@@ -195,8 +204,9 @@ def test_parse_sequence_error(data, expected):
         ),
     ],
 )
-def test_parse_game_tree(data, expected):
-    parser = SGFParser(data)
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_parse_game_tree(data, expected, engine):
+    parser = SGFParser(data, engine=engine)
     assert parser.parse_game_tree() == expected
 
 
@@ -237,8 +247,9 @@ def test_parse_game_tree_error(data, expected):
         ),
     ],
 )
-def test_parse_game_trees(data, expected):
-    parser = SGFParser(data)
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_parse_game_trees(data, expected, engine):
+    parser = SGFParser(data, engine=engine)
     assert parser.parse_game_trees() == expected
 
 
@@ -272,8 +283,9 @@ def test_parse_game_trees(data, expected):
         ),
     ],
 )
-def test_parse_collection(data, expected):
-    parser = SGFParser(data)
+@pytest.mark.parametrize("engine", list(ParserEngine))
+def test_parse_collection(data, expected, engine):
+    parser = SGFParser(data, engine=engine)
     assert parser.parse_collection() == expected
 
 
@@ -291,3 +303,337 @@ def test_parse_collection_error(data, expected):
     with pytest.raises(SGFParserError) as err:
         parser.parse_collection()
     assert str(err.value) == expected
+
+
+def test_parser_error_args():
+    err = SGFParserError("Extra data", "x\ny", 2, (10, 3, 4))
+    assert err.args == ("Extra data: line 4 column 1 (char 12)",)
+    assert str(err) == "Extra data: line 4 column 1 (char 12)"
+    assert "x\ny" not in repr(err)
+
+    copy = pickle.loads(pickle.dumps(err))
+    assert copy.args == err.args
+    assert str(copy) == str(err)
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("[dd]", "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        ("B[dd]", "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        (";B[dd]", "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        ("(;B[dd]))", "Extra data: line 1 column 9 (char 8)"),
+        ("(;B[dd])\n x", "Extra data: line 1 column 9 (char 8)"),
+        ("()", "Expecting SGFSequence: line 1 column 2 (char 1)"),
+        ("(;B C[x])", "Unterminated SGFGameTree: line 1 column 5 (char 4)"),
+        ("(;B[dd]", "Unterminated SGFGameTree: line 1 column 8 (char 7)"),
+        ("(;[dd])", "Unterminated SGFGameTree: line 1 column 3 (char 2)"),
+        (
+            "(;B[dd](;W[pp]);W[pq])",
+            "Unterminated SGFGameTree: line 1 column 16 (char 15)",
+        ),
+        (
+            "(;C[John\n[3d\\])",
+            "Unterminated SGFProperty value: line 2 column 6 (char 14)",
+        ),
+    ],
+)
+def test_parse_collection_tokenizer_error(data, expected):
+    parser = SGFParser(data, engine=ParserEngine.TOKENIZER)
+    with pytest.raises(SGFParserError) as err:
+        parser.parse_collection()
+    assert str(err.value) == expected
+
+
+def test_parse_collection_engines_match(sabaki):
+    expected = SGFParser(sabaki).parse_collection()
+    collection = SGFParser(sabaki, engine=ParserEngine.TOKENIZER).parse_collection()
+    assert collection == expected
+    assert collection.sgf == expected.sgf
+
+
+LENIENT_DATA = [
+    ("(;B)", "(;)"),
+    ("(;W[pp]C)", "(;W[pp])"),
+    ("(;B[dd]C;W[aa])", "(;B[dd];W[aa])"),
+    ("(;B[dd]C(;W[aa])(;W[bb]))", "(;B[dd](;W[aa])(;W[bb]))"),
+    ("(;B[dd]()", "(;B[dd])"),
+    ("(;()", "(;)"),
+    ("(;B[dd](;W[aa])( \n )(;C[x])", "(;B[dd](;W[aa]))\n\n(;C[x])"),
+    ("(;B[dd](;W[aa]())", "(;B[dd](;W[aa]))"),
+]
+
+
+@pytest.mark.parametrize("data, expected", LENIENT_DATA)
+@pytest.mark.parametrize("options", [{}, dict(engine="tokenizer"), dict(lazy=True)])
+def test_parse_collection_engines_match_lenient(data, expected, options):
+    """Both engines skip labels without values and empty variations."""
+    collection = SGFParser(data, **options).parse_collection()
+    assert collection.sgf == expected
+
+    collection, errors = SGFParser(data, **options).recover_collection()
+    assert collection.sgf == expected
+    assert errors == []
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 7, 65536])
+def test_iterparse(sabaki, chunk_size):
+    data = sabaki + "\n(;C[(Go\\]\\\\)ł]GC[a\\\\])\n" + sabaki
+
+    expected = SGFParser(data).parse_collection()
+
+    trees = iterparse(io.StringIO(data), chunk_size)
+    assert list(trees) == expected
+
+    trees = iterparse(io.BytesIO(data.encode("utf-8")), chunk_size)
+    assert list(trees) == expected
+
+
+@pytest.mark.parametrize("data, expected", LENIENT_DATA)
+@pytest.mark.parametrize("chunk_size", [1, 2, 65536])
+def test_iterparse_lenient(data, expected, chunk_size):
+    trees = iterparse(io.StringIO(data), chunk_size)
+    assert SGFCollection(trees).sgf == expected
+
+
+def test_iterparse_path(sabaki, sabaki_path):
+    expected = SGFParser(sabaki).parse_collection()
+    assert list(iterparse(sabaki_path)) == expected
+    assert list(iterparse(str(sabaki_path))) == expected
+
+
+def test_iterparse_path_crlf(tmp_path):
+    path = tmp_path / "crlf.sgf"
+    data = "(;C[line1\r\nline2])\r\n(;B[dd];[x])"
+    path.write_bytes(data.encode())
+
+    trees = iterparse(path)
+    assert next(trees).sequence[0]["C"] == {"line1\r\nline2"}
+    with pytest.raises(SGFParserError) as err:
+        next(trees)
+    expected = "Unterminated SGFGameTree: line 3 column 9 (char 28)"
+    assert str(err.value) == expected
+
+    with pytest.raises(SGFParserError) as err:
+        SGFParser(data, engine="tokenizer").parse_collection()
+    assert str(err.value) == expected
+
+@pytest.mark.parametrize(
+    "data, count, expected",
+    [
+        ("", 0, "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        (";B[dd]", 0, "Expecting SGFCollection: line 1 column 1 (char 0)"),
+        ("(;B[dd]))", 1, "Extra data: line 1 column 9 (char 8)"),
+        ("(;B[dd])(;B", 1, "Unterminated SGFGameTree: line 1 column 12 (char 11)"),
+        (
+            "(;B[dd])(;C[)",
+            1,
+            "Unterminated SGFProperty value: line 1 column 14 (char 13)",
+        ),
+        (
+            "(;B[dd])(;B[dd];[x])",
+            1,
+            "Unterminated SGFGameTree: line 1 column 17 (char 16)",
+        ),
+        (
+            "(;B[dd])\n(;C[a\nb]\n;[x])",
+            1,
+            "Unterminated SGFGameTree: line 4 column 2 (char 19)",
+        ),
+    ],
+)
+def test_iterparse_error(data, count, expected):
+    trees = iterparse(io.StringIO(data), chunk_size=3)
+    for _ in range(count):
+        next(trees)
+    with pytest.raises(SGFParserError) as err:
+        next(trees)
+    assert str(err.value) == expected
+
+
+@pytest.mark.parametrize("charset", ["UTF-8", "ISO-8859-2", "cp1250"])
+def test_parse_bytes(sabaki, charset):
+    data = sabaki.replace("CA[UTF-8]", f"CA[{charset}]")
+    data = data.replace("Black is dead.", "Czarne nie żyją.")
+
+    expected = SGFParser(data).parse_collection()
+    collection = SGFParser(data.encode(charset)).parse_collection()
+    assert isinstance(collection[0].sequence[1], SGFLazyNode)
+    assert collection == expected
+    assert collection.sgf == expected.sgf
+
+
+def test_parse_bytes_default_encoding():
+    data = "(;C[Zażółć];C[gęślą])(;CA[bogus]C[jaźń])"
+    expected = SGFParser(data).parse_collection()
+    assert SGFParser(data.encode("cp1250"), encoding="cp1250").parse_collection() == (
+        expected
+    )
+
+
+def test_parse_mmap(tmp_path, sabaki):
+    expected = SGFParser(sabaki * 3).parse_collection()
+
+    path = tmp_path / "games.sgf"
+    path.write_bytes(sabaki.encode() * 3)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        assert SGFParser(m).parse_collection() == expected
+
+
+@pytest.mark.parametrize("corrupt", ["\x00\x00", "ł", "]"])
+def test_parse_bytes_corrupt(tmp_path, sabaki, corrupt):
+    # corrupt data between the first two SGFNodes of the second SGFGameTree
+    index = sabaki.index(";", sabaki.index(";") + 1)
+    data = sabaki + "\n" + sabaki[:index] + corrupt + sabaki[index:]
+    with pytest.raises(SGFParserError) as expected:
+        SGFParser(data, engine="tokenizer").parse_collection()
+
+    with pytest.raises(SGFParserError) as err:
+        SGFParser(data.encode()).parse_collection()
+    assert str(err.value) == str(expected.value)
+
+    path = tmp_path / "games.sgf"
+    path.write_bytes(data.encode())
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        with pytest.raises(SGFParserError):
+            SGFParser(m).parse_collection()
+
+
+def test_parse_lazy(sabaki):
+    expected = SGFParser(sabaki).parse_collection()
+    collection = SGFParser(sabaki, lazy=True).parse_collection()
+
+    cursor = SGFCursor(collection[0])
+    cursor.next()
+    cursor.next()
+    cursor.next(1)
+    assert not any(node.loaded for node in collection[0].sequence)
+    assert not any(node.loaded for node in cursor.tree.sequence)
+
+    assert cursor.node == {"W": {"rd"}}
+    assert cursor.node.loaded
+    assert collection == expected
+    assert collection.sgf == expected.sgf
+
+
+def test_parse_compact(sabaki):
+    expected = SGFParser(sabaki).parse_collection()
+    collection = SGFParser(sabaki, compact=True).parse_collection()
+    assert all(
+        type(node) is SGFCompactNode
+        for tree in collection
+        for node in tree.sequence + tree.variations[0].sequence
+    )
+    assert collection == expected
+    assert collection.sgf == expected.sgf
+    assert collection.copy() == expected
+
+    collection = SGFParser(sabaki.encode(), compact=True).parse_collection()
+    assert type(collection[0].sequence[0]) is SGFLazyNode
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("(;B[dd];W C[x])", "Unterminated SGFGameTree: line 1 column 11 (char 10)"),
+        ("(;B[dd];[x])", "Unterminated SGFGameTree: line 1 column 9 (char 8)"),
+        (
+            "(;B[dd];[x]W[bb];W[cc])",
+            "Unterminated SGFGameTree: line 1 column 9 (char 8)",
+        ),
+    ],
+)
+def test_parse_lazy_error(data, expected):
+    collection = SGFParser(data, lazy=True).parse_collection()
+    assert collection[0].sequence[0] == {"B": {"dd"}}
+    # broken SGFNode raises on every access, it is not left empty
+    for _ in range(2):
+        with pytest.raises(SGFParserError) as err:
+            _ = collection[0].sequence[1]["W"]
+        assert str(err.value) == expected
+    assert not collection[0].sequence[1].loaded
+    with pytest.raises(SGFParserError) as err:
+        _ = collection.sgf
+    assert str(err.value) == expected
+
+    with pytest.raises(SGFParserError) as err:
+        SGFParser(data, engine="tokenizer").parse_collection()
+    assert str(err.value) == expected
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("(;B[aa]@@;W[bb])", "Unterminated SGFGameTree: line 1 column 8 (char 7)"),
+        (
+            "(;B[aa]C[x] ] ;W[bb])",
+            "Unterminated SGFGameTree: line 1 column 12 (char 11)",
+        ),
+        ("(;B[aa]\n(;W[bb])@)", "Unterminated SGFGameTree: line 2 column 9 (char 16)"),
+        ("(;CA[UTF-8]!;W[bb])", "Unterminated SGFGameTree: line 1 column 12 (char 11)"),
+        ("(;B[aa]\n", "Unterminated SGFGameTree: line 1 column 8 (char 7)"),
+    ],
+)
+def test_parse_lazy_malformed(data, expected):
+    """Lazy parsing rejects the same malformed data as eager parsing."""
+    for options in [dict(engine="tokenizer"), dict(lazy=True), dict(compact=True)]:
+        with pytest.raises(SGFParserError) as err:
+            SGFParser(data, **options).parse_collection()
+        assert str(err.value) == expected
+
+    with pytest.raises(SGFParserError) as err:
+        SGFParser(data.encode()).parse_collection()
+    assert str(err.value) == expected
+
+
+@pytest.mark.parametrize(
+    "data, expected, errors",
+    [
+        ("", [], ["Expecting SGFCollection: line 1 column 1 (char 0)"]),
+        ("(;B[dd])\n", ["(;B[dd])"], []),
+        (
+            "(;B[dd])\n(;W[pp];[x])\n(;B[aa])",
+            ["(;B[dd])", "(;B[aa])"],
+            ["Unterminated SGFGameTree: line 2 column 9 (char 17)"],
+        ),
+        (
+            "(;B[dd])\n(;W[pp](;C[(x\\]])!)\n(;B[aa])",
+            ["(;B[dd])", "(;B[aa])"],
+            ["Unterminated SGFGameTree: line 2 column 18 (char 26)"],
+        ),
+        (
+            "garbage (;B[dd]);C[x](;B[aa])",
+            ["(;B[dd])", "(;B[aa])"],
+            [
+                "Expecting SGFGameTree: line 1 column 1 (char 0)",
+                "Expecting SGFGameTree: line 1 column 17 (char 16)",
+            ],
+        ),
+        (
+            "(;B[dd]\n(;W[pp\n(;B[aa])",
+            ["(;W[pp\n(;B[aa])"],
+            ["Unterminated SGFGameTree: line 3 column 9 (char 23)"],
+        ),
+        (
+            "(;B[dd])\n(;B[dd]",
+            ["(;B[dd])"],
+            ["Unterminated SGFGameTree: line 2 column 8 (char 16)"],
+        ),
+    ],
+)
+def test_recover_collection(data, expected, errors):
+    parser = SGFParser(data, engine=ParserEngine.TOKENIZER)
+    collection, errs = parser.recover_collection()
+    assert [tree.sgf for tree in collection] == expected
+    assert [str(err) for err in errs] == errors
+
+
+@pytest.mark.parametrize("encode", [False, True])
+def test_recover_collection_lazy(encode):
+    data = "(;B[dd])\n(;W[pp](;B[aa];W C[x])(;B[bb]))\n(;B[aa];W[bb])"
+    data = data.encode() if encode else data
+    collection, errs = SGFParser(data, lazy=True).recover_collection()
+    assert [tree.sgf for tree in collection] == ["(;B[dd])", "(;B[aa];W[bb])"]
+    assert [str(err) for err in errs] == [
+        "Unterminated SGFGameTree: line 2 column 18 (char 26)"
+    ]
@@ -0,0 +1,76 @@
+import io
+
+import pytest
+
+from sgflib import SGFBoard
+from sgflib.enums import Player
+from sgflib.exceptions import SGFBoardError
+from sgflib.render import (
+    dump_planes,
+    get_plane_size,
+    load_planes,
+    pack_planes,
+    render,
+    unpack_planes,
+)
+
+
+@pytest.mark.parametrize(
+    "spaces, expected",
+    [
+        (0, "+⬤\n◯+\n++\n"),
+        (1, "+ ⬤ \n◯ + \n+ + \n"),
+        (2, "+  ⬤  \n◯  +  \n+  +  \n"),
+    ],
+)
+def test_render(spaces, expected):
+    assert render([b"\x00\x01", b"\x02\x00", b"\x00\x00"], spaces) == expected
+
+
+def test_board_str():
+    board = SGFBoard((2, 3), Player.BLACK, data=[[0, 1, -1], [1, 0, 0]])
+    # every line shows a column
+    assert str(board) == "+ ⬤ \n⬤ + \n◯ + \n"
+    assert board.__str__(0) == "+⬤\n⬤+\n◯+\n"
+    assert str(board.snapshot()) == str(board)
+
+
+@pytest.mark.parametrize(
+    "shape, rows, expected",
+    [
+        ((1, 1), [b"\x00"], b"\x00\x00\x80"),
+        ((1, 1), [b"\x02"], b"\x00\x80\x00"),
+        ((2, 3), [b"\x01\x00\x02", b"\x00\x01\x00"], b"\x88\x20\x54"),
+        (
+            (3, 3),
+            [b"\x01\x01\x01", b"\x01\x02\x01", b"\x01\x01\x01"],
+            b"\xf7\x80\x08\x00\x00\x00",
+        ),
+    ],
+)
+def test_pack_planes(shape, rows, expected):
+    assert len(expected) == 3 * get_plane_size(shape)
+    assert pack_planes(rows) == expected
+    assert unpack_planes(expected, shape) == tuple(rows)
+
+
+def test_unpack_planes_wrong_size():
+    with pytest.raises(SGFBoardError) as err:
+        unpack_planes(b"\x00\x00", (3, 3))
+    assert str(err.value) == "Planes of shape (3, 3) should be 6 bytes."
+
+
+def test_dump_planes():
+    board = SGFBoard((5, 4), Player.BLACK)
+    positions = [board.snapshot()]
+    for coord in [(0, 0), (1, 0), (2, 3), (0, 1), (4, 3)]:
+        board.move(coord)
+        positions.append(board.snapshot())
+
+    fp = io.BytesIO()
+    assert dump_planes((position.rows for position in positions), fp) == 6
+    assert len(fp.getvalue()) == 6 * 3 * 3
+    assert positions[3].planes() == fp.getvalue()[27:36]
+
+    fp.seek(0)
+    assert list(load_planes(fp, (5, 4))) == [position.rows for position in positions]
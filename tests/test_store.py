@@ -0,0 +1,129 @@
+import pytest
+
+from sgflib import SGFParser
+from sgflib.enums import Player
+
+np = pytest.importorskip("numpy")
+
+from sgflib.store import SGFGameStore  # noqa: E402
+
+DATA = """
+(;GM[1]SZ[19]PB[Alice]RE[B+R];B[dd];W[pp];B[tt];W[dd])
+(;GM[1]SZ[9]PW[Bob];B[ee](;W[cc];B[gg])(;W[gg]))
+(;GM[1]SZ[19]PB[Alice]AB[aa];B[pd];W[dd];B[];W[ee])
+"""
+
+
+@pytest.fixture
+def store():
+    collection = SGFParser(DATA).parse_collection()
+    return SGFGameStore.from_trees(collection)
+
+
+def test_store_columns(store):
+    assert len(store) == 3
+    assert store.game.tolist() == [0, 0, 0, 0, 1, 1, 1, 2, 2, 2, 2]
+    assert store.move.tolist() == [1, 2, 3, 4, 1, 2, 3, 1, 2, 3, 4]
+    assert store.color.tolist() == [1, -1, 1, -1, 1, -1, 1, 1, -1, 1, -1]
+    assert store.x.tolist() == [3, 15, -1, 3, 4, 2, 6, 15, 3, -1, 4]
+    assert store.y.tolist() == [3, 15, -1, 3, 4, 2, 6, 3, 3, -1, 4]
+    assert store.offsets.tolist() == [0, 4, 7, 11]
+    assert store.headers == {
+        "GM": ["1"],
+        "SZ": ["19", "9"],
+        "PB": ["Alice"],
+        "RE": ["B+R"],
+        "PW": ["Bob"],
+        "AB": ["aa"],
+    }
+    assert store.header_codes.tolist() == [
+        [0, 0, 0],
+        [0, 1, 0],
+        [0, -1, 0],
+        [0, -1, -1],
+        [-1, 0, -1],
+        [-1, -1, 0],
+    ]
+    assert store.get_headers("PB") == ["Alice", None, "Alice"]
+    assert store.get_headers("XX") == [None, None, None]
+    assert store.errors == {}
+    assert store.moves(1) == [
+        (Player.BLACK, (4, 4)),
+        (Player.WHITE, (2, 2)),
+        (Player.BLACK, (6, 6)),
+    ]
+    assert store.moves(0)[2] == (Player.BLACK, None)
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (dict(coord=(3, 3)), [0, 2]),
+        (dict(coord=(3, 3), move=2), [2]),
+        (dict(coord=(3, 3), player="B"), [0]),
+        (dict(coord=None), [0, 2]),
+        (dict(move=4), [0, 2]),
+        (dict(coord=(18, 18)), []),
+    ],
+)
+def test_store_find_games(store, query, expected):
+    assert store.find_games(**query).tolist() == expected
+
+
+def test_store_count_moves(store):
+    assert store.count_moves(1) == {(3, 3): 1, (4, 4): 1, (15, 3): 1}
+    assert store.count_moves(player=Player.WHITE) == {
+        (15, 15): 1,
+        (3, 3): 2,
+        (2, 2): 1,
+        (4, 4): 1,
+    }
+    assert store.count_moves(3) == {None: 2, (6, 6): 1}
+
+
+@pytest.mark.parametrize(
+    "label, value, expected",
+    [("PB", "Alice", [0, 2]), ("SZ", "9", [1]), ("PB", "Bob", []), ("XX", "1", [])],
+)
+def test_store_find_headers(store, label, value, expected):
+    ids = store.find_headers(label, value)
+    assert ids.tolist() == expected
+    assert ids.dtype == store.game.dtype
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_store_save(store, tmp_path, mmap):
+    store.save(tmp_path / "store")
+    loaded = SGFGameStore.load(tmp_path / "store", mmap=mmap)
+    assert len(loaded) == 3
+    for name, column in store.columns.items():
+        assert loaded.columns[name].tolist() == column.tolist()
+        assert loaded.columns[name].dtype == column.dtype
+    assert loaded.headers == store.headers
+    assert loaded.header_codes.tolist() == store.header_codes.tolist()
+    assert loaded.errors == store.errors
+    assert loaded.find_games((3, 3), move=2).tolist() == [2]
+
+
+def test_store_invalid_games():
+    data = (
+        "(;SZ[19];B[dd])(;SZ[x];B[dd])(;SZ[53])(;B[d1])(;B[ddd])(;SZ[9];B[ee])"
+        "(;SZ[9:13];B[aa];W[zz])(;SZ[13:9];B[tt];W[bl])(;SZ[9:13];B[bl];W[tt])"
+        "(;SZ[19:21];B[tt])(;SZ[9:a])"
+    )
+    store = SGFGameStore.from_trees(SGFParser(data).parse_collection())
+    assert len(store) == 11
+    assert store.game.tolist() == [0, 5, 8, 8]
+    assert store.offsets.tolist() == [0, 1, 1, 1, 1, 1, 2, 2, 2, 4, 4, 4]
+    assert store.moves(8) == [(Player.BLACK, (1, 11)), (Player.WHITE, None)]
+    assert store.errors == {
+        1: "Game 1: Invalid board size: x.",
+        2: "Game 2: Invalid board size: 53.",
+        3: "Game 3: Move 1: Invalid SGFPoint: d1.",
+        4: "Game 4: Move 1: Invalid SGFPoint: ddd.",
+        6: "Game 6: Move 2: SGFPoint zz is outside of 9x13 board.",
+        7: "Game 7: Move 2: SGFPoint bl is outside of 13x9 board.",
+        9: "Game 9: Move 1: SGFPoint tt is outside of 19x21 board.",
+        10: "Game 10: Invalid board size: 9:a.",
+    }
+    assert store.find_headers("SZ", "x").tolist() == [1]
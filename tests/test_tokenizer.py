@@ -0,0 +1,120 @@
+import random
+import re
+
+import pytest
+
+from sgflib.enums import Token
+from sgflib.exceptions import SGFParserError
+from sgflib.utils import convert_control_chars
+from sgflib.tokenizer import SGFSplitter, SGFTokenizer, scan_prop_value
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("[dd]", ("dd", 4)),
+        ("[dd][pp]", ("dd", 4)),
+        ("[]", ("", 2)),
+        ("[John Doe [3d\\] \\\\UA\\\\]", ("John Doe [3d] \\UA\\", 23)),
+        ("[a\\b]", ("a\\b", 5)),
+        ("[\r\n\r\nGo\tGo\n]", ("Go Go\n", 12)),
+        ("[Go\\]\n\nGo]", ("Go]Go", 10)),
+    ],
+)
+def test_scan_prop_value(data, expected):
+    assert scan_prop_value(data, 1) == expected
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("[dd", "Unterminated SGFProperty value: line 1 column 2 (char 1)"),
+        (
+            "[John Doe [3d\\]",
+            "Unterminated SGFProperty value: line 1 column 16 (char 15)",
+        ),
+    ],
+)
+def test_scan_prop_value_error(data, expected):
+    with pytest.raises(SGFParserError) as err:
+        scan_prop_value(data, 1)
+    assert str(err.value) == expected
+
+
+def test_tokenizer():
+    tokenizer = SGFTokenizer("(;B[dd]C[Go]\n(;W[pp]) (;W[pq]))  !")
+    assert list(tokenizer) == [
+        (Token.TREE_START, None, 0),
+        (Token.NODE, None, 1),
+        (Token.LABEL, "B", 2),
+        (Token.VALUE, "dd", 3),
+        (Token.LABEL, "C", 7),
+        (Token.VALUE, "Go", 8),
+        (Token.TREE_START, None, 13),
+        (Token.NODE, None, 14),
+        (Token.LABEL, "W", 15),
+        (Token.VALUE, "pp", 16),
+        (Token.TREE_END, None, 20),
+        (Token.TREE_START, None, 22),
+        (Token.NODE, None, 23),
+        (Token.LABEL, "W", 24),
+        (Token.VALUE, "pq", 25),
+        (Token.TREE_END, None, 29),
+        (Token.TREE_END, None, 30),
+    ]
+    assert tokenizer.index == 31
+
+
+def test_splitter():
+    splitter = SGFSplitter()
+    assert splitter.feed(" (;B[dd](;W[pp])") == []
+    assert splitter.feed("(;W[pq]))\n(;C[)\\") == ["(;B[dd](;W[pp])(;W[pq]))"]
+    assert splitter.buffer == "(;C[)\\"
+    assert splitter.feed("]])") == ["(;C[)\\]])"]
+    assert splitter.buffer == ""
+    splitter.close()
+
+
+@pytest.mark.parametrize(
+    "data, expected",
+    [
+        ("(;C[a\\\\])", ["(;C[a\\\\])"]),
+        ("(;C[\\\\\\]\\\\])(;B[dd])", ["(;C[\\\\\\]\\\\])", "(;B[dd])"]),
+    ],
+)
+def test_splitter_escaped_backslash(data, expected):
+    """Chunk split inside "\\\\]" does not turn "]" into an escape."""
+    for offset in range(len(data) + 1):
+        splitter = SGFSplitter()
+        trees = splitter.feed(data[:offset]) + splitter.feed(data[offset:])
+        splitter.close()
+        assert trees == expected
+
+
+def reference_prop_value(data: str, index: int) -> str:
+    """Former SGFParser.parse_prop_value, which searches escapes on each step."""
+    line_break = re.compile(r"(\r\n?|\n\r?)*")
+    value = ""
+    while True:
+        index = line_break.match(data, index).end()
+        end = data.index("]", index)
+        escape = re.compile(r"\\[]\\]").search(data, index)
+        if not escape or escape.end() > end + 1:
+            break
+        value += data[index : escape.start()] + data[escape.end() - 1]
+        index = escape.end()
+    return convert_control_chars(value + data[index:end])
+
+
+def test_scan_prop_value_matches_reference():
+    rng = random.Random(6)
+    alphabet = ["a", "]", "\\", "\n", "\r", "\t", "\x00", " ", "[", "ł"]
+    for _ in range(2000):
+        data = "[" + "".join(rng.choices(alphabet, k=rng.randrange(20))) + "]"
+        try:
+            expected = reference_prop_value(data, 1)
+        except ValueError:
+            with pytest.raises(SGFParserError):
+                scan_prop_value(data, 1)
+        else:
+            assert scan_prop_value(data, 1)[0] == expected
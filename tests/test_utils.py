@@ -69,7 +69,8 @@ def test_coord_to_point_error(x, y):
     assert str(err.value) == f"Invalid SGFCoordinate: {coord}."
 
 
-def test_point_to_coord_error():
+@pytest.mark.parametrize("point", ["ąa", "a", "aaa", ""])
+def test_point_to_coord_error(point):
     with pytest.raises(SGFPointError) as err:
-        point_to_coord("ąa")
-    assert str(err.value) == "Invalid SGFPoint: ąa."
+        point_to_coord(point)
+    assert str(err.value) == f"Invalid SGFPoint: {point}."
@@ -0,0 +1,56 @@
+import io
+
+import pytest
+
+from sgflib import SGFParser, dump
+from sgflib.writer import iter_chunks
+
+
+@pytest.fixture
+def collection(sabaki):
+    return SGFParser(sabaki + "\n(;C[naïve \\] ünïcode])").parse_collection()
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+def test_dump_text(collection, chunk_size):
+    fp = io.StringIO()
+    dump(collection, fp, chunk_size=chunk_size)
+    assert fp.getvalue() == collection.sgf
+
+
+@pytest.mark.parametrize("encoding", ["utf-8", "utf-16", "latin-1"])
+def test_dump_binary(collection, encoding):
+    fp = io.BytesIO()
+    dump(collection, fp, chunk_size=10, encoding=encoding)
+    assert fp.getvalue() == collection.sgf.encode(encoding)
+
+
+def test_dump_path(collection, tmp_path):
+    path = tmp_path / "collection.sgf"
+    dump(collection, path)
+    assert path.read_bytes() == collection.sgf.encode("utf-8")
+
+    tree = collection[0]
+    tree.write(str(path))
+    assert path.read_text(encoding="utf-8") == tree.sgf
+
+
+def test_write(collection, tmp_path):
+    tree = collection[0]
+    for sgf_object in [collection, tree, tree.sequence, tree.sequence[0]]:
+        fp = io.StringIO()
+        sgf_object.write(fp)
+        assert fp.getvalue() == sgf_object.sgf
+
+    with open(tmp_path / "tree.sgf", "wb") as fp:
+        tree.write(fp, encoding="latin-1")
+    assert (tmp_path / "tree.sgf").read_bytes() == tree.sgf.encode("latin-1")
+
+
+def test_iter_chunks():
+    assert list(iter_chunks(["(", ";B[aa]", ";W[bb]", ")"], 5)) == [
+        "(;B[aa]",
+        ";W[bb]",
+        ")",
+    ]
+    assert list(iter_chunks([], 5)) == []